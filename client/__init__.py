@@ -0,0 +1,21 @@
+"""
+Client library for the Sensor Key Registry.
+
+- KeyRegistryClient: pooled, retrying synchronous client (requests)
+- AsyncKeyRegistryClient: asynchronous client (httpx) that coalesces
+  concurrent validations into batch requests
+- VerdictCache: client-side TTL cache of recent verdicts
+- KeyRegistryReplica: local manifest replica for in-process validation
+"""
+from .cache import VerdictCache
+from .sync_client import KeyRegistryClient, create_session
+from .async_client import AsyncKeyRegistryClient
+from .replica import KeyRegistryReplica
+
+__all__ = [
+    "KeyRegistryClient",
+    "AsyncKeyRegistryClient",
+    "VerdictCache",
+    "KeyRegistryReplica",
+    "create_session"
+]
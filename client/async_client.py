@@ -0,0 +1,232 @@
+import asyncio
+import random
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from client.cache import VerdictCache
+from client.sync_client import DEFAULT_BASE_URL, RETRY_STATUSES
+
+
+class AsyncKeyRegistryClient:
+    """
+    Asynchronous client for the Key Registry API.
+
+    Uses one pooled httpx.AsyncClient with keep-alive connections. Concurrent
+    validate_key calls are coalesced: keys submitted within coalesce_window
+    seconds of each other (or until max_batch_size keys are waiting) are sent
+    together as a single /keys/validate/batch request, and each caller gets
+    its own verdict back.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 5.0,
+        retries: int = 3,
+        backoff_factor: float = 0.1,
+        max_connections: int = 10,
+        cache_ttl: float = 60.0,
+        cache_size: int = 10000,
+        max_batch_size: int = 1000,
+        coalesce_window: float = 0.005
+    ):
+        """
+        Initialize the client with the registry API URL.
+
+        Args:
+            base_url: Base URL of the key registry
+            timeout: Connect and read timeout per request, in seconds
+            retries: Number of retries for transient failures
+            backoff_factor: Base delay of the exponential backoff, in seconds
+            max_connections: Maximum number of pooled connections
+            cache_ttl: Seconds a verdict is cached for (0 disables the cache)
+            cache_size: Maximum number of cached verdicts
+            max_batch_size: Maximum number of keys sent per batch request
+            coalesce_window: Seconds to wait for more keys before sending a batch
+        """
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_batch_size = max_batch_size
+        self.coalesce_window = coalesce_window
+        self.cache = VerdictCache(ttl=cache_ttl, max_size=cache_size)
+        self.http = httpx.AsyncClient(
+            base_url=base_url.rstrip('/'),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+        self._pending: List[Tuple[str, bytes, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Full batches being sent, referenced so they are not garbage collected
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def aclose(self) -> None:
+        """Send any pending keys and close all pooled connections."""
+        if self._pending:
+            await self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.http.aclose()
+
+    async def __aenter__(self) -> "AsyncKeyRegistryClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying connection errors and 502/503/504 with backoff."""
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.http.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            delay = self.backoff_factor * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+
+    @staticmethod
+    def _error(e: Exception) -> Dict[str, Any]:
+        return {
+            "is_valid": False,
+            "error": str(e),
+            "message": "Failed to connect to key registry"
+        }
+
+    async def validate_key(self, public_key_pem: str) -> dict:
+        """
+        Validate a public key against the registry.
+
+        The key is queued and sent in the next coalesced batch request.
+
+        Returns:
+            dict: Validation result with is_valid, key_index, and message
+        """
+        cache_key = self.cache.make_key(public_key_pem)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((public_key_pem, cache_key, future))
+        if len(self._pending) >= self.max_batch_size:
+            # Sent from its own task rather than this caller's, so that
+            # cancelling this caller cannot leave the rest of the batch waiting
+            flush = asyncio.create_task(self._flush())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def validate_keys(self, public_key_pems: List[str]) -> List[dict]:
+        """Validate many public keys, returning one result per key in order."""
+        return list(await asyncio.gather(
+            *(self.validate_key(pem) for pem in public_key_pems)))
+
+    async def validate_fingerprint(self, fingerprint: str) -> dict:
+        """Validate a key by its SHA-256 fingerprint."""
+        cache_key = self.cache.make_key(fingerprint)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self._request(
+                "POST", "/keys/validate/fingerprint", json={"fingerprint": fingerprint})
+            if response.status_code == 400:
+                result = {
+                    "is_valid": False,
+                    "key_index": None,
+                    "message": response.json().get("detail", "Invalid fingerprint format")
+                }
+            else:
+                response.raise_for_status()
+                result = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            return self._error(e)
+
+        self.cache.put(cache_key, result)
+        return result
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.coalesce_window)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        """
+        Send all queued keys as batch requests and resolve their futures.
+
+        Every future is resolved even if the flush is cancelled midway, with
+        an error result for the keys whose batch was not answered.
+        """
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+            self._flush_task = None
+        pending, self._pending = self._pending, []
+
+        try:
+            await self._send_batches(pending)
+        finally:
+            unanswered = [future for _, _, future in pending if not future.done()]
+            if unanswered:
+                error = self._error(RuntimeError("Batch request was cancelled"))
+                for future in unanswered:
+                    future.set_result(error)
+
+    async def _send_batches(self, pending: List[Tuple[str, bytes, asyncio.Future]]) -> None:
+        """Send queued keys in batches of max_batch_size, resolving each key's future."""
+        for start in range(0, len(pending), self.max_batch_size):
+            chunk = pending[start:start + self.max_batch_size]
+            try:
+                response = await self._request(
+                    "POST", "/keys/validate/batch",
+                    json={"keys": [{"public_key_pem": pem} for pem, _, _ in chunk]})
+                response.raise_for_status()
+                results = response.json()["results"]
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                error = self._error(e)
+                for _, _, future in chunk:
+                    if not future.done():
+                        future.set_result(error)
+                continue
+
+            for (_, cache_key, future), result in zip(chunk, results):
+                self.cache.put(cache_key, result)
+                if not future.done():
+                    future.set_result(result)
+
+    async def get_service_info(self) -> dict:
+        """Get information about the registry service."""
+        try:
+            response = await self._request("GET", "/")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            return {"error": str(e)}
+
+    async def get_keys_info(self) -> dict:
+        """Get information about registered keys."""
+        try:
+            response = await self._request("GET", "/keys/info")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            return {"error": str(e)}
+
+    async def get_manifest(self, since: Optional[int] = None) -> dict:
+        """Get the registry manifest, or only the changes since a version."""
+        params = {"since": since} if since is not None else None
+        try:
+            response = await self._request("GET", "/keys/manifest", params=params)
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            return {"error": str(e)}
@@ -0,0 +1,55 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class VerdictCache:
+    """
+    Bounded TTL cache of recent validation verdicts, keyed by PEM hash.
+
+    Only successful responses from the registry should be cached; transport
+    errors must not be remembered as verdicts. A ttl of 0 disables the cache.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(value: str) -> bytes:
+        """Get the cache key for a PEM string or fingerprint."""
+        return hashlib.sha256(value.encode('utf-8')).digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Get a cached verdict, or None if it is missing or expired."""
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, verdict = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return verdict
+
+    def put(self, key: bytes, verdict: Any) -> None:
+        """Cache a verdict for the configured TTL."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, verdict)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached verdicts."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,69 @@
+import hashlib
+import re
+from typing import Union
+
+
+PEM_BLOCK_PATTERN = re.compile(
+    rb"-----BEGIN ([A-Z0-9 ]+)-----(.*?)-----END \1-----", re.DOTALL)
+FINGERPRINT_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def normalize_fingerprint(fingerprint: str) -> str:
+    """
+    Normalize a SHA-256 key fingerprint to lowercase hex.
+
+    An optional "sha256:" prefix and colon separators are accepted, as by
+    the registry.
+
+    Raises:
+        ValueError: If the value is not a hex-encoded SHA-256 digest
+    """
+    value = fingerprint.strip().lower()
+    if value.startswith("sha256:"):
+        value = value[len("sha256:"):]
+    value = value.replace(":", "")
+
+    if not FINGERPRINT_PATTERN.match(value):
+        raise ValueError("Fingerprint is not a hex-encoded SHA-256 digest")
+    return value
+
+
+def get_key_fingerprint(key_pem: Union[str, bytes]) -> str:
+    """
+    Get the registry fingerprint of a PEM RSA public key.
+
+    This is the SHA-256 of the key's DER SubjectPublicKeyInfo, so PKCS#1
+    and SubjectPublicKeyInfo encodings of a key agree. It needs the
+    cryptography package, which is imported here so that the rest of the
+    client works without it.
+
+    Raises:
+        ValueError: If the data is not an RSA public key in PEM format
+    """
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    if isinstance(key_pem, str):
+        key_pem = key_pem.encode('utf-8')
+    # Re-wrap the base64 body so unusual line wrapping parses like it does
+    # on the registry
+    match = PEM_BLOCK_PATTERN.search(key_pem)
+    if match:
+        body = b''.join(match.group(2).split())
+        key_pem = b'\n'.join(
+            [b'-----BEGIN ' + match.group(1) + b'-----']
+            + [body[i:i + 64] for i in range(0, len(body), 64)]
+            + [b'-----END ' + match.group(1) + b'-----']) + b'\n'
+
+    try:
+        public_key = serialization.load_pem_public_key(key_pem)
+    except Exception as e:
+        raise ValueError(f"Could not parse public key: {e}") from e
+    if not isinstance(public_key, rsa.RSAPublicKey):
+        raise ValueError("Public key is not an RSA key")
+
+    key_der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return hashlib.sha256(key_der).hexdigest()
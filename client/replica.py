@@ -0,0 +1,85 @@
+import threading
+from typing import FrozenSet, Optional
+
+from client.sync_client import KeyRegistryClient
+from client.fingerprints import get_key_fingerprint, normalize_fingerprint
+
+
+class KeyRegistryReplica:
+    """
+    Local copy of the registry manifest for validating keys in-process.
+
+    sync() pulls the full fingerprint set once and afterwards only the
+    fingerprints added and removed since the replica's version, so keys are
+    validated with no network call per key. Call sync() periodically, e.g.
+    from a background thread; validations in between see the last synced
+    state. Verdicts carry key_id (the fingerprint) but no key_index.
+    """
+
+    def __init__(self, client: KeyRegistryClient):
+        self.client = client
+        self.version: Optional[int] = None
+        self.revocations_version: Optional[int] = None
+        self._fingerprints: FrozenSet[str] = frozenset()
+        self._revoked: FrozenSet[str] = frozenset()
+        self._lock = threading.Lock()
+
+    def sync(self) -> bool:
+        """
+        Bring the replica up to date with the registry.
+
+        Returns:
+            True if the replica is current, False if the registry could not
+            be reached (the previous state is kept)
+        """
+        manifest = self.client.get_manifest(since=self.version)
+        if "error" in manifest:
+            return False
+
+        with self._lock:
+            if manifest["full"]:
+                fingerprints = frozenset(manifest["fingerprints"])
+            else:
+                fingerprints = (self._fingerprints - frozenset(manifest["removed"])
+                                | frozenset(manifest["added"]))
+            self._fingerprints = fingerprints
+            self._revoked = frozenset(manifest["revoked"])
+            self.version = manifest["version"]
+            self.revocations_version = manifest["revocations_version"]
+        return True
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def validate_fingerprint(self, fingerprint: str) -> dict:
+        """Validate a key by its SHA-256 fingerprint against the replica."""
+        try:
+            fingerprint = normalize_fingerprint(fingerprint)
+        except ValueError as e:
+            return {"is_valid": False, "key_id": None, "message": str(e)}
+
+        if fingerprint in self._revoked:
+            return {"is_valid": False, "key_id": None, "message": "Public key has been revoked"}
+        if fingerprint not in self._fingerprints:
+            return {
+                "is_valid": False,
+                "key_id": None,
+                "message": "Public key does not match any registered keys"
+            }
+        return {"is_valid": True, "key_id": fingerprint, "message": "Key matches a registered key"}
+
+    def validate_key(self, public_key_pem: str) -> dict:
+        """
+        Validate a PEM public key against the replica.
+
+        The key is fingerprinted locally, which needs the cryptography package.
+        """
+        try:
+            fingerprint = get_key_fingerprint(public_key_pem)
+        except ValueError:
+            return {
+                "is_valid": False,
+                "key_id": None,
+                "message": "Invalid public key format. Expected RSA public key in PEM format."
+            }
+        return self.validate_fingerprint(fingerprint)
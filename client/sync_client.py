@@ -0,0 +1,230 @@
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from client.cache import VerdictCache
+
+
+DEFAULT_BASE_URL = "http://localhost:8003"
+RETRY_STATUSES = (502, 503, 504)
+
+
+def create_session(
+    pool_size: int = 10,
+    retries: int = 3,
+    backoff_factor: float = 0.1
+) -> requests.Session:
+    """
+    Create a requests.Session with a keep-alive connection pool.
+
+    Connection errors and 502/503/504 responses (including the registry's
+    503 backpressure) are retried with exponential backoff, honouring any
+    Retry-After header.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class KeyRegistryClient:
+    """
+    Pooled, retrying client for the Key Registry API.
+
+    A single requests.Session is reused for every call, so connections are
+    kept alive and pooled instead of paying a TCP handshake per validation.
+    Transient failures are retried with backoff (see create_session), and
+    recent verdicts are served from a client-side TTL cache.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 5.0,
+        retries: int = 3,
+        backoff_factor: float = 0.1,
+        pool_size: int = 10,
+        cache_ttl: float = 60.0,
+        cache_size: int = 10000,
+        max_batch_size: int = 1000
+    ):
+        """
+        Initialize the client with the registry API URL.
+
+        Args:
+            base_url: Base URL of the key registry
+            timeout: Connect and read timeout per request, in seconds
+            retries: Number of retries for transient failures
+            backoff_factor: Base delay of the exponential backoff, in seconds
+            pool_size: Maximum number of pooled connections
+            cache_ttl: Seconds a verdict is cached for (0 disables the cache)
+            cache_size: Maximum number of cached verdicts
+            max_batch_size: Maximum number of keys sent per batch request
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+        self.cache = VerdictCache(ttl=cache_ttl, max_size=cache_size)
+        self.session = create_session(pool_size, retries, backoff_factor)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "KeyRegistryClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        return self.session.request(
+            method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+
+    @staticmethod
+    def _error(e: Exception) -> Dict[str, Any]:
+        return {
+            "is_valid": False,
+            "error": str(e),
+            "message": "Failed to connect to key registry"
+        }
+
+    def validate_key(self, public_key_pem: str) -> dict:
+        """
+        Validate a public key against the registry.
+
+        Args:
+            public_key_pem: The public key in PEM format to validate
+
+        Returns:
+            dict: Validation result with is_valid, key_index, and message
+        """
+        cache_key = self.cache.make_key(public_key_pem)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self._request(
+                "POST", "/validate", json={"public_key_pem": public_key_pem})
+            if response.status_code == 400:
+                result = {
+                    "is_valid": False,
+                    "key_index": None,
+                    "message": response.json().get("detail", "Invalid key format")
+                }
+            else:
+                response.raise_for_status()
+                result = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return self._error(e)
+
+        self.cache.put(cache_key, result)
+        return result
+
+    def validate_fingerprint(self, fingerprint: str) -> dict:
+        """Validate a key by its SHA-256 fingerprint."""
+        cache_key = self.cache.make_key(fingerprint)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self._request(
+                "POST", "/keys/validate/fingerprint", json={"fingerprint": fingerprint})
+            if response.status_code == 400:
+                result = {
+                    "is_valid": False,
+                    "key_index": None,
+                    "message": response.json().get("detail", "Invalid fingerprint format")
+                }
+            else:
+                response.raise_for_status()
+                result = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return self._error(e)
+
+        self.cache.put(cache_key, result)
+        return result
+
+    def validate_keys(self, public_key_pems: List[str]) -> List[dict]:
+        """
+        Validate many public keys using the batch endpoint.
+
+        Cached verdicts are answered locally, and the remaining keys are sent
+        in as few batch requests as max_batch_size allows.
+
+        Returns:
+            list: One validation result per key, in the same order
+        """
+        results: List[Optional[dict]] = []
+        pending = []
+        for pem in public_key_pems:
+            cache_key = self.cache.make_key(pem)
+            cached = self.cache.get(cache_key)
+            if cached is None:
+                pending.append((len(results), pem, cache_key))
+            results.append(cached)
+
+        for start in range(0, len(pending), self.max_batch_size):
+            chunk = pending[start:start + self.max_batch_size]
+            try:
+                response = self._request(
+                    "POST", "/keys/validate/batch",
+                    json={"keys": [{"public_key_pem": pem} for _, pem, _ in chunk]})
+                response.raise_for_status()
+                batch_results = response.json()["results"]
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                for position, _, _ in chunk:
+                    results[position] = self._error(e)
+                continue
+
+            for (position, _, cache_key), result in zip(chunk, batch_results):
+                self.cache.put(cache_key, result)
+                results[position] = result
+
+        return results
+
+    def get_service_info(self) -> dict:
+        """Get information about the registry service."""
+        try:
+            response = self._request("GET", "/")
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+
+    def get_keys_info(self) -> dict:
+        """Get information about registered keys."""
+        try:
+            response = self._request("GET", "/keys/info")
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+
+    def get_manifest(self, since: Optional[int] = None) -> dict:
+        """
+        Get the registry manifest, or only the changes since a version.
+
+        See KeyRegistryReplica for keeping a local copy up to date.
+        """
+        params = {"since": since} if since is not None else None
+        try:
+            response = self._request("GET", "/keys/manifest", params=params)
+            response.raise_for_status()
+            return response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return {"error": str(e)}
@@ -0,0 +1,48 @@
+import os
+
+
+# Gunicorn settings for running the registry with several uvicorn workers.
+# Start with: gunicorn -c gunicorn.conf.py main:app
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8003')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app in the master process so the registry can be loaded once
+# before the workers are forked.
+preload_app = True
+
+
+def clear_metrics_dir():
+    """
+    Remove metrics files left in PROMETHEUS_MULTIPROC_DIR by a previous run.
+
+    /metrics aggregates every file in the directory, so files from a
+    container that has since restarted (an emptyDir outlives it) would be
+    counted again. Runs when the config is read, before the app is loaded.
+    The master's own files are kept in case the config is re-read on HUP.
+    """
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    own_suffix = f"_{os.getpid()}.db"
+    for name in os.listdir(path):
+        if name.endswith(".db") and not name.endswith(own_suffix):
+            os.remove(os.path.join(path, name))
+
+
+clear_metrics_dir()
+
+
+def on_starting(server):
+    """Load the key registry in the master so all workers inherit it."""
+    from main import preload_registry
+    preload_registry()
+
+
+def child_exit(server, worker):
+    """Drop the metrics files of a worker that has exited."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
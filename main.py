@@ -1,8 +1,30 @@
+import asyncio
+
 from fastapi import FastAPI
-from routers import keys_router, health_router
+from routers import keys_router, health_router, metrics_router, verify_router, tenants_router
 from routers.keys import validate_public_key
 from models.responses import ValidationResponse
-from utils.key_loader import load_registered_public_keys
+from utils.registry import build_registry, RegistryManager
+from utils.validation_cache import ValidationCache
+from utils.executor import BoundedExecutor
+from utils.metadata_store import KeyMetadataStore
+from utils.revocations import load_revocations
+from utils.signatures import PublicKeyCache
+from utils.tenants import TenantRegistries
+from utils.metrics import MetricsMiddleware
+from utils.config import (
+    VALIDATION_CACHE_SIZE,
+    KEYS_RELOAD_INTERVAL,
+    REVOCATIONS_POLL_INTERVAL,
+    VALIDATION_WORKERS,
+    VALIDATION_QUEUE_LIMIT,
+    PUBLIC_KEY_CACHE_SIZE,
+    VERIFY_PROCESSES,
+    TENANT_MEMORY_BUDGET,
+    TENANT_IDLE_TIMEOUT,
+    TENANT_SWEEP_INTERVAL,
+    TENANT_CACHE_SIZE
+)
 
 app = FastAPI(
     title="Sensor Key Registry",
@@ -13,17 +35,84 @@ app = FastAPI(
 # Include routers
 app.include_router(health_router)
 app.include_router(keys_router)
+app.include_router(metrics_router)
+app.include_router(verify_router)
+app.include_router(tenants_router)
+
+app.add_middleware(MetricsMiddleware)
 
 app.post("/validate", response_model=ValidationResponse)(validate_public_key)
 
 
+def preload_registry():
+    """
+    Load the registry before the server starts accepting requests.
+
+    Called from the gunicorn master (see gunicorn.conf.py) so the registry is
+    built once and inherited by every forked worker instead of being loaded
+    again in each one.
+    """
+    registry = build_registry()
+    app.state.registry = registry
+    print(
+        f"[KeyRegistry] Preloaded {len(registry.keys)} registered public keys")
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Load registered keys on startup."""
-    registered_keys = load_registered_public_keys()
-    app.state.registered_keys = registered_keys
-    print(
-        f"[KeyRegistry] Loaded {len(registered_keys)} registered public keys")
+    """Load registered keys on startup, unless they were preloaded before fork."""
+    registry = getattr(app.state, 'registry', None)
+    preloaded = registry is not None
+    if registry is None:
+        registry = build_registry()
+        app.state.registry = registry
+        print(
+            f"[KeyRegistry] Loaded {len(registry.keys)} registered public keys")
+    app.state.revocations = load_revocations()
+    app.state.validation_cache = ValidationCache(VALIDATION_CACHE_SIZE)
+    app.state.validation_executor = BoundedExecutor(
+        VALIDATION_WORKERS, VALIDATION_QUEUE_LIMIT)
+    app.state.public_key_cache = PublicKeyCache(PUBLIC_KEY_CACHE_SIZE)
+    if VERIFY_PROCESSES > 0:
+        app.state.verification_executor = BoundedExecutor(
+            VERIFY_PROCESSES, VALIDATION_QUEUE_LIMIT, processes=True)
+    else:
+        app.state.verification_executor = app.state.validation_executor
+    app.state.registry_manager = RegistryManager(app.state)
+    if preloaded:
+        # Workers respawned later inherit the registry the master loaded at
+        # startup, so catch up with any change made since then
+        registry = await app.state.registry_manager.reload_if_changed()
+        if registry is not None:
+            print(
+                f"[KeyRegistry] Reloaded {len(registry.keys)} registered public keys "
+                f"changed since preload")
+    app.state.tenants = TenantRegistries(TENANT_MEMORY_BUDGET, TENANT_CACHE_SIZE)
+    # Opened per worker: SQLite connections must not be shared across fork
+    app.state.metadata_store = KeyMetadataStore.open()
+
+    if KEYS_RELOAD_INTERVAL > 0:
+        app.state.reload_task = asyncio.create_task(
+            app.state.registry_manager.watch(KEYS_RELOAD_INTERVAL))
+    if REVOCATIONS_POLL_INTERVAL > 0:
+        app.state.revocations_task = asyncio.create_task(
+            app.state.registry_manager.watch_revocations(REVOCATIONS_POLL_INTERVAL))
+    if TENANT_SWEEP_INTERVAL > 0:
+        app.state.tenant_sweep_task = asyncio.create_task(
+            app.state.tenants.watch(TENANT_SWEEP_INTERVAL, TENANT_IDLE_TIMEOUT))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop watching the keys directory and release the worker pools and database."""
+    for task_name in ('reload_task', 'revocations_task', 'tenant_sweep_task'):
+        task = getattr(app.state, task_name, None)
+        if task is not None:
+            task.cancel()
+    app.state.validation_executor.shutdown()
+    if app.state.verification_executor is not app.state.validation_executor:
+        app.state.verification_executor.shutdown()
+    app.state.metadata_store.close()
 
 
 if __name__ == "__main__":
@@ -1,17 +1,53 @@
-from .requests import PublicKeyRequest
+from .requests import (
+    PublicKeyRequest,
+    FingerprintRequest,
+    BatchValidationRequest,
+    SignatureVerificationRequest,
+    BatchSignatureVerificationRequest
+)
 from .responses import (
     ValidationResponse,
+    BatchValidationResponse,
+    StreamValidationResult,
     HealthResponse,
     KeysInfoResponse,
+    CacheStatsResponse,
+    ReloadResponse,
     RegisteredKeyItem,
-    RegisteredKeysResponse
+    RegisteredKeysResponse,
+    SensorKeyItem,
+    SensorKeysResponse,
+    RevocationsResponse,
+    RevocationResponse,
+    SignatureVerificationResponse,
+    BatchSignatureVerificationResponse,
+    ManifestResponse,
+    TenantInfoResponse,
+    TenantsResponse
 )
 
 __all__ = [
     "PublicKeyRequest",
+    "FingerprintRequest",
+    "BatchValidationRequest",
+    "SignatureVerificationRequest",
+    "BatchSignatureVerificationRequest",
     "ValidationResponse",
+    "BatchValidationResponse",
+    "StreamValidationResult",
     "HealthResponse",
     "KeysInfoResponse",
+    "CacheStatsResponse",
+    "ReloadResponse",
     "RegisteredKeyItem",
-    "RegisteredKeysResponse"
+    "RegisteredKeysResponse",
+    "SensorKeyItem",
+    "SensorKeysResponse",
+    "RevocationsResponse",
+    "RevocationResponse",
+    "SignatureVerificationResponse",
+    "BatchSignatureVerificationResponse",
+    "ManifestResponse",
+    "TenantInfoResponse",
+    "TenantsResponse"
 ]
@@ -1,6 +1,35 @@
-from pydantic import BaseModel
+from typing import List, Literal, Optional, Union
+from pydantic import BaseModel, Field
+
+from utils.config import MAX_BATCH_SIZE
 
 
 class PublicKeyRequest(BaseModel):
     """Request model for public key validation."""
     public_key_pem: str
+
+
+class FingerprintRequest(BaseModel):
+    """Request model for validation by SHA-256 key fingerprint."""
+    fingerprint: str
+
+
+class BatchValidationRequest(BaseModel):
+    """Request model for validating multiple public keys at once."""
+    keys: List[Union[PublicKeyRequest, FingerprintRequest]] = Field(..., max_length=MAX_BATCH_SIZE)
+
+
+class SignatureVerificationRequest(BaseModel):
+    """Request model for verifying a signature with a registered key."""
+    fingerprint: Optional[str] = None
+    key_index: Optional[int] = None
+    payload: str
+    signature: str
+    payload_encoding: Literal["utf-8", "base64"] = "utf-8"
+    padding: Literal["pss", "pkcs1v15"] = "pss"
+    hash_algorithm: Literal["sha256", "sha384", "sha512"] = "sha256"
+
+
+class BatchSignatureVerificationRequest(BaseModel):
+    """Request model for verifying multiple signatures at once."""
+    items: List[SignatureVerificationRequest] = Field(..., max_length=MAX_BATCH_SIZE)
@@ -3,10 +3,28 @@ from pydantic import BaseModel
 
 
 class ValidationResponse(BaseModel):
-    """Response model for key validation results."""
+    """
+    Response model for key validation results.
+
+    key_index is the key's position in the current registry and may change
+    when keys are added or removed; key_id is the key's SHA-256 fingerprint,
+    which never changes.
+    """
     is_valid: bool
     key_index: Optional[int] = None
     message: str
+    key_id: Optional[str] = None
+
+
+class BatchValidationResponse(BaseModel):
+    """Response model for batch key validation results."""
+    results: list[ValidationResponse]
+    count: int
+
+
+class StreamValidationResult(ValidationResponse):
+    """One line of a streaming validation response, tagged with its record number."""
+    item: int
 
 
 class HealthResponse(BaseModel):
@@ -19,17 +37,118 @@ class HealthResponse(BaseModel):
 class KeysInfoResponse(BaseModel):
     """Response model for keys information endpoint."""
     total_registered_keys: int
+    skipped_keys: int = 0
     expected_keys: int
     keys_directory: str
 
 
+class CacheStatsResponse(BaseModel):
+    """Response model for validation cache statistics."""
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+
+
+class ReloadResponse(BaseModel):
+    """Response model for registry reload results."""
+    version: int
+    registered_keys_count: int
+    duration_ms: float
+
+
 class RegisteredKeyItem(BaseModel):
     """Model for individual registered key item."""
     index: int
-    key_pem: str
+    key_pem: Optional[str] = None
+    fingerprint: Optional[str] = None
 
 
 class RegisteredKeysResponse(BaseModel):
-    """Response model for listing all registered keys."""
+    """Response model for listing registered keys, one page at a time."""
     registered_keys: list[RegisteredKeyItem]
     count: int
+    total: int
+    next_offset: Optional[int] = None
+
+
+class SensorKeyItem(BaseModel):
+    """Model for one key of a sensor, with its metadata."""
+    fingerprint: str
+    key_index: Optional[int] = None
+    registered: bool
+    revoked: bool = False
+    sensor_id: str
+    owner: Optional[str] = None
+    created_at: Optional[str] = None
+    expires_at: Optional[str] = None
+    status: str
+
+
+class SensorKeysResponse(BaseModel):
+    """Response model for looking up the keys of a sensor."""
+    sensor_id: str
+    keys: list[SensorKeyItem]
+    count: int
+
+
+class RevocationsResponse(BaseModel):
+    """Response model for the list of revoked key fingerprints."""
+    fingerprints: list[str]
+    count: int
+    version: int
+
+
+class RevocationResponse(BaseModel):
+    """Response model for revoking or reinstating a key."""
+    fingerprint: str
+    revoked: bool
+    persisted: bool
+    version: int
+
+
+class SignatureVerificationResponse(BaseModel):
+    """Response model for signature verification results."""
+    verified: bool
+    key_index: Optional[int] = None
+    message: str
+
+
+class BatchSignatureVerificationResponse(BaseModel):
+    """Response model for batch signature verification results."""
+    results: list[SignatureVerificationResponse]
+    count: int
+
+
+class ManifestResponse(BaseModel):
+    """
+    Response model for the registry manifest.
+
+    A full manifest lists every registered fingerprint; a delta lists the
+    fingerprints added and removed since the requested version.
+    """
+    version: int
+    full: bool
+    fingerprints: Optional[list[str]] = None
+    added: Optional[list[str]] = None
+    removed: Optional[list[str]] = None
+    count: int
+    revoked: list[str]
+    revocations_version: int
+
+
+class TenantInfoResponse(BaseModel):
+    """Response model for a loaded tenant registry."""
+    tenant: str
+    registered_keys_count: int
+    skipped_keys: int = 0
+    revoked_keys: int = 0
+    memory_bytes: int
+
+
+class TenantsResponse(BaseModel):
+    """Response model for the tenant registries held in memory."""
+    tenants: list[TenantInfoResponse]
+    count: int
+    memory_used: int
+    memory_budget: int
@@ -1,4 +1,8 @@
 from .keys import router as keys_router
 from .health import router as health_router
+from .metrics import router as metrics_router
+from .verify import router as verify_router
+from .tenants import router as tenants_router
 
-__all__ = ["keys_router", "health_router"]
+__all__ = ["keys_router", "health_router", "metrics_router", "verify_router",
+           "tenants_router"]
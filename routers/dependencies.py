@@ -0,0 +1,89 @@
+import hmac
+
+from fastapi import HTTPException, Request
+
+from utils.config import ADMIN_TOKEN
+
+from utils.engine import KeyRegistryEngine
+from utils.executor import BoundedExecutor
+from utils.metadata_store import KeyMetadataStore
+from utils.registry import KeyRegistry, RegistryManager
+from utils.revocations import RevocationList
+from utils.signatures import PublicKeyCache
+from utils.tenants import TenantRegistries
+from utils.validation_cache import ValidationCache
+
+
+def get_registry(request: Request) -> KeyRegistry:
+    """Dependency to get the current registry snapshot from app state."""
+    return request.app.state.registry
+
+
+def get_revocations(request: Request) -> RevocationList:
+    """Dependency to get the current revocation list from app state."""
+    return request.app.state.revocations
+
+
+def get_engine(request: Request) -> KeyRegistryEngine:
+    """
+    Dependency to get a validation engine over the current app state.
+
+    The engine holds the registry and revocation list current at the start
+    of the request, so the whole request is validated against them.
+    """
+    state = request.app.state
+    return KeyRegistryEngine(state.registry, state.revocations, state.validation_cache)
+
+
+def get_registry_manager(request: Request) -> RegistryManager:
+    """Dependency to get the registry manager from app state."""
+    return request.app.state.registry_manager
+
+
+def get_validation_cache(request: Request) -> ValidationCache:
+    """Dependency to get the validation result cache from app state."""
+    return request.app.state.validation_cache
+
+
+def get_validation_executor(request: Request) -> BoundedExecutor:
+    """Dependency to get the executor for CPU-bound validation work."""
+    return request.app.state.validation_executor
+
+
+def get_metadata_store(request: Request) -> KeyMetadataStore:
+    """Dependency to get the key metadata store from app state."""
+    return request.app.state.metadata_store
+
+
+def get_public_key_cache(request: Request) -> PublicKeyCache:
+    """Dependency to get the cache of parsed public keys from app state."""
+    return request.app.state.public_key_cache
+
+
+def get_verification_executor(request: Request) -> BoundedExecutor:
+    """Dependency to get the executor for batch signature verification."""
+    return request.app.state.verification_executor
+
+
+def get_tenant_registries(request: Request) -> TenantRegistries:
+    """Dependency to get the lazily loaded tenant registries from app state."""
+    return request.app.state.tenants
+
+
+def require_admin_token(request: Request) -> None:
+    """
+    Dependency that admits only requests carrying the ADMIN_TOKEN bearer token.
+
+    Endpoints using it are disabled (403) while ADMIN_TOKEN is unset.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+            token.strip().encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+        raise HTTPException(
+            status_code=401,
+            detail="Missing or invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
@@ -1,22 +1,31 @@
-from typing import List
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response
 
 from models.responses import HealthResponse
+from routers.dependencies import get_registry
+from utils.registry import KeyRegistry
 
 router = APIRouter(tags=["health"])
 
 
-def get_registered_keys():
-    """Dependency to get registered keys from app state."""
-    from main import app
-    return getattr(app.state, 'registered_keys', [])
-
-
-@router.get("/", response_model=HealthResponse)
-async def root(registered_keys: List[bytes] = Depends(get_registered_keys)):
-    """Health check endpoint."""
+def render_health(registry: KeyRegistry) -> bytes:
+    """Serialize the health check response for a registry."""
     return HealthResponse(
         service="Sensor Key Registry",
         status="active",
-        registered_keys_count=len(registered_keys)
+        registered_keys_count=len(registry.keys)
+    ).model_dump_json().encode('utf-8')
+
+
+@router.get("/", response_model=HealthResponse)
+async def root(registry: KeyRegistry = Depends(get_registry)):
+    """
+    Health check endpoint.
+
+    Probes hit this every few seconds, so the body is serialized once per
+    registry and served as stored bytes.
+    """
+    return Response(
+        content=registry.get_rendered("health", render_health),
+        media_type="application/json"
     )
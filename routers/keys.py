@@ -1,59 +1,159 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Iterator, List, NoReturn, Optional, Union
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
-from models.requests import PublicKeyRequest
+from models.requests import (
+    PublicKeyRequest,
+    FingerprintRequest,
+    BatchValidationRequest
+)
 from models.responses import (
     ValidationResponse,
+    BatchValidationResponse,
+    StreamValidationResult,
     KeysInfoResponse,
+    CacheStatsResponse,
+    ReloadResponse,
     RegisteredKeysResponse,
-    RegisteredKeyItem
+    SensorKeyItem,
+    SensorKeysResponse,
+    RevocationsResponse,
+    RevocationResponse,
+    ManifestResponse
+)
+from utils.config import (
+    STREAM_BATCH_SIZE,
+    MAX_STREAM_RECORD_SIZE,
+    FAST_RESPONSES
+)
+from utils.executor import BoundedExecutor, ExecutorSaturatedError
+from utils.metrics import VALIDATION_RESULTS, EXECUTOR_REJECTIONS
+from utils.key_loader import get_expected_keys_count
+from utils.key_store import get_key_store
+from utils.registry import KeyRegistry, RegistryManager
+from utils.engine import (
+    KeyRegistryEngine,
+    INVALID_KEY_FORMAT_MESSAGE,
+    INVALID_FINGERPRINT_MESSAGE,
+    MALFORMED_KEY_RESULT,
+    MALFORMED_FINGERPRINT_RESULT,
+    NO_REGISTERED_KEYS_RESULT,
+    NOT_REGISTERED_RESULT,
+    REVOKED_KEY_RESULT
 )
-from utils.key_loader import get_keys_directory, get_expected_keys_count
+from utils.validation_cache import ValidationCache
+from utils.metadata_store import KeyMetadataStore
+from utils.revocations import RevocationList
+from routers.dependencies import (
+    get_registry,
+    get_registry_manager,
+    get_engine,
+    get_validation_cache,
+    get_validation_executor,
+    get_metadata_store,
+    get_revocations,
+    require_admin_token
+)
+from utils.key_stream import KeyStreamParser, StreamItem, NDJSONStreamingResponse
+from utils.key_index import get_key_fingerprint, normalize_fingerprint
 
 router = APIRouter(prefix="/keys", tags=["keys"])
 
 
-def get_registered_keys():
-    """Dependency to get registered keys from app state."""
-    from main import app
-    return getattr(app.state, 'registered_keys', [])
+def render_keys_info(registry: KeyRegistry) -> bytes:
+    """Serialize the /keys/info response for a registry."""
+    return KeysInfoResponse(
+        total_registered_keys=len(registry.keys),
+        skipped_keys=len(registry.errors),
+        expected_keys=get_expected_keys_count(),
+        keys_directory=get_key_store().location
+    ).model_dump_json().encode('utf-8')
 
 
-def normalize_pem_key(pem_data: str) -> bytes:
-    """Normalize a PEM key string by removing extra whitespace and ensuring proper format."""
-    lines = [line.strip()
-             for line in pem_data.strip().split('\n') if line.strip()]
-    normalized = '\n'.join(lines) + '\n'
-    return normalized.encode('utf-8')
+@router.get("/info", response_model=KeysInfoResponse)
+async def get_keys_info(registry: KeyRegistry = Depends(get_registry)):
+    """
+    Get information about registered keys.
 
+    The response is serialized once per registry and served as stored bytes.
+    """
+    return Response(
+        content=registry.get_rendered("keys_info", render_keys_info),
+        media_type="application/json"
+    )
 
-def validate_public_key_format(pem_data: str) -> bool:
-    """Validate that the provided string is a valid RSA public key in PEM format."""
-    try:
-        key_bytes = pem_data.encode('utf-8')
-        public_key = serialization.load_pem_public_key(key_bytes)
-        # Verify it's an RSA key
-        return isinstance(public_key, rsa.RSAPublicKey)
-    except Exception:
-        return False
 
+# Pre-serialized bodies of the fixed outcomes, used when FAST_RESPONSES is on.
+# They are rendered by the models themselves, so the schema stays the same.
+RENDERED_RESULTS = {
+    id(result): result.model_dump_json().encode('utf-8')
+    for result in (MALFORMED_KEY_RESULT, MALFORMED_FINGERPRINT_RESULT,
+                   NO_REGISTERED_KEYS_RESULT, NOT_REGISTERED_RESULT, REVOKED_KEY_RESULT)
+}
+VALID_RESULT_TEMPLATE = (
+    '{{"is_valid":true,"key_index":{0},'
+    '"message":"Key matches registered key at index {0}","key_id":"{1}"}}'
+)
 
-@router.get("/info", response_model=KeysInfoResponse)
-async def get_keys_info(registered_keys: List[bytes] = Depends(get_registered_keys)):
-    """Get information about registered keys."""
-    return KeysInfoResponse(
-        total_registered_keys=len(registered_keys),
-        expected_keys=get_expected_keys_count(),
-        keys_directory=get_keys_directory()
+
+def render_validation_result(result: ValidationResponse) -> bytes:
+    """
+    Serialize a validation result without going through the response model.
+
+    Fixed outcomes use their pre-serialized body and matches fill in a
+    template; anything else falls back to the model's own serializer.
+    """
+    body = RENDERED_RESULTS.get(id(result))
+    if body is not None:
+        return body
+    if result.is_valid:
+        return VALID_RESULT_TEMPLATE.format(result.key_index, result.key_id).encode('utf-8')
+    return result.model_dump_json().encode('utf-8')
+
+
+def render_batch_results(results: List[ValidationResponse]) -> bytes:
+    """Serialize a BatchValidationResponse from pre-rendered results."""
+    return (b'{"results":[' + b",".join(render_validation_result(result) for result in results)
+            + b'],"count":' + str(len(results)).encode('ascii') + b'}')
+
+
+def validation_json_response(body: bytes) -> Response:
+    """Wrap a pre-serialized body so FastAPI skips response model encoding."""
+    return Response(content=body, media_type="application/json")
+
+
+def record_results(results: List[ValidationResponse], input_type: str):
+    """Count validation outcomes for the metrics endpoint."""
+    for result in results:
+        if result is MALFORMED_KEY_RESULT or result.message == INVALID_FINGERPRINT_MESSAGE:
+            outcome = "malformed"
+        elif result is REVOKED_KEY_RESULT:
+            outcome = "revoked"
+        elif result.is_valid:
+            outcome = "valid"
+        else:
+            outcome = "invalid"
+        VALIDATION_RESULTS.labels(input=input_type, result=outcome).inc()
+
+
+def raise_saturated(e: ExecutorSaturatedError) -> NoReturn:
+    """Convert a saturated validation executor into a 503 response."""
+    EXECUTOR_REJECTIONS.inc()
+    raise HTTPException(
+        status_code=503,
+        detail=f"Validation capacity exhausted, retry later: {str(e)}",
+        headers={"Retry-After": "1"}
     )
 
 
 @router.post("/validate", response_model=ValidationResponse)
 async def validate_public_key(
     request: PublicKeyRequest,
-    registered_keys: List[bytes] = Depends(get_registered_keys)
+    engine: KeyRegistryEngine = Depends(get_engine),
+    executor: BoundedExecutor = Depends(get_validation_executor)
 ):
     """
     Validate if the provided public key matches any of the registered sensor keys.
@@ -65,58 +165,467 @@ async def validate_public_key(
         ValidationResponse indicating if the key is valid and its index if found
     """
     try:
-        if not validate_public_key_format(request.public_key_pem):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid public key format. Expected RSA public key in PEM format."
-            )
-
-        input_key_normalized = normalize_pem_key(request.public_key_pem)
-
-        if not registered_keys:
-            return ValidationResponse(
-                is_valid=False,
-                message="No registered keys found in the registry"
-            )
-
-        # Compare against each registered key
-        for i, registered_key in enumerate(registered_keys):
-            registered_key_normalized = normalize_pem_key(
-                registered_key.decode('utf-8'))
-
-            if input_key_normalized == registered_key_normalized:
-                return ValidationResponse(
-                    is_valid=True,
-                    key_index=i,
-                    message=f"Key matches registered key at index {i}"
-                )
-
-        return ValidationResponse(
-            is_valid=False,
-            message="Public key does not match any registered keys"
-        )
+        [result] = await engine.validate_many_async([request.public_key_pem], executor)
+    except ExecutorSaturatedError as e:
+        raise_saturated(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {str(e)}")
+
+    record_results([result], "pem")
+    if result is MALFORMED_KEY_RESULT:
+        raise HTTPException(status_code=400, detail=INVALID_KEY_FORMAT_MESSAGE)
+    if FAST_RESPONSES:
+        return validation_json_response(render_validation_result(result))
+    return result
+
+
+@router.get("/cache", response_model=CacheStatsResponse)
+async def get_cache_stats(cache: ValidationCache = Depends(get_validation_cache)):
+    """Get size and hit/miss counters of the validation result cache."""
+    return CacheStatsResponse(**cache.stats())
+
+
+@router.post("/reload", response_model=ReloadResponse,
+             dependencies=[Depends(require_admin_token)])
+async def reload_registered_keys(manager: RegistryManager = Depends(get_registry_manager)):
+    """
+    Reload the registered keys from disk without restarting the service.
+    Requires the ADMIN_TOKEN bearer token.
 
-    except HTTPException:
-        raise
+    The new registry is built off the request path and swapped in atomically,
+    so validations in flight keep using the previous registry until it is
+    complete.
+    """
+    started = time.perf_counter()
+    try:
+        registry = await manager.reload()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to reload registered keys: {str(e)}")
+
+    return ReloadResponse(
+        version=registry.version,
+        registered_keys_count=len(registry.keys),
+        duration_ms=(time.perf_counter() - started) * 1000
+    )
+
+
+@router.get("/revoked", response_model=RevocationsResponse)
+async def list_revoked_keys(revocations: RevocationList = Depends(get_revocations)):
+    """List the fingerprints of revoked keys."""
+    return RevocationsResponse(
+        fingerprints=sorted(revocations.fingerprints),
+        count=len(revocations),
+        version=revocations.version
+    )
+
+
+@router.post("/revoked", response_model=RevocationResponse,
+             dependencies=[Depends(require_admin_token)])
+async def revoke_key(
+    request: Union[PublicKeyRequest, FingerprintRequest],
+    manager: RegistryManager = Depends(get_registry_manager)
+):
+    """
+    Revoke a key, given as a PEM public key or a fingerprint.
+
+    Requires the ADMIN_TOKEN bearer token. The revocation takes effect
+    immediately without reloading the registry and is written to the
+    revocation file, from which other workers pick it up within
+    REVOCATIONS_POLL_INTERVAL.
+    """
+    try:
+        if isinstance(request, FingerprintRequest):
+            fingerprint = normalize_fingerprint(request.fingerprint)
+        else:
+            fingerprint = get_key_fingerprint(request.public_key_pem)
+    except ValueError:
+        detail = (INVALID_FINGERPRINT_MESSAGE if isinstance(request, FingerprintRequest)
+                  else INVALID_KEY_FORMAT_MESSAGE)
+        raise HTTPException(status_code=400, detail=detail)
+
+    revocations, persisted = await manager.update_revocations(revoke=[fingerprint])
+    return RevocationResponse(
+        fingerprint=fingerprint,
+        revoked=True,
+        persisted=persisted,
+        version=revocations.version
+    )
+
+
+@router.delete("/revoked/{fingerprint}", response_model=RevocationResponse,
+               dependencies=[Depends(require_admin_token)])
+async def reinstate_key(
+    fingerprint: str,
+    manager: RegistryManager = Depends(get_registry_manager)
+):
+    """Reinstate a revoked key by its fingerprint. Requires the ADMIN_TOKEN bearer token."""
+    try:
+        fingerprint = normalize_fingerprint(fingerprint)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=INVALID_FINGERPRINT_MESSAGE)
+
+    revocations, persisted = await manager.update_revocations(reinstate=[fingerprint])
+    return RevocationResponse(
+        fingerprint=fingerprint,
+        revoked=False,
+        persisted=persisted,
+        version=revocations.version
+    )
+
+
+@router.post("/validate/fingerprint", response_model=ValidationResponse)
+async def validate_key_fingerprint(
+    request: FingerprintRequest,
+    engine: KeyRegistryEngine = Depends(get_engine)
+):
+    """
+    Validate a key by its SHA-256 fingerprint without parsing any PEM data.
+
+    The fingerprint is the SHA-256 digest of the key's DER-encoded
+    SubjectPublicKeyInfo, as returned by /keys/list.
+
+    Args:
+        request: Contains the hex-encoded fingerprint to validate
+
+    Returns:
+        ValidationResponse indicating if the key is valid and its index if found
+    """
+    result = engine.validate_fingerprint(request.fingerprint)
+    record_results([result], "fingerprint")
+    if result is MALFORMED_FINGERPRINT_RESULT:
+        raise HTTPException(status_code=400, detail=INVALID_FINGERPRINT_MESSAGE)
+    if FAST_RESPONSES:
+        return validation_json_response(render_validation_result(result))
+    return result
+
+
+@router.post("/validate/batch", response_model=BatchValidationResponse)
+async def validate_public_keys_batch(
+    request: BatchValidationRequest,
+    engine: KeyRegistryEngine = Depends(get_engine),
+    executor: BoundedExecutor = Depends(get_validation_executor)
+):
+    """
+    Validate many public keys in a single request.
+
+    Each item is either a PEM public key or a key fingerprint. Results are
+    returned in the same order as the submitted items. A malformed item does
+    not fail the whole batch; its result is reported as invalid.
+
+    Args:
+        request: Contains the list of public keys or fingerprints to validate
+
+    Returns:
+        BatchValidationResponse with one ValidationResponse per submitted key
+    """
+    try:
+        results = []
+        pem_positions = []
+        for item in request.keys:
+            if isinstance(item, FingerprintRequest):
+                results.append(engine.validate_fingerprint(item.fingerprint))
+                continue
+
+            pem_positions.append(len(results))
+            results.append(None)
+
+        pem_position_set = set(pem_positions)
+        pem_results = await engine.validate_many_async(
+            [request.keys[i].public_key_pem for i in pem_positions], executor)
+        for i, result in zip(pem_positions, pem_results):
+            results[i] = result
+
+        record_results(pem_results, "pem")
+        record_results([result for i, result in enumerate(results)
+                        if i not in pem_position_set], "fingerprint")
+
+        if FAST_RESPONSES:
+            return validation_json_response(render_batch_results(results))
+        return BatchValidationResponse(results=results, count=len(results))
+
+    except ExecutorSaturatedError as e:
+        raise_saturated(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+# Seconds a streaming validation waits for the executor when it is saturated
+STREAM_SATURATED_RETRY_DELAY = 0.05
+# Retries before a stream batch gives up and reports its keys as not
+# validated (about 10 seconds)
+STREAM_SATURATED_MAX_RETRIES = 200
+
+
+async def validate_stream_batch(
+    items: List[StreamItem],
+    first_item: int,
+    engine: KeyRegistryEngine,
+    executor: BoundedExecutor
+) -> bytes:
+    """Validate one batch of stream records and render their NDJSON result lines."""
+    results: List[Optional[ValidationResponse]] = []
+    pem_positions = []
+    for item in items:
+        if item.kind == "pem":
+            pem_positions.append(len(results))
+            results.append(None)
+        elif item.kind == "fingerprint":
+            result = engine.validate_fingerprint(item.value)
+            record_results([result], "fingerprint")
+            results.append(result)
+        else:
+            VALIDATION_RESULTS.labels(input="record", result="malformed").inc()
+            results.append(ValidationResponse(is_valid=False, message=item.value))
+
+    if pem_positions:
+        # The response is already streaming, so a saturated executor slows
+        # the stream down instead of failing it with a 503. If it stays
+        # saturated, the keys of this batch are reported as not validated
+        # and the stream carries on.
+        pems = [items[i].value for i in pem_positions]
+        for attempt in range(STREAM_SATURATED_MAX_RETRIES + 1):
+            try:
+                pem_results = await engine.validate_many_async(pems, executor)
+                record_results(pem_results, "pem")
+                break
+            except ExecutorSaturatedError as e:
+                if attempt == STREAM_SATURATED_MAX_RETRIES:
+                    EXECUTOR_REJECTIONS.inc()
+                    message = f"Validation capacity exhausted, retry later: {str(e)}"
+                    pem_results = [ValidationResponse(is_valid=False, message=message)
+                                   for _ in pems]
+                else:
+                    await asyncio.sleep(STREAM_SATURATED_RETRY_DELAY)
+        for i, result in zip(pem_positions, pem_results):
+            results[i] = result
+
+    return b"".join(
+        StreamValidationResult(item=first_item + i, **result.model_dump())
+        .model_dump_json().encode("utf-8") + b"\n"
+        for i, result in enumerate(results)
+    )
+
+
+async def stream_validation_results(
+    body: AsyncIterator[bytes],
+    engine: KeyRegistryEngine,
+    executor: BoundedExecutor
+) -> AsyncIterator[bytes]:
+    """
+    Parse a request body stream incrementally and yield NDJSON result lines.
+
+    At most STREAM_BATCH_SIZE records plus one body chunk are held at a time,
+    so memory stays flat regardless of how many keys are submitted.
+    """
+    parser = KeyStreamParser(MAX_STREAM_RECORD_SIZE)
+    pending: List[StreamItem] = []
+    next_item = 0
+
+    async for chunk in body:
+        pending.extend(parser.feed(chunk))
+        while len(pending) >= STREAM_BATCH_SIZE:
+            batch, pending = pending[:STREAM_BATCH_SIZE], pending[STREAM_BATCH_SIZE:]
+            yield await validate_stream_batch(
+                batch, next_item, engine, executor)
+            next_item += len(batch)
+
+    pending.extend(parser.close())
+    for start in range(0, len(pending), STREAM_BATCH_SIZE):
+        batch = pending[start:start + STREAM_BATCH_SIZE]
+        yield await validate_stream_batch(
+            batch, next_item, engine, executor)
+        next_item += len(batch)
+
+
+@router.post("/validate/stream", response_class=NDJSONStreamingResponse)
+async def validate_public_keys_stream(
+    request: Request,
+    engine: KeyRegistryEngine = Depends(get_engine),
+    executor: BoundedExecutor = Depends(get_validation_executor)
+):
+    """
+    Validate an unbounded stream of keys with bounded memory.
+
+    The request body is newline-delimited JSON ({"public_key_pem": ...} or
+    {"fingerprint": ...} per line) and/or concatenated PEM public keys. One
+    NDJSON line is streamed back per record as soon as its batch has been
+    validated, in input order and tagged with the record number. The whole
+    stream is validated against the registry and revocation list that were
+    current when it began.
+    """
+    return NDJSONStreamingResponse(
+        stream_validation_results(
+            request.stream(), engine, executor))
+
+
+# Registered keys rendered per chunk of a streamed /keys/list response
+LIST_STREAM_CHUNK_SIZE = 1000
+
+
+def registered_key_item(i: int, registered_key, fingerprints_only: bool) -> dict:
+    """Render one registered key as a plain dict in the RegisteredKeyItem shape."""
+    return {
+        "index": i,
+        "key_pem": None if fingerprints_only else registered_key.key_pem.decode('utf-8'),
+        "fingerprint": registered_key.fingerprint
+    }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an entity tag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+def stream_registered_keys(registry: KeyRegistry, start: int, end: int,
+                           fingerprints_only: bool) -> Iterator[bytes]:
+    """Yield registered keys as NDJSON lines, one chunk of keys at a time."""
+    for chunk_start in range(start, end, LIST_STREAM_CHUNK_SIZE):
+        chunk_end = min(end, chunk_start + LIST_STREAM_CHUNK_SIZE)
+        yield "".join(
+            json.dumps(registered_key_item(i, registry.keys[i], fingerprints_only)) + "\n"
+            for i in range(chunk_start, chunk_end)
+        ).encode('utf-8')
+
+
 @router.get("/list", response_model=RegisteredKeysResponse)
-async def list_registered_keys(registered_keys: List[bytes] = Depends(get_registered_keys)):
+async def list_registered_keys(
+    request: Request,
+    offset: int = Query(0, ge=0, description="Index of the first key to return"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of keys to return (all by default)"),
+    fingerprints_only: bool = Query(False, description="Omit the PEM data of each key"),
+    stream: bool = Query(False, description="Stream the keys as NDJSON, one key per line"),
+    registry: KeyRegistry = Depends(get_registry)
+):
     """
-    List all registered public keys (for debugging/admin purposes).
-    Returns the keys in PEM format.
+    List registered public keys (for debugging/admin purposes).
+    Returns the keys in PEM format along with their fingerprints.
+
+    Use offset and limit to page through a large registry (next_offset is
+    the offset of the following page), fingerprints_only to skip the PEM
+    data, and stream for full dumps. Responses carry an ETag that changes
+    only when the registered keys do, and a matching If-None-Match gets an
+    empty 304 response.
     """
-    keys_list = []
-    for i, key_data in enumerate(registered_keys):
-        keys_list.append(RegisteredKeyItem(
-            index=i,
-            key_pem=key_data.decode('utf-8')
-        ))
+    etag = registry.etag
+    if etag is None:
+        etag = await asyncio.to_thread(registry.compute_etag)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    total = len(registry.keys)
+    start = min(offset, total)
+    end = total if limit is None else min(total, start + limit)
+
+    if stream:
+        return StreamingResponse(
+            stream_registered_keys(registry, start, end, fingerprints_only),
+            media_type="application/x-ndjson",
+            headers=headers
+        )
+
+    # Plain dicts rendered straight to JSON, skipping a Pydantic model per key
+    content = {
+        "registered_keys": [registered_key_item(i, registry.keys[i], fingerprints_only)
+                            for i in range(start, end)],
+        "count": end - start,
+        "total": total,
+        "next_offset": end if end < total else None
+    }
+    return Response(
+        content=json.dumps(content), media_type="application/json", headers=headers)
+
+
+def render_manifest_fingerprints(registry: KeyRegistry) -> bytes:
+    """Serialize the sorted registered fingerprints of a registry as a JSON array."""
+    fingerprints = sorted({registered_key.fingerprint for registered_key in registry.keys})
+    return json.dumps(fingerprints).encode('utf-8')
+
+
+def render_manifest(registry: KeyRegistry, revocations: RevocationList) -> bytes:
+    """
+    Serialize the full manifest of a registry and revocation list.
 
-    return RegisteredKeysResponse(
-        registered_keys=keys_list,
-        count=len(keys_list)
+    The fingerprint list is rendered once per registry; the revoked list,
+    which changes without a reload, is rendered per request.
+    """
+    fingerprints = registry.get_rendered("manifest_fingerprints", render_manifest_fingerprints)
+    return (
+        b'{"version":' + str(registry.version).encode('ascii')
+        + b',"full":true,"fingerprints":' + fingerprints
+        + b',"added":null,"removed":null,"count":' + str(len(registry.index)).encode('ascii')
+        + b',"revoked":' + json.dumps(sorted(revocations.fingerprints)).encode('utf-8')
+        + b',"revocations_version":' + str(revocations.version).encode('ascii') + b'}'
     )
+
+
+@router.get("/manifest", response_model=ManifestResponse)
+async def get_manifest(
+    since: Optional[int] = Query(None, ge=0, description="Registry version the client already has"),
+    registry: KeyRegistry = Depends(get_registry),
+    revocations: RevocationList = Depends(get_revocations)
+):
+    """
+    Get the set of registered fingerprints for client-side replicas.
+
+    Clients keep the fingerprint set and its version and validate keys
+    locally, then poll with since=<version> to receive only the
+    fingerprints added and removed since then. If the version is unknown
+    to this server (too old, or loaded by another process), the full
+    manifest is returned instead, with full=true. The revoked fingerprints
+    are always listed in full.
+    """
+    if since is not None:
+        changes = registry.changes_since(since)
+        if changes is not None:
+            added, removed = changes
+            content = {
+                "version": registry.version,
+                "full": False,
+                "fingerprints": None,
+                "added": sorted(added),
+                "removed": sorted(removed),
+                "count": len(registry.index),
+                "revoked": sorted(revocations.fingerprints),
+                "revocations_version": revocations.version
+            }
+            return Response(content=json.dumps(content), media_type="application/json")
+
+    body = await asyncio.to_thread(render_manifest, registry, revocations)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/by-sensor/{sensor_id}", response_model=SensorKeysResponse)
+async def get_keys_by_sensor(
+    sensor_id: str,
+    registry: KeyRegistry = Depends(get_registry),
+    revocations: RevocationList = Depends(get_revocations),
+    store: KeyMetadataStore = Depends(get_metadata_store)
+):
+    """
+    Look up the keys of a sensor and their metadata.
+
+    Each key reports whether it is in the current registry and, if so, its
+    index. Keys with metadata but no registered key have registered=false.
+    """
+    records = store.get_by_sensor(sensor_id)
+    if not records:
+        raise HTTPException(
+            status_code=404, detail=f"No keys found for sensor {sensor_id}")
+
+    keys = []
+    for record in records:
+        key_index = registry.index.get(record.fingerprint)
+        keys.append(SensorKeyItem(
+            key_index=key_index,
+            registered=key_index is not None,
+            revoked=revocations.is_revoked(record.fingerprint),
+            **record._asdict()
+        ))
+    return SensorKeysResponse(sensor_id=sensor_id, keys=keys, count=len(keys))
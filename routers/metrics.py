@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from utils.metrics import render_metrics, METRICS_CONTENT_TYPE
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose service metrics in the Prometheus text format."""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
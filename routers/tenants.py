@@ -0,0 +1,95 @@
+from fastapi import APIRouter, HTTPException, Depends
+
+from models.requests import PublicKeyRequest, FingerprintRequest, BatchValidationRequest
+from models.responses import (
+    ValidationResponse,
+    BatchValidationResponse,
+    TenantInfoResponse,
+    TenantsResponse
+)
+from routers.dependencies import get_validation_executor, get_tenant_registries
+from routers.keys import (
+    validate_public_key,
+    validate_key_fingerprint,
+    validate_public_keys_batch
+)
+from utils.executor import BoundedExecutor
+from utils.tenants import Tenant, TenantRegistries, UnknownTenantError
+
+router = APIRouter(tags=["tenants"])
+
+
+async def get_tenant(
+    tenant: str,
+    tenants: TenantRegistries = Depends(get_tenant_registries)
+) -> Tenant:
+    """Dependency to get a tenant's registry, loading it on first use."""
+    try:
+        return await tenants.get(tenant)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UnknownTenantError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to load tenant keys: {str(e)}")
+
+
+def tenant_info(tenant: Tenant) -> TenantInfoResponse:
+    """Describe a loaded tenant."""
+    return TenantInfoResponse(
+        tenant=tenant.name,
+        registered_keys_count=len(tenant.engine.registry.keys),
+        skipped_keys=len(tenant.engine.registry.errors),
+        revoked_keys=len(tenant.engine.revocations),
+        memory_bytes=tenant.size
+    )
+
+
+@router.get("/tenants", response_model=TenantsResponse)
+async def list_loaded_tenants(tenants: TenantRegistries = Depends(get_tenant_registries)):
+    """List the tenant registries currently held in memory, least recently used first."""
+    loaded = [tenant_info(tenant) for tenant in tenants.loaded()]
+    return TenantsResponse(
+        tenants=loaded,
+        count=len(loaded),
+        memory_used=tenants.memory_used,
+        memory_budget=tenants.memory_budget
+    )
+
+
+@router.get("/t/{tenant}/keys/info", response_model=TenantInfoResponse)
+async def get_tenant_info(tenant: Tenant = Depends(get_tenant)):
+    """Get information about a tenant's registered keys."""
+    return tenant_info(tenant)
+
+
+@router.post("/t/{tenant}/validate", response_model=ValidationResponse)
+async def validate_tenant_public_key(
+    request: PublicKeyRequest,
+    tenant: Tenant = Depends(get_tenant),
+    executor: BoundedExecutor = Depends(get_validation_executor)
+):
+    """Validate a public key against a tenant's registered keys, like /validate."""
+    return await validate_public_key(
+        request, tenant.engine, executor)
+
+
+@router.post("/t/{tenant}/keys/validate/fingerprint", response_model=ValidationResponse)
+async def validate_tenant_key_fingerprint(
+    request: FingerprintRequest,
+    tenant: Tenant = Depends(get_tenant)
+):
+    """Validate a key fingerprint against a tenant's registered keys."""
+    return await validate_key_fingerprint(request, tenant.engine)
+
+
+@router.post("/t/{tenant}/keys/validate/batch", response_model=BatchValidationResponse)
+async def validate_tenant_public_keys_batch(
+    request: BatchValidationRequest,
+    tenant: Tenant = Depends(get_tenant),
+    executor: BoundedExecutor = Depends(get_validation_executor)
+):
+    """Validate many public keys or fingerprints against a tenant's registered keys."""
+    return await validate_public_keys_batch(
+        request, tenant.engine, executor)
@@ -0,0 +1,199 @@
+import base64
+import binascii
+from typing import List, Tuple, Union
+from fastapi import APIRouter, HTTPException, Depends
+
+from models.requests import SignatureVerificationRequest, BatchSignatureVerificationRequest
+from models.responses import SignatureVerificationResponse, BatchSignatureVerificationResponse
+from routers.dependencies import (
+    get_registry,
+    get_revocations,
+    get_public_key_cache,
+    get_validation_executor,
+    get_verification_executor
+)
+from routers.keys import raise_saturated
+from utils.config import VERIFY_PROCESSES, VERIFY_CHUNK_SIZE
+from utils.engine import NOT_REGISTERED_RESULT, REVOKED_KEY_RESULT
+from utils.executor import BoundedExecutor, ExecutorSaturatedError
+from utils.key_index import normalize_fingerprint
+from utils.metrics import SIGNATURE_VERIFICATIONS
+from utils.registry import KeyRegistry
+from utils.revocations import RevocationList
+from utils.signatures import PublicKeyCache, VerificationJob, verify_job, verify_jobs
+
+router = APIRouter(tags=["verify"])
+
+INVALID_VERIFICATION_MESSAGE = "Invalid verification request"
+
+
+def decode_verification_input(request: SignatureVerificationRequest) -> Tuple[bytes, bytes]:
+    """
+    Decode the payload and base64 signature of a verification request.
+
+    Raises:
+        ValueError: If the payload or signature is not valid base64
+    """
+    try:
+        if request.payload_encoding == "base64":
+            payload = base64.b64decode(request.payload, validate=True)
+        else:
+            payload = request.payload.encode('utf-8')
+        signature = base64.b64decode(request.signature, validate=True)
+    except binascii.Error:
+        raise ValueError("payload or signature is not valid base64")
+    return payload, signature
+
+
+def prepare_verification(
+    request: SignatureVerificationRequest,
+    registry: KeyRegistry,
+    revocations: RevocationList
+) -> Union[Tuple[int, VerificationJob], SignatureVerificationResponse]:
+    """
+    Resolve the registered key of a verification request.
+
+    Returns:
+        The key index and the job to run, or a failed result if the key is
+        not registered or has been revoked
+
+    Raises:
+        ValueError: If the request is malformed
+    """
+    if request.fingerprint is not None:
+        i = registry.index.get(normalize_fingerprint(request.fingerprint))
+    elif request.key_index is not None:
+        i = request.key_index if 0 <= request.key_index < len(registry.keys) else None
+    else:
+        raise ValueError("either fingerprint or key_index is required")
+    payload, signature = decode_verification_input(request)
+
+    if i is None:
+        SIGNATURE_VERIFICATIONS.labels(result="unregistered").inc()
+        return SignatureVerificationResponse(
+            verified=False, message=NOT_REGISTERED_RESULT.message)
+
+    registered_key = registry.keys[i]
+    if revocations.is_revoked(registered_key.fingerprint):
+        SIGNATURE_VERIFICATIONS.labels(result="revoked").inc()
+        return SignatureVerificationResponse(
+            verified=False, key_index=i, message=REVOKED_KEY_RESULT.message)
+
+    return i, VerificationJob(
+        fingerprint=registered_key.fingerprint,
+        key_pem=registered_key.key_pem,
+        payload=payload,
+        signature=signature,
+        padding=request.padding,
+        hash_algorithm=request.hash_algorithm
+    )
+
+
+def verification_result(i: int, verified: bool) -> SignatureVerificationResponse:
+    """Build the result of a completed verification and count it."""
+    SIGNATURE_VERIFICATIONS.labels(result="verified" if verified else "failed").inc()
+    if verified:
+        return SignatureVerificationResponse(
+            verified=True,
+            key_index=i,
+            message=f"Signature is valid for registered key at index {i}"
+        )
+    return SignatureVerificationResponse(
+        verified=False,
+        key_index=i,
+        message=f"Signature does not match registered key at index {i}"
+    )
+
+
+@router.post("/verify", response_model=SignatureVerificationResponse)
+async def verify_signature(
+    request: SignatureVerificationRequest,
+    registry: KeyRegistry = Depends(get_registry),
+    revocations: RevocationList = Depends(get_revocations),
+    key_cache: PublicKeyCache = Depends(get_public_key_cache),
+    executor: BoundedExecutor = Depends(get_validation_executor)
+):
+    """
+    Verify a signature over a payload with a registered key.
+
+    The key is given by fingerprint or key index. The signature is base64
+    encoded; the payload is UTF-8 text unless payload_encoding is "base64".
+    RSA-PSS (any salt length) and PKCS#1 v1.5 with SHA-256/384/512 are
+    supported. Parsed keys are cached, so repeat verifications with the
+    same key skip PEM parsing.
+
+    Returns:
+        SignatureVerificationResponse indicating if the signature is valid
+    """
+    try:
+        prepared = prepare_verification(request, registry, revocations)
+    except ValueError as e:
+        SIGNATURE_VERIFICATIONS.labels(result="malformed").inc()
+        raise HTTPException(status_code=400, detail=f"{INVALID_VERIFICATION_MESSAGE}: {e}")
+    if isinstance(prepared, SignatureVerificationResponse):
+        return prepared
+
+    i, job = prepared
+    try:
+        verified = await executor.run(verify_job, job, key_cache)
+    except ExecutorSaturatedError as e:
+        raise_saturated(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {str(e)}")
+    return verification_result(i, verified)
+
+
+@router.post("/verify/batch", response_model=BatchSignatureVerificationResponse)
+async def verify_signatures_batch(
+    request: BatchSignatureVerificationRequest,
+    registry: KeyRegistry = Depends(get_registry),
+    revocations: RevocationList = Depends(get_revocations),
+    key_cache: PublicKeyCache = Depends(get_public_key_cache),
+    executor: BoundedExecutor = Depends(get_verification_executor)
+):
+    """
+    Verify many signatures in a single request.
+
+    Signatures are verified in chunks of VERIFY_CHUNK_SIZE. By default the
+    chunks run in the validation threads (VALIDATION_WORKERS) and share one
+    cache of parsed keys; with VERIFY_PROCESSES set they are spread across
+    a pool of that many processes instead.
+    Results are returned in the same order as the submitted items, and a
+    malformed item is reported in its own result instead of failing the
+    whole batch.
+    """
+    results: List[SignatureVerificationResponse] = []
+    jobs = []
+    for item in request.items:
+        try:
+            prepared = prepare_verification(item, registry, revocations)
+        except ValueError as e:
+            SIGNATURE_VERIFICATIONS.labels(result="malformed").inc()
+            prepared = SignatureVerificationResponse(
+                verified=False, message=f"{INVALID_VERIFICATION_MESSAGE}: {e}")
+        if isinstance(prepared, SignatureVerificationResponse):
+            results.append(prepared)
+            continue
+        i, job = prepared
+        jobs.append((len(results), i, job))
+        results.append(None)
+
+    # Worker processes keep their own parsed key caches; threads share ours
+    cache_argument = () if VERIFY_PROCESSES > 0 else (key_cache,)
+    chunks = executor.chunk(jobs, VERIFY_CHUNK_SIZE)
+    try:
+        chunk_results = await executor.run_many(verify_jobs, [
+            ([job for _, _, job in chunk], *cache_argument) for chunk in chunks
+        ])
+    except ExecutorSaturatedError as e:
+        raise_saturated(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {str(e)}")
+
+    for chunk, verified in zip(chunks, chunk_results):
+        for (position, i, _), result in zip(chunk, verified):
+            results[position] = verification_result(i, result)
+
+    return BatchSignatureVerificationResponse(results=results, count=len(results))
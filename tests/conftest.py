@@ -0,0 +1,42 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.benchmark import generate_public_key_pem  # noqa: E402
+
+
+@pytest.fixture
+def pems():
+    """Distinct synthetic RSA public keys in PEM format, generated on demand."""
+    generated = []
+
+    def get(i: int) -> str:
+        while len(generated) <= i:
+            generated.append(generate_public_key_pem())
+        return generated[i]
+
+    return get
+
+
+@pytest.fixture
+def write_key_file(tmp_path):
+    """
+    Write a key file into tmp_path with a strictly increasing modification time.
+
+    Directory stores version files by modification time and size, so every
+    write must look like a change even within the clock's resolution.
+    """
+    mtimes = itertools.count(1_700_000_000_000_000_000, 1_000_000_000)
+
+    def write(name: str, content: str) -> str:
+        path = tmp_path / name
+        path.write_text(content)
+        mtime = next(mtimes)
+        os.utime(path, ns=(mtime, mtime))
+        return str(path)
+
+    return write
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import dependencies, keys
+from utils.registry import KeyRegistry
+
+
+class StubManager:
+    def __init__(self):
+        self.reloads = 0
+
+    async def reload(self) -> KeyRegistry:
+        self.reloads += 1
+        return KeyRegistry([], 7)
+
+
+@pytest.fixture
+def manager():
+    return StubManager()
+
+
+@pytest.fixture
+def client(manager):
+    app = FastAPI()
+    app.include_router(keys.router)
+    app.dependency_overrides[dependencies.get_registry_manager] = lambda: manager
+    return TestClient(app)
+
+
+def test_reload_is_disabled_without_an_admin_token(client, manager, monkeypatch):
+    monkeypatch.setattr(dependencies, "ADMIN_TOKEN", "")
+
+    assert client.post("/keys/reload").status_code == 403
+    assert manager.reloads == 0
+
+
+def test_reload_requires_the_admin_token(client, manager, monkeypatch):
+    monkeypatch.setattr(dependencies, "ADMIN_TOKEN", "secret")
+
+    response = client.post("/keys/reload")
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert client.post(
+        "/keys/reload", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert manager.reloads == 0
+
+    response = client.post("/keys/reload", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert response.json()["version"] == 7
+    assert manager.reloads == 1
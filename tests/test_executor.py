@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from routers import keys
+from utils.engine import KeyRegistryEngine
+from utils.executor import BoundedExecutor, ExecutorSaturatedError
+from utils.key_index import RegisteredKey, get_key_fingerprint
+from utils.key_stream import StreamItem
+from utils.registry import KeyRegistry
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor(max_workers=2, queue_limit=0)
+    yield executor
+    executor.shutdown()
+
+
+def test_chunks_never_outnumber_the_slots(executor):
+    assert [len(chunk) for chunk in executor.chunk(list(range(100)), 64)] == [64, 36]
+    assert [len(chunk) for chunk in executor.chunk(list(range(1000)), 64)] == [500, 500]
+    assert [len(chunk) for chunk in executor.chunk(list(range(1001)), 64)] == [501, 500]
+    assert executor.chunk([], 64) == []
+
+
+def test_more_calls_than_slots_are_rejected_outright(executor):
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run_many(len, [("a",), ("b",), ("c",)]))
+    # No slots were taken
+    assert asyncio.run(executor.run_many(len, [("a",), ("bb",)])) == [1, 2]
+
+
+def test_saturated_executor_rejects_the_whole_call(executor):
+    async def scenario():
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def block():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+
+        running = asyncio.ensure_future(executor.run(block))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run_many(len, [("a",), ("b",)])
+        assert await executor.run(len, "abc") == 3
+        release.set()
+        await running
+
+    asyncio.run(scenario())
+
+
+def test_large_batch_fits_an_executor_without_a_queue(executor, pems):
+    registered = [RegisteredKey(f"key_{i}.pem", pems(i).encode(), get_key_fingerprint(pems(i)))
+                  for i in range(3)]
+    engine = KeyRegistryEngine(KeyRegistry(registered, 1))
+    batch = [pems(i % 4) for i in range(300)]
+
+    results = asyncio.run(engine.validate_many_async(batch, executor))
+
+    assert [result.is_valid for result in results] == [i % 4 != 3 for i in range(300)]
+
+
+def test_stream_batch_stops_retrying_a_saturated_executor(executor, monkeypatch):
+    class SaturatedEngine:
+        calls = 0
+
+        async def validate_many_async(self, pems, executor):
+            self.calls += 1
+            raise ExecutorSaturatedError("busy")
+
+    monkeypatch.setattr(keys, "STREAM_SATURATED_RETRY_DELAY", 0)
+    monkeypatch.setattr(keys, "STREAM_SATURATED_MAX_RETRIES", 3)
+    engine = SaturatedEngine()
+
+    body = asyncio.run(keys.validate_stream_batch(
+        [StreamItem("pem", "key"), StreamItem("error", "bad record")], 10, engine, executor))
+
+    assert engine.calls == 4
+    lines = body.decode().splitlines()
+    assert len(lines) == 2
+    assert '"item":10' in lines[0] and "Validation capacity exhausted" in lines[0]
+    assert '"item":11' in lines[1] and "bad record" in lines[1]
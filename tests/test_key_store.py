@@ -0,0 +1,210 @@
+from typing import Dict, List, Optional
+
+import pytest
+import requests
+
+from utils import key_store
+from utils.key_store import (
+    CachedKeyStore,
+    HTTPKeyStore,
+    KeyObject,
+    KeyStore,
+    SQLiteKeyStore
+)
+
+
+LIST_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+def make_response(status_code: int, content: bytes = b"") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+def list_page(keys: Dict[str, str], next_token: Optional[str] = None) -> bytes:
+    """Render a ListObjectsV2 result page for objects given as {key: etag}."""
+    contents = "".join(
+        f"<Contents><Key>{key}</Key><ETag>&quot;{etag}&quot;</ETag><Size>1</Size></Contents>"
+        for key, etag in keys.items())
+    truncated = (f"<IsTruncated>true</IsTruncated>"
+                 f"<NextContinuationToken>{next_token}</NextContinuationToken>"
+                 if next_token else "<IsTruncated>false</IsTruncated>")
+    return (f'<ListBucketResult xmlns="{LIST_NAMESPACE}">{contents}{truncated}'
+            f'</ListBucketResult>').encode('utf-8')
+
+
+class StubSession:
+    """Stands in for requests.Session, answering GETs from canned responses."""
+
+    def __init__(self):
+        self.pages: Dict[Optional[str], bytes] = {}
+        # Object contents by URL
+        self.objects: Dict[str, bytes] = {}
+        self.calls: List[tuple] = []
+
+    def get(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None):
+        self.calls.append((url, dict(params or {})))
+        if params is not None:
+            return make_response(200, self.pages[params.get("continuation-token")])
+        if url not in self.objects:
+            return make_response(404)
+        return make_response(200, self.objects[url])
+
+
+class CountingStore(KeyStore):
+    """In-memory store that counts the calls reaching it."""
+
+    def __init__(self, files: Dict[str, bytes]):
+        self.files = files
+        self.versions = {name: "1" for name in files}
+        self.list_calls = 0
+        self.fetch_calls = 0
+
+    def list_keys(self) -> List[KeyObject]:
+        self.list_calls += 1
+        return [KeyObject(name, self.versions[name]) for name in sorted(self.files)]
+
+    def fetch_key(self, name: str, version: Optional[str] = None) -> Optional[bytes]:
+        self.fetch_calls += 1
+        return self.files.get(name)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the key store module."""
+    now = [1000.0]
+    monkeypatch.setattr(key_store.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_key_store_requires_list_and_fetch():
+    class Incomplete(KeyStore):
+        def list_keys(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_http_store_follows_continuation_tokens():
+    session = StubSession()
+    session.pages[None] = list_page(
+        {"fleet/key_10.pem": "a", "fleet/key_2.pem": "b", "fleet/notes.txt": "c"}, "page-2")
+    session.pages["page-2"] = list_page(
+        {"fleet/key_1.jsonl": "d", "fleet/archive/key_3.pem": "e"})
+    store = HTTPKeyStore("http://minio:9000/keys/", "fleet/", session=session)
+
+    assert store.list_keys() == [
+        KeyObject("key_1.jsonl", "d"),
+        KeyObject("key_2.pem", "b"),
+        KeyObject("key_10.pem", "a"),
+    ]
+    assert [params for _, params in session.calls] == [
+        {"list-type": "2", "prefix": "fleet/"},
+        {"list-type": "2", "prefix": "fleet/", "continuation-token": "page-2"},
+    ]
+    assert all(url == "http://minio:9000/keys/" for url, _ in session.calls)
+
+
+def test_http_store_fetches_objects_under_the_prefix():
+    session = StubSession()
+    session.objects["http://minio:9000/keys/fleet/key%201.pem"] = b"pem"
+    store = HTTPKeyStore("http://minio:9000/keys", "fleet/", session=session)
+
+    assert store.fetch_key("key 1.pem") == b"pem"
+    assert store.fetch_key("key_2.pem") is None
+
+
+def test_http_store_raises_on_server_errors():
+    class FailingSession(StubSession):
+        def get(self, url, params=None, timeout=None):
+            return make_response(500)
+
+    store = HTTPKeyStore("http://minio:9000/keys", session=FailingSession())
+    with pytest.raises(requests.HTTPError):
+        store.list_keys()
+    with pytest.raises(requests.HTTPError):
+        store.fetch_key("key_1.pem")
+
+
+def test_cached_store_serves_unchanged_versions_from_cache(clock):
+    backend = CountingStore({"key_1.pem": b"one"})
+    store = CachedKeyStore(backend, ttl=30, negative_ttl=5)
+
+    assert store.fetch_key("key_1.pem", "1") == b"one"
+    clock[0] += 3600
+    assert store.fetch_key("key_1.pem", "1") == b"one"
+    assert backend.fetch_calls == 1
+
+    backend.files["key_1.pem"] = b"uno"
+    assert store.fetch_key("key_1.pem", "2") == b"uno"
+    assert backend.fetch_calls == 2
+    assert (store.hits, store.misses) == (1, 2)
+
+
+def test_cached_store_expires_unversioned_fetches(clock):
+    backend = CountingStore({"key_1.pem": b"one"})
+    store = CachedKeyStore(backend, ttl=30, negative_ttl=5)
+
+    store.fetch_key("key_1.pem")
+    clock[0] += 29
+    store.fetch_key("key_1.pem")
+    assert backend.fetch_calls == 1
+    clock[0] += 2
+    store.fetch_key("key_1.pem")
+    assert backend.fetch_calls == 2
+
+
+def test_cached_store_remembers_missing_files_for_the_negative_ttl(clock):
+    backend = CountingStore({})
+    store = CachedKeyStore(backend, ttl=30, negative_ttl=5)
+
+    assert store.fetch_key("key_1.pem", "1") is None
+    backend.files["key_1.pem"] = b"one"
+    assert store.fetch_key("key_1.pem", "1") is None
+    assert backend.fetch_calls == 1
+
+    clock[0] += 6
+    assert store.fetch_key("key_1.pem", "1") == b"one"
+    assert backend.fetch_calls == 2
+
+
+def test_cached_store_caches_the_listing_until_invalidated(clock):
+    backend = CountingStore({"key_1.pem": b"one", "key_2.pem": b"two"})
+    store = CachedKeyStore(backend, ttl=30, negative_ttl=5)
+
+    store.list_keys()
+    store.list_keys()
+    assert backend.list_calls == 1
+    clock[0] += 31
+    store.list_keys()
+    assert backend.list_calls == 2
+
+    store.fetch_key("key_2.pem", "1")
+    del backend.files["key_2.pem"], backend.versions["key_2.pem"]
+    store.invalidate()
+    assert store.list_keys() == [KeyObject("key_1.pem", "1")]
+    # Files gone from the listing are dropped from the cache
+    assert store.fetch_key("key_2.pem", "1") is None
+    assert backend.fetch_calls == 2
+
+
+def test_sqlite_store_bumps_versions_on_write(tmp_path):
+    store = SQLiteKeyStore(str(tmp_path / "keys.db"))
+    try:
+        store.put_key("key_10.pem", b"ten")
+        store.put_key("key_2.pem", b"two")
+        assert store.list_keys() == [KeyObject("key_2.pem", "1"), KeyObject("key_10.pem", "1")]
+
+        store.put_key("key_2.pem", b"deux")
+        assert store.list_keys()[0] == KeyObject("key_2.pem", "2")
+        assert store.fetch_key("key_2.pem") == b"deux"
+
+        assert store.delete_key("key_2.pem")
+        assert not store.delete_key("key_2.pem")
+        assert store.fetch_key("key_2.pem") is None
+        assert store.signature() == (KeyObject("key_10.pem", "1"),)
+    finally:
+        store.close()
@@ -0,0 +1,125 @@
+import json
+from typing import List
+
+import pytest
+
+from utils.key_stream import (
+    INVALID_RECORD_MESSAGE,
+    RECORD_TOO_LARGE_MESSAGE,
+    UNTERMINATED_PEM_MESSAGE,
+    KeyStreamParser,
+    StreamItem
+)
+
+
+MAX_RECORD_SIZE = 2048
+CHUNK_SIZES = [1, 2, 7, 64, 500, 1 << 20]
+
+
+def parse(body: bytes, chunk_size: int) -> List[StreamItem]:
+    parser = KeyStreamParser(MAX_RECORD_SIZE)
+    items = []
+    for start in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[start:start + chunk_size]))
+    items.extend(parser.close())
+    return items
+
+
+def assert_independent_of_chunking(body: bytes) -> List[StreamItem]:
+    """Parse a body in several chunk sizes and check every split gives the same items."""
+    expected = parse(body, len(body) or 1)
+    for chunk_size in CHUNK_SIZES:
+        assert parse(body, chunk_size) == expected, f"chunk size {chunk_size}"
+    return expected
+
+
+def test_mixed_ndjson_and_pem(pems):
+    body = "".join([
+        json.dumps({"public_key_pem": pems(0)}) + "\n",
+        pems(1),
+        "\n",
+        json.dumps({"fingerprint": "ab" * 32}) + "\r\n",
+        pems(2).replace("\n", "\r\n"),
+    ]).encode()
+
+    items = assert_independent_of_chunking(body)
+
+    assert [item.kind for item in items] == ["pem", "pem", "fingerprint", "pem"]
+    assert items[0].value == pems(0)
+    assert items[1].value == pems(1)
+    assert items[2].value == "ab" * 32
+    assert items[3].value == pems(2)
+
+
+def test_invalid_records_are_reported_in_place(pems):
+    body = "\n".join([
+        "not a record",
+        "{not json",
+        json.dumps({"other": 1}),
+        json.dumps({"fingerprint": 5}),
+        json.dumps({"fingerprint": "cd" * 32}),
+    ]).encode()
+
+    items = assert_independent_of_chunking(body)
+
+    assert items == [StreamItem("error", INVALID_RECORD_MESSAGE)] * 4 + [
+        StreamItem("fingerprint", "cd" * 32)]
+
+
+@pytest.mark.parametrize("size", [MAX_RECORD_SIZE + 1, MAX_RECORD_SIZE * 3])
+def test_oversized_json_line_is_skipped(size):
+    padding = "x" * size
+    body = (json.dumps({"fingerprint": "ab" * 32, "padding": padding}) + "\n"
+            + json.dumps({"fingerprint": "cd" * 32}) + "\n").encode()
+
+    items = assert_independent_of_chunking(body)
+
+    assert items == [
+        StreamItem("error", RECORD_TOO_LARGE_MESSAGE),
+        StreamItem("fingerprint", "cd" * 32),
+    ]
+
+
+def test_oversized_line_inside_a_pem_block_abandons_the_block(pems):
+    lines = pems(0).splitlines()
+    oversized = "\n".join(lines[:2] + ["A" * (MAX_RECORD_SIZE + 10)] + lines[2:]) + "\n"
+    body = (oversized + pems(1)).encode()
+
+    items = assert_independent_of_chunking(body)
+
+    assert items == [
+        StreamItem("error", RECORD_TOO_LARGE_MESSAGE),
+        StreamItem("pem", pems(1)),
+    ]
+
+
+def test_oversized_pem_block_is_skipped(pems):
+    lines = pems(0).splitlines()
+    body_lines = lines[1:-1] * (MAX_RECORD_SIZE // len(pems(0)) + 2)
+    oversized = "\n".join([lines[0]] + body_lines + [lines[-1]]) + "\n"
+    body = (oversized + json.dumps({"fingerprint": "ab" * 32}) + "\n").encode()
+
+    items = assert_independent_of_chunking(body)
+
+    assert items == [
+        StreamItem("error", RECORD_TOO_LARGE_MESSAGE),
+        StreamItem("fingerprint", "ab" * 32),
+    ]
+
+
+def test_unterminated_pem_block_is_reported_at_the_end(pems):
+    truncated = "\n".join(pems(1).splitlines()[:-1])
+    body = (pems(0) + truncated).encode()
+
+    items = assert_independent_of_chunking(body)
+
+    assert items == [
+        StreamItem("pem", pems(0)),
+        StreamItem("error", UNTERMINATED_PEM_MESSAGE),
+    ]
+
+
+def test_last_record_without_a_newline_is_parsed():
+    body = json.dumps({"fingerprint": "ab" * 32}).encode()
+
+    assert assert_independent_of_chunking(body) == [StreamItem("fingerprint", "ab" * 32)]
@@ -0,0 +1,156 @@
+from typing import List, Optional
+
+import pytest
+
+from client.fingerprints import get_key_fingerprint as client_key_fingerprint
+from client.replica import KeyRegistryReplica
+from utils import registry as registry_module
+from utils.key_index import RegisteredKey, get_key_fingerprint
+from utils.registry import KeyRegistry
+
+
+def fingerprint(i: int) -> str:
+    return f"{i:064x}"
+
+
+def make_registry(numbers: List[int], version: int, previous: Optional[KeyRegistry] = None):
+    """Build a registry holding fingerprint(i) for each number, as a reload would."""
+    keys = [RegisteredKey(f"key_{i}.pem", b"", fingerprint(i)) for i in numbers]
+    registry = KeyRegistry(keys, version)
+    if previous is not None:
+        registry.record_changes(previous)
+    return registry
+
+
+@pytest.fixture
+def history_limit(monkeypatch):
+    monkeypatch.setattr(registry_module, "MANIFEST_HISTORY", 3)
+
+
+class StubClient:
+    """Serves manifests from a registry the way GET /keys/manifest does."""
+
+    def __init__(self, registry: KeyRegistry, revoked=()):
+        self.registry = registry
+        self.revoked = list(revoked)
+        self.fail = False
+        self.requests: List[Optional[int]] = []
+
+    def get_manifest(self, since: Optional[int] = None) -> dict:
+        self.requests.append(since)
+        if self.fail:
+            return {"error": "connection refused"}
+        registry = self.registry
+        manifest = {
+            "version": registry.version,
+            "full": True,
+            "fingerprints": sorted(registry.index),
+            "added": None,
+            "removed": None,
+            "revoked": self.revoked,
+            "revocations_version": 1
+        }
+        changes = registry.changes_since(since) if since is not None else None
+        if changes is not None:
+            manifest.update(full=False, fingerprints=None,
+                            added=sorted(changes[0]), removed=sorted(changes[1]))
+        return manifest
+
+
+def test_changes_accumulate_across_reloads():
+    v1 = make_registry([1, 2, 3], 1)
+    v2 = make_registry([1, 2, 3, 4], 2, v1)
+    v3 = make_registry([1, 3, 4, 5], 3, v2)
+    v4 = make_registry([1, 2, 3, 5], 4, v3)
+
+    assert v4.changes_since(4) == (set(), set())
+    assert v4.changes_since(3) == ({fingerprint(2)}, {fingerprint(4)})
+    # Key 4 was added and removed again, key 2 removed and added again
+    assert v4.changes_since(1) == ({fingerprint(5)}, set())
+    assert v4.changes_since(2) == ({fingerprint(5)}, {fingerprint(4)})
+
+
+def test_unknown_versions_need_the_full_manifest():
+    v1 = make_registry([1], 10)
+    v2 = make_registry([1, 2], 20, v1)
+
+    assert v2.changes_since(15) is None
+    assert v2.changes_since(5) is None
+    # A registry without history only knows its own version
+    assert v1.changes_since(10) == (set(), set())
+    assert v1.changes_since(5) is None
+
+
+def test_history_is_trimmed_to_manifest_history(history_limit):
+    registry = make_registry([0], 1)
+    for version in range(2, 7):
+        registry = make_registry(list(range(version)), version, registry)
+
+    assert [change.version for change in registry.history] == [4, 5, 6]
+    assert registry.history_base == 3
+    assert registry.changes_since(3) == ({fingerprint(3), fingerprint(4), fingerprint(5)}, set())
+    assert registry.changes_since(2) is None
+    assert registry.changes_since(1) is None
+
+
+def test_history_base_is_kept_until_history_is_full(history_limit):
+    v1 = make_registry([1], 1)
+    v2 = make_registry([1, 2], 2, v1)
+    v3 = make_registry([2], 3, v2)
+
+    assert v3.history_base == 1
+    assert v3.changes_since(1) == ({fingerprint(2)}, {fingerprint(1)})
+
+
+def test_replica_applies_deltas():
+    v1 = make_registry([1, 2, 3], 1)
+    client = StubClient(v1, revoked=[fingerprint(3)])
+    replica = KeyRegistryReplica(client)
+
+    assert replica.sync()
+    assert len(replica) == 3
+    client.registry = make_registry([1, 3, 4], 2, v1)
+    assert replica.sync()
+
+    assert client.requests == [None, 1]
+    assert replica.version == 2
+    assert len(replica) == 3
+    assert replica.validate_fingerprint(fingerprint(4))["is_valid"]
+    assert not replica.validate_fingerprint(fingerprint(2))["is_valid"]
+    assert replica.validate_fingerprint(fingerprint(3))["message"] == "Public key has been revoked"
+    assert replica.validate_fingerprint("sha256:" + fingerprint(1).upper())["key_id"] == fingerprint(1)
+
+
+def test_replica_replaces_its_state_from_a_full_manifest():
+    v1 = make_registry([1, 2], 1)
+    client = StubClient(v1)
+    replica = KeyRegistryReplica(client)
+    replica.sync()
+
+    # A registry from another process has no history for version 1
+    client.registry = make_registry([2, 3], 7)
+    assert replica.sync()
+    assert replica.version == 7
+    assert not replica.validate_fingerprint(fingerprint(1))["is_valid"]
+    assert replica.validate_fingerprint(fingerprint(3))["is_valid"]
+
+
+def test_replica_keeps_its_state_when_the_registry_is_unreachable():
+    client = StubClient(make_registry([1], 1))
+    replica = KeyRegistryReplica(client)
+    replica.sync()
+
+    client.fail = True
+    assert not replica.sync()
+    assert replica.version == 1
+    assert replica.validate_fingerprint(fingerprint(1))["is_valid"]
+
+
+def test_client_fingerprints_match_the_registry(pems):
+    pem = pems(0)
+    rewrapped = pem.replace("\n", "\r\n").replace("-----\r\n", "-----\r\n  ", 1)
+
+    assert client_key_fingerprint(pem) == get_key_fingerprint(pem)
+    assert client_key_fingerprint(rewrapped) == get_key_fingerprint(pem)
+    with pytest.raises(ValueError):
+        client_key_fingerprint("not a key")
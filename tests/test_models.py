@@ -0,0 +1,23 @@
+import pytest
+from pydantic import ValidationError
+
+from models.requests import BatchSignatureVerificationRequest, BatchValidationRequest
+from utils.config import MAX_BATCH_SIZE
+
+
+def test_batch_validation_size_is_limited_before_items_are_validated():
+    BatchValidationRequest(keys=[{"fingerprint": "ab" * 32}] * MAX_BATCH_SIZE)
+
+    # Items that would fail validation are never looked at
+    with pytest.raises(ValidationError) as error:
+        BatchValidationRequest(keys=[{"neither": 1}] * (MAX_BATCH_SIZE + 1))
+    assert [e["type"] for e in error.value.errors()] == ["too_long"]
+
+
+def test_batch_verification_size_is_limited():
+    item = {"fingerprint": "ab" * 32, "payload": "p", "signature": "s"}
+    BatchSignatureVerificationRequest(items=[item] * MAX_BATCH_SIZE)
+
+    with pytest.raises(ValidationError) as error:
+        BatchSignatureVerificationRequest(items=[item] * (MAX_BATCH_SIZE + 1))
+    assert [e["type"] for e in error.value.errors()] == ["too_long"]
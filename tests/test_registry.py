@@ -0,0 +1,120 @@
+import json
+import os
+
+from utils.config import BLOOM_ERROR_RATE
+from utils.key_index import get_key_fingerprint
+from utils.key_store import DirectoryKeyStore, load_store_files
+from utils.registry import KeyRegistry, _assemble_files, _update_registry
+
+
+def build_fresh(store, version=100):
+    """Build a registry from scratch, as a startup without a snapshot does."""
+    key_objects = store.list_keys()
+    keys, errors, files = _assemble_files(key_objects, load_store_files(store, key_objects))
+    return KeyRegistry(keys, version, errors, files=files)
+
+
+def assert_matches_fresh(registry, store):
+    """An incrementally updated registry must equal one built from scratch."""
+    fresh = build_fresh(store)
+    assert [key.fingerprint for key in registry.keys] == [key.fingerprint for key in fresh.keys]
+    assert [key.source for key in registry.keys] == [key.source for key in fresh.keys]
+    assert dict(registry.index) == dict(fresh.index)
+    assert registry.files == fresh.files
+    assert registry.errors == fresh.errors
+    assert all(registry.bloom.might_contain(fingerprint) for fingerprint in registry.index)
+
+
+def make_store(tmp_path, write_key_file, pems, count):
+    for i in range(count):
+        write_key_file(f"key_{i}.pem", pems(i))
+    return DirectoryKeyStore(str(tmp_path))
+
+
+def test_added_file_patches_index_and_bloom(tmp_path, write_key_file, pems):
+    store = make_store(tmp_path, write_key_file, pems, 8)
+    previous = build_fresh(store, 1)
+
+    write_key_file("key_8.pem", pems(8))
+    registry = _update_registry(previous, store, 2)
+
+    assert_matches_fresh(registry, store)
+    # Unchanged keys are reused and keep their indices
+    assert all(registry.keys[i] is previous.keys[i] for i in range(8))
+    # The Bloom filter had headroom, so a copy of it was patched
+    assert registry.bloom is not previous.bloom
+    assert registry.bloom.bit_count == previous.bloom.bit_count
+    # The previous registry is left untouched for requests still using it
+    assert len(previous.keys) == 8
+    assert get_key_fingerprint(pems(8)) not in previous.index
+
+
+def test_appending_past_bloom_capacity_rebuilds_the_filter(tmp_path, write_key_file, pems):
+    store = make_store(tmp_path, write_key_file, pems, 4)
+    previous = build_fresh(store, 1)
+    assert previous.bloom.capacity(BLOOM_ERROR_RATE) < 12
+
+    for i in range(4, 12):
+        write_key_file(f"key_{i}.pem", pems(i))
+    registry = _update_registry(previous, store, 2)
+
+    assert_matches_fresh(registry, store)
+    assert registry.bloom.capacity(BLOOM_ERROR_RATE) >= 12
+
+
+def test_changed_middle_file_is_reparsed(tmp_path, write_key_file, pems):
+    store = make_store(tmp_path, write_key_file, pems, 3)
+    previous = build_fresh(store, 1)
+
+    write_key_file("key_1.pem", pems(3))
+    registry = _update_registry(previous, store, 2)
+
+    assert_matches_fresh(registry, store)
+    assert get_key_fingerprint(pems(1)) not in registry.index
+    assert registry.index[get_key_fingerprint(pems(3))] == 1
+    assert registry.keys[0] is previous.keys[0]
+    assert registry.keys[2] is previous.keys[2]
+
+
+def test_removed_file_shifts_later_keys(tmp_path, write_key_file, pems):
+    store = make_store(tmp_path, write_key_file, pems, 3)
+    previous = build_fresh(store, 1)
+
+    os.remove(tmp_path / "key_1.pem")
+    registry = _update_registry(previous, store, 2)
+
+    assert_matches_fresh(registry, store)
+    assert get_key_fingerprint(pems(1)) not in registry.index
+    assert registry.index[get_key_fingerprint(pems(2))] == 1
+    assert [key_file.start for key_file in registry.files] == [0, 1]
+
+
+def test_duplicate_fingerprint_in_appended_file_keeps_first_index(
+        tmp_path, write_key_file, pems):
+    store = make_store(tmp_path, write_key_file, pems, 3)
+    previous = build_fresh(store, 1)
+
+    write_key_file("key_3.jsonl", "\n".join(
+        json.dumps({"public_key_pem": pem}) for pem in (pems(4), pems(0))) + "\n")
+    registry = _update_registry(previous, store, 2)
+
+    assert_matches_fresh(registry, store)
+    assert len(registry.keys) == 5
+    assert registry.index[get_key_fingerprint(pems(0))] == 0
+    assert registry.index[get_key_fingerprint(pems(4))] == 3
+    assert registry.files[-1].count == 2
+
+
+def test_multi_file_changes_match_a_fresh_build(tmp_path, write_key_file, pems):
+    store = make_store(tmp_path, write_key_file, pems, 5)
+    registry = build_fresh(store, 1)
+
+    os.remove(tmp_path / "key_0.pem")
+    write_key_file("key_2.pem", pems(6) + pems(7))
+    write_key_file("key_9.pem", "not a key")
+    registry = _update_registry(registry, store, 2)
+    assert_matches_fresh(registry, store)
+
+    write_key_file("key_10.pem", pems(8))
+    registry = _update_registry(registry, store, 3)
+    assert_matches_fresh(registry, store)
@@ -0,0 +1,83 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from utils import revocations as revocations_module
+from utils.registry import KeyRegistry, RegistryManager
+from utils.revocations import load_revocations, read_revocations
+
+
+def fingerprint(i: int) -> str:
+    return f"{i:064x}"
+
+
+@pytest.fixture
+def revocations_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "revoked.txt")
+    monkeypatch.setattr(revocations_module, "REVOCATIONS_PATH", path)
+    return path
+
+
+def make_manager() -> RegistryManager:
+    """A manager for one worker process, loading the revocation file as at startup."""
+    state = SimpleNamespace(
+        registry=KeyRegistry([], 1),
+        revocations=load_revocations(),
+        validation_cache=None
+    )
+    return RegistryManager(state)
+
+
+def test_workers_sharing_a_file_keep_each_others_revocations(revocations_path):
+    async def scenario():
+        worker_a = make_manager()
+        worker_b = make_manager()
+
+        await worker_a.update_revocations(revoke=[fingerprint(1)])
+        # Worker B has not polled the file yet
+        revocations, persisted = await worker_b.update_revocations(revoke=[fingerprint(2)])
+        assert persisted
+        assert revocations.fingerprints == {fingerprint(1), fingerprint(2)}
+
+        reloaded = await worker_a.reload_revocations_if_changed()
+        assert reloaded.fingerprints == {fingerprint(1), fingerprint(2)}
+        # Worker B's own write is not seen as a change
+        assert await worker_b.reload_revocations_if_changed() is None
+
+        revocations, _ = await worker_a.update_revocations(reinstate=[fingerprint(2)])
+        assert revocations.fingerprints == {fingerprint(1)}
+
+    asyncio.run(scenario())
+    assert read_revocations(revocations_path) == ([fingerprint(1)], [])
+    # No temporary files are left behind
+    assert sorted(os.listdir(os.path.dirname(revocations_path))) == [
+        "revoked.txt", "revoked.txt.lock"]
+
+
+def test_revoking_keeps_hand_edits(revocations_path):
+    async def scenario():
+        manager = make_manager()
+        with open(revocations_path, "w") as f:
+            f.write(f"# decommissioned\n{fingerprint(3)}\n")
+
+        revocations, _ = await manager.update_revocations(revoke=[fingerprint(4)])
+        assert revocations.fingerprints == {fingerprint(3), fingerprint(4)}
+
+    asyncio.run(scenario())
+    assert read_revocations(revocations_path) == ([fingerprint(3), fingerprint(4)], [])
+
+
+def test_unwritable_file_applies_the_change_locally(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        revocations_module, "REVOCATIONS_PATH", str(tmp_path / "missing" / "revoked.txt"))
+
+    async def scenario():
+        manager = make_manager()
+        revocations, persisted = await manager.update_revocations(revoke=[fingerprint(5)])
+        assert not persisted
+        assert manager.state.revocations is revocations
+        assert revocations.is_revoked(fingerprint(5))
+
+    asyncio.run(scenario())
@@ -0,0 +1,134 @@
+import os
+
+import pytest
+
+from utils import key_loader, registry
+from utils.key_index import get_key_fingerprint
+from utils.key_loader import get_keys_signature
+from utils.key_store import DirectoryKeyStore
+from utils.snapshot import (
+    HEADER,
+    Snapshot,
+    is_snapshot_current,
+    write_snapshot
+)
+
+
+@pytest.fixture
+def keys_dir(tmp_path, write_key_file, pems):
+    for i in range(4):
+        write_key_file(f"key_{i}.pem", pems(i))
+    # A duplicate of key_0, which must keep index 0
+    write_key_file("key_4.pem", pems(0))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path_factory, keys_dir):
+    """A snapshot compiled from keys_dir, stored outside of it."""
+    path = str(tmp_path_factory.mktemp("snapshot") / "registry.snapshot")
+    signature = get_keys_signature(keys_dir)
+    keys, _ = key_loader.load_registered_public_keys(keys_dir)
+    write_snapshot(keys, path, signature)
+    return path
+
+
+@pytest.fixture
+def directory_store(keys_dir, snapshot_path, monkeypatch):
+    """Make registries load from keys_dir with snapshot_path configured."""
+    monkeypatch.setattr(registry, "get_key_store", lambda: DirectoryKeyStore(keys_dir))
+    monkeypatch.setattr(key_loader, "SNAPSHOT_PATH", snapshot_path)
+
+
+def test_snapshot_round_trip(keys_dir, snapshot_path, pems):
+    keys, _ = key_loader.load_registered_public_keys(keys_dir)
+    snapshot = Snapshot(snapshot_path)
+
+    assert len(snapshot.keys) == 5
+    assert list(snapshot.keys) == keys
+    assert snapshot.keys[-1] == keys[4]
+    with pytest.raises(IndexError):
+        snapshot.keys[5]
+
+    assert len(snapshot.index) == 4
+    assert dict(snapshot.index.items()) == {
+        get_key_fingerprint(pems(i)): i for i in range(4)}
+    for i in range(4):
+        fingerprint = get_key_fingerprint(pems(i))
+        assert snapshot.find(bytes.fromhex(fingerprint)) == i
+        assert snapshot.index.get(fingerprint) == i
+        assert snapshot.bloom.might_contain(fingerprint)
+        assert snapshot.key_at(i).key_pem == keys[i].key_pem
+
+    missing = get_key_fingerprint(pems(5))
+    assert snapshot.find(bytes.fromhex(missing)) is None
+    assert missing not in snapshot.index
+    assert snapshot.index.get("not hex", -1) == -1
+
+
+def test_snapshot_is_current_until_a_key_file_changes(
+        keys_dir, snapshot_path, write_key_file, pems):
+    assert is_snapshot_current(snapshot_path, get_keys_signature(keys_dir))
+
+    # Other files in the keys directory do not matter
+    write_key_file("revoked.txt", "")
+    assert is_snapshot_current(snapshot_path, get_keys_signature(keys_dir))
+
+    write_key_file("key_5.pem", pems(5))
+    assert not is_snapshot_current(snapshot_path, get_keys_signature(keys_dir))
+
+
+def test_snapshot_is_stale_after_a_key_file_is_rewritten(
+        keys_dir, snapshot_path, write_key_file, pems):
+    write_key_file("key_1.pem", pems(5))
+
+    assert not is_snapshot_current(snapshot_path, get_keys_signature(keys_dir))
+
+
+def test_snapshot_is_stale_after_a_key_file_is_deleted(keys_dir, snapshot_path):
+    os.remove(os.path.join(keys_dir, "key_4.pem"))
+
+    assert not is_snapshot_current(snapshot_path, get_keys_signature(keys_dir))
+
+
+def test_missing_snapshot_is_not_current(tmp_path, keys_dir):
+    assert not is_snapshot_current(str(tmp_path / "missing.snapshot"), get_keys_signature(keys_dir))
+
+
+def test_startup_maps_a_current_snapshot(directory_store):
+    loaded, source = registry._load_registry(1, None)
+
+    assert source == "snapshot"
+    assert len(loaded.keys) == 5
+    assert loaded.files is None
+
+
+def test_startup_parses_key_files_when_the_snapshot_is_stale(
+        directory_store, write_key_file, pems):
+    write_key_file("key_5.pem", pems(5))
+
+    loaded, source = registry._load_registry(1, None)
+
+    assert source == "files"
+    assert len(loaded.keys) == 6
+
+
+def test_startup_parses_key_files_when_the_magic_is_wrong(directory_store, snapshot_path):
+    with open(snapshot_path, "r+b") as f:
+        f.write(b"SKRSNAP2")
+    with pytest.raises(ValueError):
+        Snapshot(snapshot_path)
+
+    loaded, source = registry._load_registry(1, None)
+
+    assert source == "files"
+    assert len(loaded.keys) == 5
+
+
+def test_truncated_snapshot_is_not_current(keys_dir, snapshot_path):
+    with open(snapshot_path, "r+b") as f:
+        f.truncate(HEADER.size - 1)
+
+    assert not is_snapshot_current(snapshot_path, get_keys_signature(keys_dir))
+    with pytest.raises(ValueError):
+        Snapshot(snapshot_path)
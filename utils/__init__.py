@@ -3,7 +3,9 @@
 Utility modules for the sensor key registry service.
 
 Modules:
+- engine: In-process key validation engine shared with the API
 - test_api: API testing framework
 - client_example: Usage examples for the API
 - integration_example: Complete integration workflow examples
+- benchmark: Load-testing and benchmark suite
 """
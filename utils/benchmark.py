@@ -0,0 +1,341 @@
+"""
+Benchmark suite for the sensor key registry.
+
+Generates synthetic registries, starts the real application against them and
+measures startup time, memory and /validate throughput and latency at
+several concurrency levels. Results are printed as JSON so that runs of
+different releases can be compared.
+
+Usage:
+    python -m utils.benchmark --sizes 10,1000,100000 --concurrency 1,16,64
+    python -m utils.benchmark --mode uvicorn --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = "10,1000"
+DEFAULT_CONCURRENCY = "1,16,64"
+DEFAULT_MIX = "registered=0.6,unknown=0.3,malformed=0.1"
+
+MALFORMED_PEM = "-----BEGIN PUBLIC KEY-----\nnot a key\n-----END PUBLIC KEY-----\n"
+
+
+def generate_public_key_pem(key_size: int = 2048) -> str:
+    """
+    Generate a synthetic RSA public key.
+
+    Only public keys are needed, so a random odd modulus is used instead of
+    generating primes. This makes registries of a million keys practical.
+    """
+    modulus = secrets.randbits(key_size) | (1 << (key_size - 1)) | 1
+    public_key = rsa.RSAPublicNumbers(65537, modulus).public_key()
+    return public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode('utf-8')
+
+
+def write_registry(keys_dir: str, size: int) -> List[str]:
+    """Write a registry of synthetic keys as one JSONL bundle and return the PEMs."""
+    pems = [generate_public_key_pem() for _ in range(size)]
+    with open(os.path.join(keys_dir, "keys.jsonl"), "w") as f:
+        for pem in pems:
+            f.write(json.dumps({"public_key_pem": pem}) + "\n")
+    return pems
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse a request mix such as "registered=0.6,unknown=0.3,malformed=0.1"."""
+    weights = {}
+    for part in mix.split(","):
+        name, weight = part.split("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def build_workload(registered: List[str], requests: int, mix: Dict[str, float]) -> List[dict]:
+    """
+    Build the request bodies for one run.
+
+    Registered keys repeat and so exercise the validation cache, unknown keys
+    are unique per request and always miss it, and malformed keys exercise
+    the error path.
+    """
+    kinds = random.choices(list(mix), weights=list(mix.values()), k=requests)
+    bodies = []
+    for kind in kinds:
+        if kind == "registered":
+            pem = random.choice(registered)
+        elif kind == "unknown":
+            pem = generate_public_key_pem()
+        elif kind == "malformed":
+            pem = MALFORMED_PEM
+        else:
+            raise ValueError(f"Unknown request kind: {kind}")
+        bodies.append({"public_key_pem": pem})
+    return bodies
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of a sorted list of values."""
+    if not values:
+        return 0.0
+    position = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[position]
+
+
+async def run_load(client, bodies: List[dict], concurrency: int) -> dict:
+    """Send the request bodies to /validate with a fixed concurrency."""
+    latencies = []
+    statuses: Dict[int, int] = {}
+    queue = list(reversed(bodies))
+
+    async def worker():
+        while queue:
+            body = queue.pop()
+            started = time.perf_counter()
+            response = await client.post("/validate", json=body)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(bodies),
+        "duration_s": elapsed,
+        "throughput_rps": len(bodies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0.0
+        },
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())}
+    }
+
+
+def current_rss_kb() -> int:
+    """Get the resident set size of this process in KiB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def benchmark_asgi(args, registered: List[str]) -> dict:
+    """Benchmark the application in-process through httpx's ASGI transport."""
+    import httpx
+    import main
+
+    rss_before = current_rss_kb()
+    started = time.perf_counter()
+    await main.startup_event()
+    startup_s = time.perf_counter() - started
+
+    result = {
+        "startup_s": startup_s,
+        "registered_keys": len(main.app.state.registry.keys),
+        "rss_kb": current_rss_kb(),
+        "registry_rss_kb": current_rss_kb() - rss_before,
+        "runs": []
+    }
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for concurrency in args.concurrency:
+            bodies = build_workload(registered, args.requests, args.mix)
+            result["runs"].append(await run_load(client, bodies, concurrency))
+
+    await main.shutdown_event()
+    return result
+
+
+def free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def benchmark_uvicorn(args, registered: List[str]) -> dict:
+    """Benchmark a spawned uvicorn server over real HTTP."""
+    import httpx
+
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        env=os.environ.copy(),
+        stdout=sys.stderr
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            while True:
+                try:
+                    health = await client.get("/")
+                    if health.status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before becoming ready")
+                await asyncio.sleep(0.05)
+            startup_s = time.perf_counter() - started
+
+            result = {
+                "startup_s": startup_s,
+                "registered_keys": health.json()["registered_keys_count"],
+                "rss_kb": _process_rss_kb(server.pid),
+                "runs": []
+            }
+            for concurrency in args.concurrency:
+                bodies = build_workload(registered, args.requests, args.mix)
+                result["runs"].append(await run_load(client, bodies, concurrency))
+            return result
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _process_rss_kb(pid: int) -> int:
+    """Get the resident set size of another process in KiB, or 0 if unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return 0
+
+
+def run_size(args) -> dict:
+    """Benchmark one registry size. Runs in its own process."""
+    with tempfile.TemporaryDirectory() as keys_dir:
+        started = time.perf_counter()
+        registered = write_registry(keys_dir, args.size)
+        generation_s = time.perf_counter() - started
+
+        os.environ["KEYS_DIR"] = keys_dir
+        if args.no_cache:
+            os.environ["VALIDATION_CACHE_SIZE"] = "0"
+        if args.snapshot:
+            snapshot_path = os.path.join(keys_dir, "registry.snapshot")
+            os.environ["KEYS_SNAPSHOT"] = snapshot_path
+            from utils.key_loader import compile_snapshot
+            compile_snapshot(snapshot_path)
+
+        if args.mode == "uvicorn":
+            result = asyncio.run(benchmark_uvicorn(args, registered))
+        else:
+            result = asyncio.run(benchmark_asgi(args, registered))
+
+    result.update({
+        "size": args.size,
+        "mode": args.mode,
+        "snapshot": args.snapshot,
+        "cache": not args.no_cache,
+        "generation_s": generation_s
+    })
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sensor key registry")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="Comma-separated registry sizes, e.g. 10,1000,100000,1000000")
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--concurrency", default=DEFAULT_CONCURRENCY,
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="Requests per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="Weights of registered, unknown and malformed requests")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi",
+                        help="Run in-process (asgi) or against a spawned uvicorn server")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Start from a compiled registry snapshot")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the validation result cache")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+    args.concurrency_spec = args.concurrency
+    args.mix_spec = args.mix
+    args.concurrency = [int(level) for level in args.concurrency.split(",")]
+    args.mix = parse_mix(args.mix)
+    return args
+
+
+def child_arguments(args, size: int) -> List[str]:
+    """Build the command line that benchmarks one size in a child process."""
+    arguments = [
+        "--size", str(size),
+        "--concurrency", args.concurrency_spec,
+        "--requests", str(args.requests),
+        "--mix", args.mix_spec,
+        "--mode", args.mode
+    ]
+    if args.snapshot:
+        arguments.append("--snapshot")
+    if args.no_cache:
+        arguments.append("--no-cache")
+    return arguments
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sys.path.insert(0, PROJECT_ROOT)
+
+    if args.size is not None:
+        print(json.dumps(run_size(args)))
+        return
+
+    # Each size runs in a fresh process so startup time and memory are isolated
+    results = []
+    for size in [int(size) for size in args.sizes.split(",")]:
+        print(f"Benchmarking registry of {size} keys...", file=sys.stderr)
+        completed = subprocess.run(
+            [sys.executable, "-m", "utils.benchmark", *child_arguments(args, size)],
+            cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True, check=True
+        )
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import math
+from typing import Iterable, Optional, Union
+
+
+# Largest number of hash functions: each takes 32 bits of the 256-bit digest
+MAX_HASH_COUNT = 8
+
+
+class BloomFilter:
+    """
+    Bloom filter over SHA-256 key fingerprints.
+
+    Fingerprints are already uniformly distributed digests, so the bit
+    positions are taken straight from 32-bit slices of the fingerprint
+    instead of hashing it again. A miss proves the key is not in the set;
+    a hit means it may be, and the exact set must be consulted.
+
+    The bits may be a bytearray or any buffer, such as a slice of a
+    memory-mapped registry snapshot.
+    """
+
+    def __init__(self, bit_count: int, hash_count: int,
+                 bits: Optional[Union[bytearray, memoryview]] = None):
+        self.bit_count = max(8, bit_count)
+        self.hash_count = min(MAX_HASH_COUNT, max(1, hash_count))
+        self.bits = bits if bits is not None else bytearray((self.bit_count + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        """Create an empty filter sized for capacity items at the given false positive rate."""
+        capacity = max(1, capacity)
+        bit_count = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        hash_count = int(round(bit_count / capacity * math.log(2)))
+        return cls(bit_count, hash_count)
+
+    @classmethod
+    def build(cls, fingerprints: Iterable[str], capacity: int, error_rate: float) -> "BloomFilter":
+        """Create a filter holding the given hex fingerprints."""
+        bloom = cls.for_capacity(capacity, error_rate)
+        for fingerprint in fingerprints:
+            bloom.add(fingerprint)
+        return bloom
+
+    def capacity(self, error_rate: float) -> int:
+        """Get the number of items the filter can hold at the given false positive rate."""
+        return int(self.bit_count * (math.log(2) ** 2) / -math.log(error_rate))
+
+    def copy(self) -> "BloomFilter":
+        """Get a writable copy of the filter, e.g. of one backed by a snapshot."""
+        return BloomFilter(self.bit_count, self.hash_count, bytearray(self.bits))
+
+    def add(self, fingerprint: str) -> None:
+        """Add a hex fingerprint to the filter."""
+        bits = self.bits
+        h = int(fingerprint, 16)
+        for _ in range(self.hash_count):
+            position = h % self.bit_count
+            bits[position >> 3] |= 1 << (position & 7)
+            h >>= 32
+
+    def might_contain(self, fingerprint: str) -> bool:
+        """Check whether a hex fingerprint may be in the filter."""
+        bits = self.bits
+        h = int(fingerprint, 16)
+        for _ in range(self.hash_count):
+            position = h % self.bit_count
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            h >>= 32
+        return True
@@ -1,58 +1,11 @@
-import requests
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent
 KEYS_DIR = PROJECT_ROOT / "keys"
 
-
-class KeyRegistryClient:
-    """Client for interacting with the Key Registry API."""
-
-    def __init__(self, base_url: str = "http://localhost:8003"):
-        """Initialize the client with the registry API URL."""
-        self.base_url = base_url.rstrip('/')
-
-    def validate_key(self, public_key_pem: str) -> dict:
-        """
-        Validate a public key against the registry.
-
-        Args:
-            public_key_pem: The public key in PEM format to validate
-
-        Returns:
-            dict: Validation result with is_valid, key_index, and message
-        """
-        try:
-            response = requests.post(
-                f"{self.base_url}/validate",
-                json={"public_key_pem": public_key_pem}
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return {
-                "is_valid": False,
-                "error": str(e),
-                "message": "Failed to connect to key registry"
-            }
-
-    def get_service_info(self) -> dict:
-        """Get information about the registry service."""
-        try:
-            response = requests.get(f"{self.base_url}/")
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
-
-    def get_keys_info(self) -> dict:
-        """Get information about registered keys."""
-        try:
-            response = requests.get(f"{self.base_url}/keys/info")
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+sys.path.insert(0, str(PROJECT_ROOT))
+from client import KeyRegistryClient  # noqa: E402
 
 
 def example_usage():
@@ -60,8 +13,12 @@ def example_usage():
     print("Key Registry Client Example")
     print("=" * 40)
 
-    client = KeyRegistryClient()
+    with KeyRegistryClient() as client:
+        run_examples(client)
+
 
+def run_examples(client: KeyRegistryClient):
+    """Run the example calls with a shared, pooled client."""
     print("Service Info:")
     service_info = client.get_service_info()
     if "error" not in service_info:
@@ -106,13 +63,21 @@ def example_usage():
         print(f"   Error reading sample key: {e}")
 
 
+_shared_client = None
+
+
 def validate_key_from_string(public_key_pem: str) -> bool:
     """
     Simple function to validate a public key.
     Returns True if valid, False otherwise.
+
+    Reuses one module-level client so repeated calls share its connection
+    pool and verdict cache.
     """
-    client = KeyRegistryClient()
-    result = client.validate_key(public_key_pem)
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = KeyRegistryClient()
+    result = _shared_client.validate_key(public_key_pem)
     return result.get('is_valid', False)
 
 
@@ -0,0 +1,82 @@
+import os
+
+
+# Maximum number of keys accepted by a single batch validation request
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "1000"))
+
+# Maximum number of validation results kept in the LRU cache (0 disables it)
+VALIDATION_CACHE_SIZE = int(os.getenv("VALIDATION_CACHE_SIZE", "10000"))
+
+# Seconds between checks of the keys directory for changes (0 disables polling)
+KEYS_RELOAD_INTERVAL = float(os.getenv("KEYS_RELOAD_INTERVAL", "0"))
+
+# Seconds between checks of the revocation file for changes made by other
+# workers or by hand (0 disables polling). Independent of KEYS_RELOAD_INTERVAL.
+REVOCATIONS_POLL_INTERVAL = float(os.getenv("REVOCATIONS_POLL_INTERVAL", "1"))
+
+# Bearer token required by the revocation endpoints, which are disabled
+# while it is unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Threads used for CPU-bound key parsing, off the asyncio event loop. A
+# fixed default, since os.cpu_count() reports the node's cores rather than
+# the container's CPU limit; size it per worker process to that limit.
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", "2"))
+
+# Threads that read and parse key files while the registry is loaded. Fixed
+# for the same reason as VALIDATION_WORKERS; reading remote key stores is
+# mostly waiting, so a few more threads than cores still help.
+KEY_LOADER_WORKERS = int(os.getenv("KEY_LOADER_WORKERS", "8"))
+
+# Parsing jobs allowed to wait for a thread before requests get a 503
+VALIDATION_QUEUE_LIMIT = int(os.getenv("VALIDATION_QUEUE_LIMIT", "64"))
+
+# Number of keys from one batch parsed per executor job
+VALIDATION_CHUNK_SIZE = int(os.getenv("VALIDATION_CHUNK_SIZE", "64"))
+
+# Records of a streaming validation request validated together
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "256"))
+
+# Maximum size in bytes of one record in a streaming validation request
+MAX_STREAM_RECORD_SIZE = int(os.getenv("MAX_STREAM_RECORD_SIZE", "65536"))
+
+# Serve validation responses from pre-serialized templates instead of the
+# response models (same JSON schema, less per-request work)
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# False positive rate of the Bloom filters in front of the registered and
+# revoked key sets
+BLOOM_ERROR_RATE = float(os.getenv("BLOOM_ERROR_RATE", "0.01"))
+
+# Reloads whose fingerprint changes are kept to serve /keys/manifest deltas
+MANIFEST_HISTORY = int(os.getenv("MANIFEST_HISTORY", "64"))
+
+# Parsed public keys kept for signature verification
+PUBLIC_KEY_CACHE_SIZE = int(os.getenv("PUBLIC_KEY_CACHE_SIZE", "10000"))
+
+# Processes that verify batch signatures (0 verifies batches in the
+# validation threads instead). Every worker process starts its own pool, so
+# this is off by default; enable it only with CPU to spare per worker.
+VERIFY_PROCESSES = int(os.getenv("VERIFY_PROCESSES", "0"))
+
+# Number of signatures from one batch verified per process pool job
+VERIFY_CHUNK_SIZE = int(os.getenv("VERIFY_CHUNK_SIZE", "64"))
+
+# Seconds a remote key store's listing and fetched key files are cached
+KEY_STORE_CACHE_TTL = float(os.getenv("KEY_STORE_CACHE_TTL", "60"))
+
+# Seconds a missing key file is remembered by the key store cache
+KEY_STORE_NEGATIVE_TTL = float(os.getenv("KEY_STORE_NEGATIVE_TTL", "30"))
+
+# Estimated bytes of tenant key sets kept in memory before the least recently
+# used tenants are evicted
+TENANT_MEMORY_BUDGET = int(os.getenv("TENANT_MEMORY_BUDGET", str(256 * 1024 * 1024)))
+
+# Seconds a tenant may go unused before it is evicted (0 disables)
+TENANT_IDLE_TIMEOUT = float(os.getenv("TENANT_IDLE_TIMEOUT", "600"))
+
+# Seconds between sweeps for idle or changed tenants (0 disables sweeps)
+TENANT_SWEEP_INTERVAL = float(os.getenv("TENANT_SWEEP_INTERVAL", "30"))
+
+# Validation results cached per loaded tenant
+TENANT_CACHE_SIZE = int(os.getenv("TENANT_CACHE_SIZE", "1000"))
@@ -0,0 +1,281 @@
+import time
+from typing import List, Optional, Tuple
+
+from models.responses import ValidationResponse
+from utils.config import VALIDATION_CACHE_SIZE, VALIDATION_CHUNK_SIZE
+from utils.executor import BoundedExecutor
+from utils.key_index import load_rsa_public_key, get_public_key_fingerprint, normalize_fingerprint
+from utils.key_loader import load_registered_public_keys
+from utils.metrics import PARSE_DURATION, LOOKUP_DURATION, CACHE_LOOKUPS, BLOOM_REJECTIONS
+from utils.registry import KeyRegistry, build_registry, next_registry_version
+from utils.revocations import RevocationList, load_revocations
+from utils.validation_cache import ValidationCache
+
+
+INVALID_KEY_FORMAT_MESSAGE = "Invalid public key format. Expected RSA public key in PEM format."
+INVALID_FINGERPRINT_MESSAGE = "Invalid fingerprint format. Expected hex-encoded SHA-256 fingerprint."
+
+# Shared result for malformed keys, so they can be cached like any other outcome
+MALFORMED_KEY_RESULT = ValidationResponse(
+    is_valid=False,
+    message=INVALID_KEY_FORMAT_MESSAGE
+)
+MALFORMED_FINGERPRINT_RESULT = ValidationResponse(
+    is_valid=False,
+    message=INVALID_FINGERPRINT_MESSAGE
+)
+NO_REGISTERED_KEYS_RESULT = ValidationResponse(
+    is_valid=False,
+    message="No registered keys found in the registry"
+)
+NOT_REGISTERED_RESULT = ValidationResponse(
+    is_valid=False,
+    message="Public key does not match any registered keys"
+)
+REVOKED_KEY_RESULT = ValidationResponse(
+    is_valid=False,
+    message="Public key has been revoked"
+)
+
+
+def match_fingerprint(
+    fingerprint: str,
+    registry: KeyRegistry,
+    revocations: RevocationList
+) -> ValidationResponse:
+    """
+    Look up a key fingerprint in the registry index and the revocation list.
+
+    Fingerprints that the registry's Bloom filter rules out are rejected
+    without touching the index, which may be a memory-mapped snapshot.
+    """
+    if not registry.index:
+        return NO_REGISTERED_KEYS_RESULT
+    if not registry.bloom.might_contain(fingerprint):
+        BLOOM_REJECTIONS.inc()
+        return NOT_REGISTERED_RESULT
+
+    started = time.perf_counter()
+    i = registry.index.get(fingerprint)
+    LOOKUP_DURATION.observe(time.perf_counter() - started)
+    if i is not None:
+        if revocations.is_revoked(fingerprint):
+            return REVOKED_KEY_RESULT
+        return ValidationResponse(
+            is_valid=True,
+            key_index=i,
+            message=f"Key matches registered key at index {i}",
+            key_id=fingerprint
+        )
+
+    return NOT_REGISTERED_RESULT
+
+
+def match_public_key(
+    pem_data: str,
+    registry: KeyRegistry,
+    revocations: RevocationList
+) -> ValidationResponse:
+    """
+    Parse a PEM public key and look it up in the registry index.
+
+    Raises:
+        ValueError: If the data is not an RSA public key in PEM format
+    """
+    started = time.perf_counter()
+    try:
+        public_key = load_rsa_public_key(pem_data)
+        fingerprint = get_public_key_fingerprint(public_key)
+    finally:
+        PARSE_DURATION.observe(time.perf_counter() - started)
+    return match_fingerprint(fingerprint, registry, revocations)
+
+
+def evaluate_public_keys(
+    pems: List[str],
+    registry: KeyRegistry,
+    revocations: RevocationList
+) -> List[ValidationResponse]:
+    """
+    Parse and look up PEM public keys. Runs in the validation executor.
+
+    Malformed keys yield MALFORMED_KEY_RESULT instead of raising, so that
+    repeated malformed submissions can be cached like any other outcome.
+    """
+    results = []
+    for pem_data in pems:
+        try:
+            results.append(match_public_key(pem_data, registry, revocations))
+        except ValueError:
+            results.append(MALFORMED_KEY_RESULT)
+    return results
+
+
+class KeyRegistryEngine:
+    """
+    Key validation against a registry, usable in-process without the server.
+
+    This is the lookup path behind /validate and the fingerprint, batch and
+    stream endpoints, which only add request parsing, metrics and response
+    rendering on top, so embedded callers get the same verdicts as HTTP
+    clients. Malformed input yields an invalid verdict rather than an
+    exception.
+
+    An engine validates against the registry and revocation list it holds.
+    reload() swaps in new ones; calls already running finish against the
+    registry they started with. The server builds an engine per request
+    over its current app state.
+    """
+
+    def __init__(
+        self,
+        registry: KeyRegistry,
+        revocations: Optional[RevocationList] = None,
+        cache: Optional[ValidationCache] = None
+    ):
+        self.registry = registry
+        self.revocations = revocations if revocations is not None else RevocationList()
+        self.cache = cache if cache is not None else ValidationCache(0)
+        self.keys_dir: Optional[str] = None
+        self.revocations_path: Optional[str] = None
+
+    @classmethod
+    def load(
+        cls,
+        keys_dir: Optional[str] = None,
+        revocations_path: Optional[str] = None,
+        cache_size: int = VALIDATION_CACHE_SIZE
+    ) -> "KeyRegistryEngine":
+        """
+        Load an engine from the configured key store, or from a key directory.
+
+        Without keys_dir the registry is built exactly as the server builds
+        it (KEY_STORE, KEYS_SNAPSHOT and incremental reloads apply).
+
+        Args:
+            keys_dir: Directory of PEM key files to load instead
+            revocations_path: Revocation file (KEYS_REVOKED_FILE by default)
+            cache_size: Validation results to cache (0 disables the cache)
+        """
+        engine = cls(
+            cls._build_registry(keys_dir),
+            load_revocations(path=revocations_path),
+            ValidationCache(cache_size)
+        )
+        engine.keys_dir = keys_dir
+        engine.revocations_path = revocations_path
+        return engine
+
+    @staticmethod
+    def _build_registry(
+        keys_dir: Optional[str],
+        previous: Optional[KeyRegistry] = None
+    ) -> KeyRegistry:
+        if keys_dir is None:
+            return build_registry(previous)
+        keys, errors = load_registered_public_keys(keys_dir)
+        return KeyRegistry(keys, next_registry_version(previous), errors)
+
+    def reload(self) -> KeyRegistry:
+        """Reload the registered keys and revocations from where they were loaded."""
+        registry = self._build_registry(self.keys_dir, self.registry)
+        revocations = load_revocations(self.revocations.version + 1, self.revocations_path)
+        self.registry, self.revocations = registry, revocations
+        self.cache.clear()
+        return registry
+
+    def validate(self, pem_data: str) -> ValidationResponse:
+        """Validate a PEM public key."""
+        [result] = self.validate_many([pem_data])
+        return result
+
+    def validate_fingerprint(self, fingerprint: str) -> ValidationResponse:
+        """Validate a key by its hex-encoded SHA-256 fingerprint."""
+        try:
+            fingerprint = normalize_fingerprint(fingerprint)
+        except ValueError:
+            return MALFORMED_FINGERPRINT_RESULT
+        return match_fingerprint(fingerprint, self.registry, self.revocations)
+
+    def validate_many(self, pems: List[str]) -> List[ValidationResponse]:
+        """Validate PEM public keys in the calling thread, in order."""
+        registry, revocations = self.registry, self.revocations
+        results, misses = self._lookup_cached(pems, registry, revocations)
+        self._store_results(
+            results, misses, registry, revocations,
+            evaluate_public_keys([pem_data for _, pem_data, _ in misses], registry, revocations))
+        return results
+
+    async def validate_many_async(
+        self,
+        pems: List[str],
+        executor: BoundedExecutor
+    ) -> List[ValidationResponse]:
+        """
+        Validate PEM public keys without blocking the event loop.
+
+        Cache hits are answered on the event loop. Misses are parsed in the
+        executor in chunks, so large batches spread across threads. Slots
+        for all chunks are reserved at once, so a saturated executor rejects
+        the whole call before any chunk is parsed; there are never more
+        chunks than the executor has slots.
+
+        Raises:
+            ExecutorSaturatedError: If the executor lacks room for all chunks
+        """
+        registry, revocations = self.registry, self.revocations
+        results, misses = self._lookup_cached(pems, registry, revocations)
+
+        chunks = executor.chunk(misses, VALIDATION_CHUNK_SIZE)
+        chunk_results = await executor.run_many(evaluate_public_keys, [
+            ([pem_data for _, pem_data, _ in chunk], registry, revocations)
+            for chunk in chunks
+        ])
+        self._store_results(
+            results, misses, registry, revocations,
+            [result for evaluated in chunk_results for result in evaluated])
+        return results
+
+    def _lookup_cached(
+        self,
+        pems: List[str],
+        registry: KeyRegistry,
+        revocations: RevocationList
+    ) -> Tuple[List[Optional[ValidationResponse]], List[Tuple[int, str, bytes]]]:
+        """
+        Look PEM keys up in the validation cache.
+
+        Results are cached against both the registry and revocation list
+        versions, so a change to either invalidates them.
+
+        Returns:
+            The results with None for each miss, and the position, PEM and
+            cache key of each miss
+        """
+        version = (registry.version, revocations.version)
+        results: List[Optional[ValidationResponse]] = []
+        misses = []
+        for pem_data in pems:
+            cache_key = self.cache.make_key(pem_data)
+            result = self.cache.get(cache_key, version)
+            if result is None:
+                misses.append((len(results), pem_data, cache_key))
+            results.append(result)
+
+        CACHE_LOOKUPS.labels(result="hit").inc(len(pems) - len(misses))
+        CACHE_LOOKUPS.labels(result="miss").inc(len(misses))
+        return results, misses
+
+    def _store_results(
+        self,
+        results: List[Optional[ValidationResponse]],
+        misses: List[Tuple[int, str, bytes]],
+        registry: KeyRegistry,
+        revocations: RevocationList,
+        evaluated: List[ValidationResponse]
+    ) -> None:
+        """Fill in and cache the results evaluated for the cache misses."""
+        version = (registry.version, revocations.version)
+        for (position, _, cache_key), result in zip(misses, evaluated):
+            self.cache.put(cache_key, version, result)
+            results[position] = result
@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when a BoundedExecutor has no free worker or queue slot."""
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool with a hard limit on running plus queued jobs.
+
+    CPU-bound work such as PEM parsing is moved off the asyncio event loop so
+    health checks and cached lookups stay responsive. Once max_workers jobs
+    are running and queue_limit more are waiting, further submissions fail
+    immediately with ExecutorSaturatedError instead of queueing unboundedly.
+    run_many() reserves slots for all of its jobs at once, so a request split
+    into several jobs either runs entirely or is rejected before any of its
+    jobs has started. Split requests with chunk(), which never makes more
+    jobs than the executor has slots.
+
+    With processes=True the work runs in worker processes started with the
+    "spawn" method (forking a process that runs an event loop and threads is
+    unsafe), so functions and arguments must be picklable.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int, processes: bool = False):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        if processes:
+            self._pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="key-validation")
+        self.capacity = max_workers + queue_limit
+        self._in_use = 0
+        self._lock = threading.Lock()
+
+    def chunk(self, items: Sequence[T], chunk_size: int) -> List[Sequence[T]]:
+        """
+        Split items into chunks of chunk_size to be run as separate jobs.
+
+        Chunks are made larger when chunk_size would need more jobs than the
+        executor has slots, so the jobs fit into an idle executor.
+        """
+        size = max(chunk_size, -(-len(items) // self.capacity))
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def _reserve(self, count: int) -> None:
+        with self._lock:
+            if self._in_use + count > self.capacity:
+                raise ExecutorSaturatedError(
+                    f"All {self.max_workers} workers and {self.queue_limit} queue slots are busy")
+            self._in_use += count
+
+    def _release(self, _=None) -> None:
+        with self._lock:
+            self._in_use -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a function in the pool and wait for its result.
+
+        Raises:
+            ExecutorSaturatedError: If the pool and its queue are full
+        """
+        [result] = await self.run_many(fn, [args])
+        return result
+
+    async def run_many(self, fn: Callable[..., Any], calls: Sequence[Tuple[Any, ...]]) -> List[Any]:
+        """
+        Run a function once per argument tuple in the pool and wait for all results.
+
+        Slots for every call are reserved up front. If any call fails, or the
+        caller is cancelled, the calls that have not started are cancelled.
+
+        Raises:
+            ExecutorSaturatedError: If the pool and its queue lack room for all calls
+            ValueError: If there are more calls than the executor has slots, so
+                they could never run (see chunk())
+        """
+        if len(calls) > self.capacity:
+            raise ValueError(
+                f"{len(calls)} calls exceed the executor's {self.capacity} slots")
+        self._reserve(len(calls))
+        futures = []
+        try:
+            for args in calls:
+                future = self._pool.submit(fn, *args)
+                future.add_done_callback(self._release)
+                futures.append(future)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            with self._lock:
+                self._in_use -= len(calls) - len(futures)
+            raise
+
+        try:
+            return list(await asyncio.gather(*(asyncio.wrap_future(future) for future in futures)))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads or processes."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,18 +1,26 @@
+import sys
 import requests
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 # Get the project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 KEYS_DIR = PROJECT_ROOT / "keys"
 
+sys.path.insert(0, str(PROJECT_ROOT))
+from client import create_session  # noqa: E402
+
 
 class SensorKeyVerifier:
     """Client for verifying sensor service keys against the key registry."""
 
-    def __init__(self, registry_url: str = "http://localhost:8003"):
+    def __init__(self, registry_url: str = "http://localhost:8003", timeout: float = 5.0):
         self.registry_url = registry_url.rstrip('/')
+        self.timeout = timeout
+        # One pooled session for every call, so keep-alive connections are
+        # reused instead of opening a new connection per sensor message
+        self.session = create_session()
 
     def verify_key(self, public_key_pem: str) -> Dict[str, Any]:
         """
@@ -25,9 +33,10 @@ class SensorKeyVerifier:
             dict: Verification result with status and details
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.registry_url}/validate",
-                json={"public_key_pem": public_key_pem}
+                json={"public_key_pem": public_key_pem},
+                timeout=self.timeout
             )
 
             if response.status_code == 200:
@@ -62,9 +71,54 @@ class SensorKeyVerifier:
                 "trusted": False
             }
 
+    def verify_keys(self, public_key_pems: List[str]) -> List[Dict[str, Any]]:
+        """
+        Verify many public keys with a single request to the batch endpoint.
+
+        Args:
+            public_key_pems: The public keys in PEM format to verify
+
+        Returns:
+            list: One verification result per key, in the same order
+        """
+        try:
+            response = self.session.post(
+                f"{self.registry_url}/keys/validate/batch",
+                json={"keys": [{"public_key_pem": pem}
+                               for pem in public_key_pems]},
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                return [
+                    {
+                        "success": True,
+                        "is_valid": result['is_valid'],
+                        "key_index": result.get('key_index'),
+                        "message": result.get('message', ''),
+                        "trusted": result['is_valid']
+                    }
+                    for result in response.json()['results']
+                ]
+
+            error = f"Registry service error: {response.status_code}"
+        except requests.exceptions.RequestException as e:
+            error = f"Connection error: {str(e)}"
+
+        return [
+            {
+                "success": False,
+                "is_valid": False,
+                "error": error,
+                "trusted": False
+            }
+            for _ in public_key_pems
+        ]
+
     def get_registry_info(self) -> Optional[Dict[str, Any]]:
         try:
-            response = requests.get(f"{self.registry_url}/")
+            response = self.session.get(
+                f"{self.registry_url}/", timeout=self.timeout)
             if response.status_code == 200:
                 return response.json()
             return None
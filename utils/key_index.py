@@ -0,0 +1,109 @@
+import hashlib
+import re
+from typing import Dict, List, NamedTuple, Union
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+PEM_BLOCK_PATTERN = re.compile(
+    rb"-----BEGIN ([A-Z0-9 ]+)-----(.*?)-----END \1-----", re.DOTALL)
+PEM_LINE_LENGTH = 64
+FINGERPRINT_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class RegisteredKey(NamedTuple):
+    """A registered public key together with its canonical fingerprint."""
+    source: str
+    key_pem: bytes
+    fingerprint: str
+
+
+def normalize_pem_key(pem_data: Union[str, bytes]) -> bytes:
+    """
+    Normalize a PEM key by re-wrapping its base64 body.
+
+    Surrounding and embedded whitespace, CRLF line endings and non-standard
+    line wrapping are all reduced to the same canonical text, so the key
+    parser sees identical input for equivalent encodings.
+    """
+    if isinstance(pem_data, str):
+        pem_data = pem_data.encode('utf-8')
+
+    match = PEM_BLOCK_PATTERN.search(pem_data)
+    if not match:
+        return pem_data.strip() + b'\n'
+
+    label = match.group(1)
+    body = b''.join(match.group(2).split())
+    lines = [b'-----BEGIN ' + label + b'-----']
+    lines.extend(body[i:i + PEM_LINE_LENGTH]
+                 for i in range(0, len(body), PEM_LINE_LENGTH))
+    lines.append(b'-----END ' + label + b'-----')
+    return b'\n'.join(lines) + b'\n'
+
+
+def load_rsa_public_key(pem_data: Union[str, bytes]) -> rsa.RSAPublicKey:
+    """
+    Parse an RSA public key from PEM.
+
+    Both SubjectPublicKeyInfo ("PUBLIC KEY") and PKCS#1 ("RSA PUBLIC KEY")
+    encodings are accepted.
+
+    Raises:
+        ValueError: If the data is not an RSA public key in PEM format
+    """
+    try:
+        public_key = serialization.load_pem_public_key(
+            normalize_pem_key(pem_data))
+    except Exception as e:
+        raise ValueError(f"Could not parse public key: {e}") from e
+
+    if not isinstance(public_key, rsa.RSAPublicKey):
+        raise ValueError("Public key is not an RSA key")
+    return public_key
+
+
+def get_public_key_fingerprint(public_key: rsa.RSAPublicKey) -> str:
+    """Get the SHA-256 fingerprint of the DER SubjectPublicKeyInfo of a parsed public key."""
+    key_der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return hashlib.sha256(key_der).hexdigest()
+
+
+def get_key_fingerprint(key_pem: Union[str, bytes]) -> str:
+    """Get the canonical fingerprint of a PEM public key."""
+    return get_public_key_fingerprint(load_rsa_public_key(key_pem))
+
+
+def normalize_fingerprint(fingerprint: str) -> str:
+    """
+    Normalize a SHA-256 key fingerprint to lowercase hex.
+
+    An optional "sha256:" prefix and colon separators are accepted.
+
+    Raises:
+        ValueError: If the value is not a hex-encoded SHA-256 digest
+    """
+    value = fingerprint.strip().lower()
+    if value.startswith("sha256:"):
+        value = value[len("sha256:"):]
+    value = value.replace(":", "")
+
+    if not FINGERPRINT_PATTERN.match(value):
+        raise ValueError("Fingerprint is not a hex-encoded SHA-256 digest")
+    return value
+
+
+def build_key_index(registered_keys: List[RegisteredKey]) -> Dict[str, int]:
+    """
+    Build a fingerprint -> key index map for constant-time key lookups.
+
+    If the same key is registered more than once, the lowest index wins.
+    """
+    key_index = {}
+    for i, registered_key in enumerate(registered_keys):
+        key_index.setdefault(registered_key.fingerprint, i)
+    return key_index
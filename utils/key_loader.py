@@ -1,25 +1,218 @@
+import json
 import os
-from typing import List
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
 
+from utils.config import KEY_LOADER_WORKERS
+from utils.key_index import (
+    PEM_BLOCK_PATTERN,
+    RegisteredKey,
+    load_rsa_public_key,
+    get_public_key_fingerprint
+)
 
-KEYS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "keys")
-NUM_KEYS = 5
 
+KEYS_DIR = os.getenv(
+    "KEYS_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "keys"))
+NUM_KEYS = int(os.getenv("EXPECTED_KEYS", "5"))
+# Precompiled registry snapshot, see utils/snapshot.py. Only used when set.
+SNAPSHOT_PATH = os.getenv("KEYS_SNAPSHOT", "")
+DEFAULT_SNAPSHOT_PATH = os.path.join(KEYS_DIR, "registry.snapshot")
 
-def load_registered_public_keys() -> List[bytes]:
-    """Load all registered public keys from the keys directory."""
-    public_keys = []
+# Files with these extensions are treated as key files. A ".pem" file may hold
+# one key or a bundle of concatenated PEM blocks; a ".jsonl" file holds one
+# {"public_key_pem": ...} object per line.
+PEM_EXTENSION = ".pem"
+JSONL_EXTENSION = ".jsonl"
 
-    if not os.path.exists(KEYS_DIR):
-        return public_keys
+T = TypeVar("T")
 
-    for i in range(NUM_KEYS):
-        key_path = os.path.join(KEYS_DIR, f"key_{i}_public.pem")
-        if os.path.exists(key_path):
-            with open(key_path, "rb") as f:
-                public_keys.append(f.read())
 
-    return public_keys
+def natural_sort_key(name: str) -> list:
+    """Sort key that orders key_2 before key_10."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def discover_key_files(keys_dir: Optional[str] = None) -> List[str]:
+    """Find all key files in the keys directory, in natural filename order."""
+    keys_dir = keys_dir or KEYS_DIR
+    if not os.path.exists(keys_dir):
+        return []
+
+    names = []
+    with os.scandir(keys_dir) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith((PEM_EXTENSION, JSONL_EXTENSION)):
+                names.append(entry.name)
+
+    names.sort(key=natural_sort_key)
+    return [os.path.join(keys_dir, name) for name in names]
+
+
+def read_key_file(path: str) -> Tuple[List[Tuple[str, bytes]], List[str]]:
+    """
+    Read every PEM key from a key file with one sequential read.
+
+    Returns:
+        A list of (source, key_pem) pairs, where source names the file and,
+        for bundles, the position within it, and a list of error messages
+        for entries that could not be read
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return parse_key_file(os.path.basename(path), data)
+
+
+def parse_key_file(name: str, data: bytes) -> Tuple[List[Tuple[str, bytes]], List[str]]:
+    """
+    Split the contents of a key file into PEM keys.
+
+    A name ending in ".jsonl" is read as JSON lines; anything else is read
+    as one PEM block or a bundle of concatenated blocks.
+    """
+    entries = []
+    errors = []
+
+    if name.endswith(JSONL_EXTENSION):
+        for line_number, line in enumerate(data.splitlines(), start=1):
+            if not line.strip():
+                continue
+            source = f"{name}:{line_number}"
+            try:
+                key_pem = json.loads(line)["public_key_pem"].encode('utf-8')
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                errors.append(f"{source}: invalid JSON line ({e})")
+                continue
+            entries.append((source, key_pem))
+        return entries, errors
+
+    blocks = [match.group(0) for match in PEM_BLOCK_PATTERN.finditer(data)]
+    if not blocks:
+        errors.append(f"{name}: no PEM data found")
+    elif len(blocks) == 1:
+        entries.append((name, blocks[0]))
+    else:
+        entries.extend((f"{name}#{i}", block) for i, block in enumerate(blocks))
+    return entries, errors
+
+
+def _parse_key(entry: Tuple[str, bytes]) -> Tuple[Optional[RegisteredKey], Optional[str]]:
+    """Parse one key entry, returning either the registered key or an error message."""
+    source, key_pem = entry
+    try:
+        public_key = load_rsa_public_key(key_pem)
+    except ValueError as e:
+        return None, f"{source}: {e}"
+    return RegisteredKey(source, key_pem, get_public_key_fingerprint(public_key)), None
+
+
+def _safe_read_key_file(path: str) -> Tuple[List[Tuple[str, bytes]], List[str]]:
+    """Read a key file, reporting I/O errors instead of raising them."""
+    try:
+        return read_key_file(path)
+    except OSError as e:
+        return [], [f"{os.path.basename(path)}: {e}"]
+
+
+def load_registered_public_keys(
+    keys_dir: Optional[str] = None
+) -> Tuple[List[RegisteredKey], List[str]]:
+    """
+    Load all registered public keys from the keys directory, or keys_dir.
+
+    Key files are discovered with a single directory scan, then read and
+    parsed concurrently in a thread pool. Malformed files and entries are
+    reported and skipped instead of aborting the load.
+
+    Returns:
+        The registered keys in file order and a list of error messages
+    """
+    return load_key_files(discover_key_files(keys_dir), _safe_read_key_file)
+
+
+def load_key_files(
+    files: Iterable[T],
+    read_file: Callable[[T], Tuple[List[Tuple[str, bytes]], List[str]]]
+) -> Tuple[List[RegisteredKey], List[str]]:
+    """
+    Read and parse key files concurrently in a thread pool.
+
+    read_file returns the (source, key_pem) entries of one file and the
+    errors met while reading it; it must not raise. This is shared by the
+    keys directory and the other key store backends.
+
+    Returns:
+        The registered keys in file order and a list of error messages
+    """
+    registered_keys = []
+    errors = []
+    for file_keys, file_errors in parse_key_files(files, read_file):
+        registered_keys.extend(file_keys)
+        errors.extend(file_errors)
+    return registered_keys, errors
+
+
+def parse_key_files(
+    files: Iterable[T],
+    read_file: Callable[[T], Tuple[List[Tuple[str, bytes]], List[str]]]
+) -> List[Tuple[List[RegisteredKey], List[str]]]:
+    """
+    Read and parse key files concurrently, keeping the results of each file apart.
+
+    Files are read in parallel, then all their entries are parsed in
+    parallel, so a single large bundle is spread across the pool as well.
+    Malformed entries are reported and skipped.
+
+    Returns:
+        The registered keys and error messages of every file, in file order
+    """
+    files = list(files)
+    results: List[Tuple[List[RegisteredKey], List[str]]] = [([], []) for _ in files]
+    if not files:
+        return results
+
+    with ThreadPoolExecutor(max_workers=KEY_LOADER_WORKERS) as pool:
+        entries = []
+        owners = []
+        for i, (file_entries, file_errors) in enumerate(pool.map(read_file, files)):
+            entries.extend(file_entries)
+            owners.extend([i] * len(file_entries))
+            results[i][1].extend(file_errors)
+
+        parsed = pool.map(_parse_key, entries, chunksize=64)
+        for i, (registered_key, error) in zip(owners, parsed):
+            if registered_key is not None:
+                results[i][0].append(registered_key)
+            else:
+                results[i][1].append(error)
+
+    for _, file_errors in results:
+        for error in file_errors:
+            print(f"[KeyRegistry] Skipping malformed key {error}")
+
+    return results
+
+
+def get_keys_signature(keys_dir: Optional[str] = None) -> Tuple[Tuple[str, int, int], ...]:
+    """
+    Get a cheap signature of the keys directory (or keys_dir) contents.
+
+    The signature is built from file names, modification times and sizes,
+    so it changes whenever a key file is added, removed or rewritten. Other
+    files in the directory, such as the revocation list, are ignored.
+    """
+    keys_dir = keys_dir or KEYS_DIR
+    if not os.path.exists(keys_dir):
+        return ()
+
+    entries = []
+    with os.scandir(keys_dir) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith((PEM_EXTENSION, JSONL_EXTENSION)):
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
 
 
 def get_keys_directory() -> str:
@@ -30,3 +223,31 @@ def get_keys_directory() -> str:
 def get_expected_keys_count() -> int:
     """Get the expected number of keys."""
     return NUM_KEYS
+
+
+def compile_snapshot(output: str) -> int:
+    """Parse all key files and write them to a registry snapshot."""
+    from utils.snapshot import write_snapshot
+
+    # Taken first, so a key file changed while parsing makes the snapshot stale
+    signature = get_keys_signature()
+    registered_keys, _ = load_registered_public_keys()
+    write_snapshot(registered_keys, output, signature)
+    return len(registered_keys)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sensor key registry tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subparsers.add_parser(
+        "compile", help="Compile the key files into a registry snapshot")
+    compile_parser.add_argument(
+        "--output", default=SNAPSHOT_PATH or DEFAULT_SNAPSHOT_PATH,
+        help="Path of the snapshot file to write")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        count = compile_snapshot(args.output)
+        print(f"[KeyRegistry] Compiled {count} registered public keys into {args.output}")
@@ -0,0 +1,400 @@
+"""
+Key store backends.
+
+The registry reads its key files from a key store chosen with KEY_STORE:
+
+    directory  *.pem and *.jsonl files in KEYS_DIR (the default)
+    sqlite     the key_objects table of the SQLite database KEY_STORE_URL
+    http       an S3-compatible bucket at KEY_STORE_URL, e.g.
+               http://minio:9000/sensor-keys, listed with ListObjectsV2
+
+Every backend lists its objects with a version (modification time and size,
+a row version or an ETag). Remote backends sit behind CachedKeyStore, an
+in-process read-through cache that only fetches objects whose version has
+changed, so a reload transfers the new and changed keys rather than the
+whole fleet. Keys can be added to a SQLite or HTTP store without rebuilding
+the image; for SQLite use:
+
+    python -m utils.key_store put --db keys.db key_6.pem
+"""
+import os
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+
+from utils.config import KEY_STORE_CACHE_TTL, KEY_STORE_NEGATIVE_TTL
+from utils.key_index import RegisteredKey
+from utils.key_loader import (
+    KEYS_DIR,
+    PEM_EXTENSION,
+    JSONL_EXTENSION,
+    natural_sort_key,
+    get_keys_signature,
+    parse_key_file,
+    parse_key_files
+)
+
+
+KEY_STORE = os.getenv("KEY_STORE", "directory")
+# Database path for the sqlite store, bucket URL for the http store
+KEY_STORE_URL = os.getenv("KEY_STORE_URL", "")
+# Only objects under this prefix are read from the http store
+KEY_STORE_PREFIX = os.getenv("KEY_STORE_PREFIX", "")
+KEY_STORE_TIMEOUT = float(os.getenv("KEY_STORE_TIMEOUT", "10"))
+
+KEY_FILE_EXTENSIONS = (PEM_EXTENSION, JSONL_EXTENSION)
+
+
+class KeyObject(NamedTuple):
+    """A key file in a store and the version it currently has."""
+    name: str
+    version: str
+
+
+class KeyStore(ABC):
+    """
+    Base class of key store backends.
+
+    A store holds named key files in the same formats as the keys directory.
+    Implementations must be safe to call from the loader's worker threads.
+    """
+
+    location = ""
+
+    @abstractmethod
+    def list_keys(self) -> List[KeyObject]:
+        """List the key files with their versions, in natural name order."""
+
+    @abstractmethod
+    def fetch_key(self, name: str, version: Optional[str] = None) -> Optional[bytes]:
+        """Get the contents of a key file, or None if it does not exist."""
+
+    def signature(self) -> Tuple[KeyObject, ...]:
+        """Get a signature that changes whenever a key file is added, removed or changed."""
+        return tuple(self.list_keys())
+
+    def invalidate(self) -> None:
+        """Forget any cached listing so the next call lists the store again."""
+
+    def close(self) -> None:
+        """Release connections held by the store."""
+
+
+class DirectoryKeyStore(KeyStore):
+    """Key files in a local directory."""
+
+    def __init__(self, keys_dir: str):
+        self.keys_dir = keys_dir
+        self.location = keys_dir
+
+    def list_keys(self) -> List[KeyObject]:
+        objects = [KeyObject(name, f"{mtime_ns}-{size}")
+                   for name, mtime_ns, size in get_keys_signature(self.keys_dir)]
+        objects.sort(key=lambda key_object: natural_sort_key(key_object.name))
+        return objects
+
+    def fetch_key(self, name: str, version: Optional[str] = None) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.keys_dir, name), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS key_objects (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    content BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteKeyStore(KeyStore):
+    """
+    Key files stored as rows of an SQLite database.
+
+    Every write bumps the row's version. Connections are opened per thread
+    and per process, so a store created before gunicorn forks stays usable
+    in the workers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.location = f"sqlite:{path}"
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def list_keys(self) -> List[KeyObject]:
+        rows = self._connection().execute("SELECT name, version FROM key_objects").fetchall()
+        objects = [KeyObject(name, str(version)) for name, version in rows]
+        objects.sort(key=lambda key_object: natural_sort_key(key_object.name))
+        return objects
+
+    def fetch_key(self, name: str, version: Optional[str] = None) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT content FROM key_objects WHERE name = ?", (name,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def put_key(self, name: str, content: bytes) -> None:
+        """Add or replace a key file."""
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO key_objects (name, version, content) VALUES (?, 1, ?) "
+                "ON CONFLICT (name) DO UPDATE SET "
+                "version = version + 1, content = excluded.content",
+                (name, content)
+            )
+
+    def delete_key(self, name: str) -> bool:
+        """Remove a key file, returning whether it existed."""
+        with self._connection() as conn:
+            cursor = conn.execute("DELETE FROM key_objects WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+            self._local.conn = None
+
+
+class HTTPKeyStore(KeyStore):
+    """
+    Key files in an S3-compatible bucket, read over plain HTTP.
+
+    Objects are listed with ListObjectsV2 and versioned by their ETag.
+    Requests are unsigned, so the bucket must allow anonymous reads or sit
+    behind a proxy that signs them. Any server speaking the same two calls,
+    such as MinIO or a local S3 emulator, can stand in for the real store.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        prefix: str = "",
+        timeout: float = KEY_STORE_TIMEOUT,
+        session: Optional[requests.Session] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.prefix = prefix
+        self.timeout = timeout
+        self.location = f"{self.base_url}/{prefix}"
+        self._session = session
+        self._local = threading.local()
+
+    def _get_session(self) -> requests.Session:
+        if self._session is not None:
+            return self._session
+        session = getattr(self._local, "session", None)
+        if session is None or self._local.pid != os.getpid():
+            session = requests.Session()
+            self._local.session = session
+            self._local.pid = os.getpid()
+        return session
+
+    def list_keys(self) -> List[KeyObject]:
+        objects = []
+        params = {"list-type": "2", "prefix": self.prefix}
+        while True:
+            response = self._get_session().get(
+                f"{self.base_url}/", params=params, timeout=self.timeout)
+            response.raise_for_status()
+            root = ElementTree.fromstring(response.content)
+            for element in root:
+                if _local_name(element.tag) != "Contents":
+                    continue
+                fields = {_local_name(child.tag): child.text or "" for child in element}
+                name = fields.get("Key", "")[len(self.prefix):]
+                if name.endswith(KEY_FILE_EXTENSIONS) and "/" not in name:
+                    objects.append(KeyObject(name, fields.get("ETag", "").strip('"')))
+
+            fields = {_local_name(child.tag): child.text or "" for child in root}
+            if fields.get("IsTruncated") != "true":
+                break
+            params["continuation-token"] = fields["NextContinuationToken"]
+
+        objects.sort(key=lambda key_object: natural_sort_key(key_object.name))
+        return objects
+
+    def fetch_key(self, name: str, version: Optional[str] = None) -> Optional[bytes]:
+        response = self._get_session().get(
+            f"{self.base_url}/{quote(self.prefix + name)}", timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.content
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from an element tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+class CachedKeyStore(KeyStore):
+    """
+    Read-through cache in front of a remote key store.
+
+    The listing is cached for ttl seconds. Fetched files are cached by name
+    together with their version: while the listed version is unchanged the
+    cached contents are served without contacting the store, and files
+    fetched without a version expire after ttl seconds. Files that do not
+    exist are remembered for negative_ttl seconds.
+    """
+
+    def __init__(self, store: KeyStore, ttl: float, negative_ttl: float):
+        self.store = store
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.location = store.location
+        self.hits = 0
+        self.misses = 0
+        self._listing: Optional[Tuple[float, List[KeyObject]]] = None
+        self._entries: Dict[str, Tuple[Optional[str], Optional[bytes], float]] = {}
+        self._lock = threading.Lock()
+
+    def list_keys(self) -> List[KeyObject]:
+        now = time.monotonic()
+        with self._lock:
+            if self._listing is not None and self._listing[0] > now:
+                return self._listing[1]
+
+        objects = self.store.list_keys()
+        names = {key_object.name for key_object in objects}
+        with self._lock:
+            self._listing = (now + self.ttl, objects)
+            # Drop cached files that no longer exist in the store
+            for name in [name for name, entry in self._entries.items()
+                         if entry[1] is not None and name not in names]:
+                del self._entries[name]
+        return objects
+
+    def fetch_key(self, name: str, version: Optional[str] = None) -> Optional[bytes]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                cached_version, content, expires = entry
+                if content is None:
+                    fresh = expires > now
+                elif version is not None:
+                    fresh = cached_version == version
+                else:
+                    fresh = expires > now
+                if fresh:
+                    self.hits += 1
+                    return content
+            self.misses += 1
+
+        content = self.store.fetch_key(name, version)
+        ttl = self.ttl if content is not None else self.negative_ttl
+        with self._lock:
+            self._entries[name] = (version, content, now + ttl)
+        return content
+
+    def invalidate(self) -> None:
+        """Forget the cached listing so the next call lists the store again."""
+        with self._lock:
+            self._listing = None
+
+    def close(self) -> None:
+        self.store.close()
+
+
+def open_key_store(kind: Optional[str] = None, url: Optional[str] = None) -> KeyStore:
+    """
+    Open the key store configured with KEY_STORE and KEY_STORE_URL.
+
+    Raises:
+        ValueError: If the store kind is unknown or its URL is missing
+    """
+    kind = kind or KEY_STORE
+    url = url if url is not None else KEY_STORE_URL
+    if kind == "directory":
+        return DirectoryKeyStore(url or KEYS_DIR)
+    if not url:
+        raise ValueError(f"KEY_STORE_URL is required for the {kind} key store")
+    if kind == "sqlite":
+        store = SQLiteKeyStore(url)
+    elif kind == "http":
+        store = HTTPKeyStore(url, KEY_STORE_PREFIX)
+    else:
+        raise ValueError(f"Unknown key store: {kind}")
+    return CachedKeyStore(store, KEY_STORE_CACHE_TTL, KEY_STORE_NEGATIVE_TTL)
+
+
+_key_store: Optional[KeyStore] = None
+
+
+def get_key_store() -> KeyStore:
+    """Get the process-wide key store, opening it on first use."""
+    global _key_store
+    if _key_store is None:
+        _key_store = open_key_store()
+    return _key_store
+
+
+def load_store_files(
+    store: KeyStore,
+    key_objects: List[KeyObject]
+) -> List[Tuple[List[RegisteredKey], List[str]]]:
+    """
+    Fetch and parse some files of a key store.
+
+    Returns:
+        The registered keys and error messages of every file, in the given order
+    """
+    def read_object(key_object: KeyObject) -> Tuple[List[Tuple[str, bytes]], List[str]]:
+        try:
+            data = store.fetch_key(key_object.name, key_object.version)
+        except (OSError, requests.RequestException, sqlite3.Error) as e:
+            return [], [f"{key_object.name}: {e}"]
+        if data is None:
+            return [], [f"{key_object.name}: removed while loading"]
+        return parse_key_file(key_object.name, data)
+
+    return parse_key_files(key_objects, read_object)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLite key store tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    put_parser = subparsers.add_parser("put", help="Add or replace key files")
+    put_parser.add_argument("files", nargs="+", help="Key files (.pem or .jsonl) to store")
+    delete_parser = subparsers.add_parser("delete", help="Remove key files by name")
+    delete_parser.add_argument("names", nargs="+", help="Names of the key files to remove")
+    for subparser in (put_parser, delete_parser):
+        subparser.add_argument(
+            "--db", default=KEY_STORE_URL, required=not KEY_STORE_URL,
+            help="Path of the key store database")
+    args = parser.parse_args()
+
+    sqlite_store = SQLiteKeyStore(args.db)
+    try:
+        if args.command == "put":
+            for path in args.files:
+                with open(path, "rb") as f:
+                    sqlite_store.put_key(os.path.basename(path), f.read())
+            print(f"[KeyRegistry] Stored {len(args.files)} key files in {args.db}")
+        elif args.command == "delete":
+            removed = sum(sqlite_store.delete_key(name) for name in args.names)
+            print(f"[KeyRegistry] Removed {removed} key files from {args.db}")
+    finally:
+        sqlite_store.close()
@@ -0,0 +1,153 @@
+import json
+from typing import List, NamedTuple, Optional
+
+from starlette.responses import StreamingResponse
+
+
+PEM_BEGIN = b"-----BEGIN"
+PEM_END = b"-----END"
+
+RECORD_TOO_LARGE_MESSAGE = "Record exceeds the maximum record size"
+UNTERMINATED_PEM_MESSAGE = "PEM block is not terminated by an END line"
+INVALID_RECORD_MESSAGE = (
+    "Invalid record. Expected a JSON object with public_key_pem or fingerprint, "
+    "or a PEM public key."
+)
+
+
+class StreamItem(NamedTuple):
+    """One record of a validation stream: a "pem", "fingerprint" or "error"."""
+    kind: str
+    value: str
+
+
+class KeyStreamParser:
+    """
+    Incremental parser for bulk validation request bodies.
+
+    The body may mix newline-delimited JSON objects ({"public_key_pem": ...}
+    or {"fingerprint": ...}) and concatenated PEM blocks. Data is fed in
+    arbitrary chunks and complete records are returned as soon as they are
+    available, so only the current partial record is held in memory. Records
+    larger than max_record_size are reported as errors and skipped.
+    """
+
+    def __init__(self, max_record_size: int):
+        self.max_record_size = max_record_size
+        self._buffer = bytearray()
+        self._skip_line = False
+        self._pem_lines: Optional[List[bytes]] = None
+        self._pem_size = 0
+        self._skip_pem = False
+
+    def feed(self, data: bytes) -> List[StreamItem]:
+        """Add a chunk of the body and return the records it completes."""
+        items: List[StreamItem] = []
+        self._buffer += data
+        start = 0
+        while True:
+            end = self._buffer.find(b"\n", start)
+            if end < 0:
+                break
+            self._parse_line(bytes(self._buffer[start:end]), items)
+            start = end + 1
+        del self._buffer[:start]
+
+        if len(self._buffer) > self.max_record_size:
+            self._buffer.clear()
+            if not self._skip_line:
+                self._skip_line = True
+                self._reject_oversized_line(items)
+        return items
+
+    def close(self) -> List[StreamItem]:
+        """Signal the end of the body and return any remaining records."""
+        items: List[StreamItem] = []
+        if self._buffer:
+            self._parse_line(bytes(self._buffer), items)
+            self._buffer.clear()
+        if self._pem_lines is not None or self._skip_pem:
+            if not self._skip_pem:
+                items.append(StreamItem("error", UNTERMINATED_PEM_MESSAGE))
+            self._pem_lines = None
+            self._skip_pem = False
+        return items
+
+    def _parse_line(self, line: bytes, items: List[StreamItem]):
+        if self._skip_line:
+            # Tail of an oversized line that was already reported
+            self._skip_line = False
+            return
+        # Checked here too, so a line is rejected whether or not it arrived
+        # split across chunks
+        if len(line) > self.max_record_size:
+            self._reject_oversized_line(items)
+            return
+
+        line = line.strip()
+        if self._skip_pem:
+            self._skip_pem = not line.startswith(PEM_END)
+            return
+
+        if self._pem_lines is not None:
+            self._pem_lines.append(line)
+            self._pem_size += len(line) + 1
+            if line.startswith(PEM_END):
+                pem = b"\n".join(self._pem_lines) + b"\n"
+                self._pem_lines = None
+                items.append(StreamItem("pem", pem.decode("utf-8", "replace")))
+            elif self._pem_size > self.max_record_size:
+                self._pem_lines = None
+                self._skip_pem = True
+                items.append(StreamItem("error", RECORD_TOO_LARGE_MESSAGE))
+            return
+
+        if not line:
+            return
+        if line.startswith(PEM_BEGIN):
+            self._pem_lines = [line]
+            self._pem_size = len(line) + 1
+            return
+        if line.startswith(b"{"):
+            items.append(self._parse_json(line))
+            return
+        items.append(StreamItem("error", INVALID_RECORD_MESSAGE))
+
+    def _reject_oversized_line(self, items: List[StreamItem]):
+        """Report a line over max_record_size, abandoning the PEM block it is in."""
+        if self._skip_pem:
+            return
+        if self._pem_lines is not None:
+            self._pem_lines = None
+            self._skip_pem = True
+        items.append(StreamItem("error", RECORD_TOO_LARGE_MESSAGE))
+
+    @staticmethod
+    def _parse_json(line: bytes) -> StreamItem:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return StreamItem("error", INVALID_RECORD_MESSAGE)
+
+        pem = record.get("public_key_pem")
+        if isinstance(pem, str):
+            return StreamItem("pem", pem)
+        fingerprint = record.get("fingerprint")
+        if isinstance(fingerprint, str):
+            return StreamItem("fingerprint", fingerprint)
+        return StreamItem("error", INVALID_RECORD_MESSAGE)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response for endpoints that read the request body while responding.
+
+    StreamingResponse normally consumes receive() to watch for client
+    disconnects, which would swallow the request body chunks the generator is
+    still reading. Here the generator owns receive(); a disconnect surfaces as
+    ClientDisconnect from request.stream() and ends the response.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
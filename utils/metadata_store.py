@@ -0,0 +1,190 @@
+"""
+Sensor metadata store.
+
+Keys carry metadata (sensor ID, owner, creation and expiry dates, status)
+kept in an embedded SQLite database next to the key files. The table is
+keyed by key fingerprint with a secondary index on sensor_id, so lookups in
+either direction are B-tree searches that stay O(log n) as the fleet grows.
+
+The service only reads the database. Populate it with:
+
+    python -m utils.metadata_store import sensors.jsonl
+
+where each line holds "public_key_pem" or "fingerprint" plus any of
+"sensor_id", "owner", "created_at", "expires_at" and "status". Key bundles in
+the registry's JSONL format can be imported directly.
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.key_index import get_key_fingerprint, normalize_fingerprint
+from utils.key_loader import KEYS_DIR
+
+
+METADATA_DB_PATH = os.getenv("KEYS_METADATA_DB", os.path.join(KEYS_DIR, "metadata.db"))
+
+DEFAULT_STATUS = "active"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS key_metadata (
+    fingerprint TEXT PRIMARY KEY,
+    sensor_id TEXT NOT NULL,
+    owner TEXT,
+    created_at TEXT,
+    expires_at TEXT,
+    status TEXT NOT NULL DEFAULT 'active'
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS key_metadata_sensor_id ON key_metadata (sensor_id);
+"""
+
+COLUMNS = "fingerprint, sensor_id, owner, created_at, expires_at, status"
+
+
+class KeyMetadata(NamedTuple):
+    """Metadata of one registered key."""
+    fingerprint: str
+    sensor_id: str
+    owner: Optional[str] = None
+    created_at: Optional[str] = None
+    expires_at: Optional[str] = None
+    status: str = DEFAULT_STATUS
+
+
+class KeyMetadataStore:
+    """
+    SQLite-backed key metadata with lookups by fingerprint and by sensor ID.
+
+    One connection is shared by the event loop and worker threads, guarded by
+    a lock; every query is a single indexed lookup.
+    """
+
+    def __init__(self, path: str = ":memory:", read_only: bool = False):
+        self.path = path
+        if read_only:
+            self._conn = sqlite3.connect(
+                f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Optional[str] = None) -> "KeyMetadataStore":
+        """
+        Open the metadata database read-only for serving.
+
+        If the database does not exist, an empty in-memory store is returned
+        so that lookups simply find nothing.
+        """
+        path = path or METADATA_DB_PATH
+        if not os.path.exists(path):
+            print(f"[KeyRegistry] No metadata database at {path}, sensor lookups will be empty")
+            return cls()
+        return cls(path, read_only=True)
+
+    def get_by_fingerprint(self, fingerprint: str) -> Optional[KeyMetadata]:
+        """Get the metadata of a key by its fingerprint."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {COLUMNS} FROM key_metadata WHERE fingerprint = ?",
+                (fingerprint,)
+            ).fetchone()
+        return KeyMetadata(*row) if row else None
+
+    def get_by_sensor(self, sensor_id: str) -> List[KeyMetadata]:
+        """Get the metadata of all keys of a sensor, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {COLUMNS} FROM key_metadata WHERE sensor_id = ? "
+                "ORDER BY created_at, fingerprint",
+                (sensor_id,)
+            ).fetchall()
+        return [KeyMetadata(*row) for row in rows]
+
+    def upsert_many(self, records: Iterable[KeyMetadata]) -> int:
+        """Insert or replace metadata records in one transaction."""
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                f"INSERT OR REPLACE INTO key_metadata ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                records
+            )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM key_metadata").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def parse_metadata_record(record: dict) -> KeyMetadata:
+    """
+    Build a metadata record from an import line.
+
+    Raises:
+        ValueError: If the key, its fingerprint or the sensor_id is missing or invalid
+    """
+    if "public_key_pem" in record:
+        fingerprint = get_key_fingerprint(record["public_key_pem"])
+    elif "fingerprint" in record:
+        fingerprint = normalize_fingerprint(record["fingerprint"])
+    else:
+        raise ValueError("expected public_key_pem or fingerprint")
+
+    sensor_id = record.get("sensor_id")
+    if not isinstance(sensor_id, str) or not sensor_id:
+        raise ValueError("missing sensor_id")
+
+    return KeyMetadata(
+        fingerprint=fingerprint,
+        sensor_id=sensor_id,
+        owner=record.get("owner"),
+        created_at=record.get("created_at"),
+        expires_at=record.get("expires_at"),
+        status=record.get("status") or DEFAULT_STATUS
+    )
+
+
+def import_metadata(source: str, db_path: str) -> Tuple[int, List[str]]:
+    """Import metadata records from a JSONL file into the database."""
+    records = []
+    errors = []
+    with open(source, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(parse_metadata_record(json.loads(line)))
+            except (ValueError, TypeError, AttributeError) as e:
+                errors.append(f"{source}:{line_number}: {e}")
+
+    store = KeyMetadataStore(db_path)
+    try:
+        store.upsert_many(records)
+    finally:
+        store.close()
+    return len(records), errors
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sensor key metadata tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser(
+        "import", help="Import key metadata from a JSONL file")
+    import_parser.add_argument("source", help="JSONL file with one record per line")
+    import_parser.add_argument(
+        "--db", default=METADATA_DB_PATH, help="Path of the metadata database")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        count, errors = import_metadata(args.source, args.db)
+        for error in errors:
+            print(f"[KeyRegistry] Skipping metadata record {error}")
+        print(f"[KeyRegistry] Imported metadata of {count} keys into {args.db}")
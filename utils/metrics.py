@@ -0,0 +1,152 @@
+import os
+import time
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    CONTENT_TYPE_LATEST
+)
+from prometheus_client import multiprocess
+
+
+# Buckets tuned for sub-millisecond lookups up to multi-second registry loads
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+REQUEST_DURATION = Histogram(
+    "key_registry_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+VALIDATION_RESULTS = Counter(
+    "key_registry_validations_total",
+    "Validation outcomes by input type and result",
+    ["input", "result"]
+)
+SIGNATURE_VERIFICATIONS = Counter(
+    "key_registry_signature_verifications_total",
+    "Signature verification outcomes",
+    ["result"]
+)
+PARSE_DURATION = Histogram(
+    "key_registry_parse_duration_seconds",
+    "Time spent parsing submitted PEM public keys",
+    buckets=LATENCY_BUCKETS
+)
+LOOKUP_DURATION = Histogram(
+    "key_registry_lookup_duration_seconds",
+    "Time spent looking up fingerprints in the registry index",
+    buckets=LATENCY_BUCKETS
+)
+CACHE_LOOKUPS = Counter(
+    "key_registry_cache_lookups_total",
+    "Validation cache lookups by outcome",
+    ["result"]
+)
+EXECUTOR_REJECTIONS = Counter(
+    "key_registry_executor_rejections_total",
+    "Validation requests rejected because the executor was saturated"
+)
+REGISTRY_SIZE = Gauge(
+    "key_registry_registered_keys",
+    "Number of keys in the current registry",
+    multiprocess_mode="max"
+)
+REGISTRY_VERSION = Gauge(
+    "key_registry_version",
+    "Version of the current registry",
+    multiprocess_mode="max"
+)
+REVOKED_KEYS = Gauge(
+    "key_registry_revoked_keys",
+    "Number of revoked key fingerprints",
+    multiprocess_mode="max"
+)
+BLOOM_REJECTIONS = Counter(
+    "key_registry_bloom_rejections_total",
+    "Lookups rejected by the registered keys Bloom filter without an index lookup"
+)
+TENANTS_LOADED = Gauge(
+    "key_registry_tenants_loaded",
+    "Number of tenant registries held in memory",
+    multiprocess_mode="livesum"
+)
+TENANT_MEMORY = Gauge(
+    "key_registry_tenant_memory_bytes",
+    "Estimated memory held by loaded tenant registries",
+    multiprocess_mode="livesum"
+)
+TENANT_LOADS = Counter(
+    "key_registry_tenant_loads_total",
+    "Tenant registries loaded on demand"
+)
+TENANT_EVICTIONS = Counter(
+    "key_registry_tenant_evictions_total",
+    "Tenant registries evicted from memory, by reason",
+    ["reason"]
+)
+LOAD_DURATION = Histogram(
+    "key_registry_load_duration_seconds",
+    "Time spent building a registry, by source",
+    ["source"],
+    buckets=LATENCY_BUCKETS
+)
+RELOAD_DURATION = Histogram(
+    "key_registry_reload_duration_seconds",
+    "Time spent reloading the registry, including the swap",
+    buckets=LATENCY_BUCKETS
+)
+
+
+def render_metrics() -> bytes:
+    """
+    Render all metrics in the Prometheus text format.
+
+    When PROMETHEUS_MULTIPROC_DIR is set (multi-worker mode), the metrics of
+    all worker processes are aggregated.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=route.path if route is not None else "unmatched",
+                status=str(status)
+            ).observe(time.perf_counter() - started)
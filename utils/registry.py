@@ -0,0 +1,448 @@
+import asyncio
+import hashlib
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from utils.bloom import BloomFilter
+from utils.config import BLOOM_ERROR_RATE, MANIFEST_HISTORY
+from utils.key_index import RegisteredKey, build_key_index
+from utils import key_loader
+from utils.key_loader import get_keys_signature
+from utils.key_store import (
+    DirectoryKeyStore,
+    KeyObject,
+    KeyStore,
+    get_key_store,
+    load_store_files
+)
+from utils.snapshot import Snapshot, is_snapshot_current
+from utils.revocations import (
+    RevocationList,
+    load_revocations,
+    update_revocations_file,
+    get_revocations_signature
+)
+from utils.metrics import (
+    LOAD_DURATION,
+    RELOAD_DURATION,
+    REGISTRY_SIZE,
+    REGISTRY_VERSION,
+    REVOKED_KEYS
+)
+
+
+# Registry Bloom filters are sized for this many extra keys, so keys added by
+# incremental reloads can be set in a copy of the filter instead of a new one
+BLOOM_HEADROOM = 0.25
+
+
+class KeyFile(NamedTuple):
+    """A key file loaded into a registry and the slice of keys it contributed."""
+    name: str
+    version: str
+    start: int
+    count: int
+    errors: List[str]
+
+
+class ManifestChange(NamedTuple):
+    """Fingerprints added and removed by the reload that produced a registry version."""
+    version: int
+    added: FrozenSet[str]
+    removed: FrozenSet[str]
+
+
+class KeyRegistry:
+    """
+    Snapshot of the registered keys and their fingerprint index.
+
+    A snapshot is never modified after it has been built. Reloads build a
+    new snapshot and swap it into app state with a single assignment, so a
+    request that picked up a snapshot always sees a complete registry.
+
+    files records which key file each key came from, so that the next reload
+    only has to re-read the files that changed. It is None for registries
+    mapped from a precompiled snapshot.
+
+    history holds the fingerprint changes of the last MANIFEST_HISTORY
+    reloads, so clients replicating the manifest can be sent deltas.
+    history_base is the oldest version such a delta can start from.
+
+    store_signature is the key store signature taken just before the keys
+    were read, or None if the registry was not built from the key store.
+    """
+
+    def __init__(
+        self,
+        keys: List[RegisteredKey],
+        version: int,
+        errors: Optional[List[str]] = None,
+        index: Optional[Dict[str, int]] = None,
+        bloom: Optional[BloomFilter] = None,
+        files: Optional[List[KeyFile]] = None
+    ):
+        self.keys = keys
+        self.files = files
+        self.index: Dict[str, int] = index if index is not None else build_key_index(keys)
+        # Lets unknown fingerprints be rejected without touching the index
+        self.bloom = bloom if bloom is not None else BloomFilter.build(
+            self.index.keys(), int(len(self.index) * (1 + BLOOM_HEADROOM)), BLOOM_ERROR_RATE)
+        self.errors = errors or []
+        self.version = version
+        self.history: Tuple[ManifestChange, ...] = ()
+        self.history_base = version
+        self.store_signature: Optional[Tuple] = None
+        self.loaded_at = time.time()
+        self.etag: Optional[str] = None
+        self._rendered: Dict[str, bytes] = {}
+
+    def get_rendered(self, name: str, render: Callable[["KeyRegistry"], bytes]) -> bytes:
+        """
+        Get a response body derived from this registry, rendering it only once.
+
+        Bodies that depend on nothing but the registry (health, info) are
+        serialized on first use and then served as stored bytes until the
+        registry is replaced by a reload.
+        """
+        body = self._rendered.get(name)
+        if body is None:
+            body = render(self)
+            self._rendered[name] = body
+        return body
+
+    def record_changes(self, previous: "KeyRegistry") -> None:
+        """Record the fingerprints added and removed since the previous registry."""
+        fingerprints = {registered_key.fingerprint for registered_key in self.keys}
+        previous_fingerprints = {registered_key.fingerprint for registered_key in previous.keys}
+        change = ManifestChange(
+            self.version,
+            frozenset(fingerprints - previous_fingerprints),
+            frozenset(previous_fingerprints - fingerprints)
+        )
+        history = previous.history + (change,)
+        if len(history) > MANIFEST_HISTORY:
+            self.history_base = history[-MANIFEST_HISTORY - 1].version
+            history = history[-MANIFEST_HISTORY:]
+        else:
+            self.history_base = previous.history_base
+        self.history = history
+
+    def changes_since(self, version: int) -> Optional[Tuple[Set[str], Set[str]]]:
+        """
+        Get the fingerprints added and removed since an earlier version.
+
+        Returns:
+            The added and removed fingerprints, or None if the version is not
+            one this registry has history for (e.g. it was served by another
+            process, or is too old), in which case the client needs the full
+            manifest
+        """
+        if version == self.version:
+            return set(), set()
+        if version != self.history_base and all(
+                change.version != version for change in self.history):
+            return None
+
+        added: Set[str] = set()
+        removed: Set[str] = set()
+        for change in self.history:
+            if change.version > version:
+                # A key added and removed again within the window (or the
+                # other way round) is no change at all
+                added, removed = (
+                    (added - change.removed) | (change.added - removed),
+                    (removed - change.added) | (change.removed - added)
+                )
+        return added, removed
+
+    def compute_etag(self) -> str:
+        """
+        Compute and remember the HTTP entity tag of the registered key list.
+
+        The tag is a digest of the fingerprints in index order rather than the
+        version counter, which starts at 1 in every worker and pod, so that
+        all workers serving the same keys agree on it. It is computed lazily
+        because it reads every key.
+        """
+        if self.etag is None:
+            digest = hashlib.sha256()
+            for registered_key in self.keys:
+                digest.update(registered_key.fingerprint.encode('ascii'))
+            self.etag = f'"{digest.hexdigest()[:32]}"'
+        return self.etag
+
+
+def next_registry_version(previous: Optional[KeyRegistry] = None) -> int:
+    """
+    Get the version of the next registry.
+
+    Versions are wall-clock milliseconds, bumped if needed to stay strictly
+    increasing, so they increase across reloads and restarts and roughly
+    agree between the workers and pods loading the same keys.
+    """
+    version = time.time_ns() // 1_000_000
+    if previous is not None:
+        version = max(version, previous.version + 1)
+    return version
+
+
+def build_registry(previous: Optional[KeyRegistry] = None) -> KeyRegistry:
+    """
+    Build a registry snapshot and record its size and load time.
+
+    Given the previous registry, only the key files that changed since it
+    was built are read and parsed again, and the fingerprint changes are
+    added to the manifest history.
+
+    The key store signature is taken before the keys are read and kept with
+    the registry, so a change made while loading is seen as a change later.
+    """
+    started = time.perf_counter()
+    signature = get_key_store().signature()
+    registry, source = _load_registry(next_registry_version(previous), previous)
+    registry.store_signature = signature
+    if previous is not None:
+        registry.record_changes(previous)
+    LOAD_DURATION.labels(source=source).observe(time.perf_counter() - started)
+    REGISTRY_SIZE.set(len(registry.keys))
+    REGISTRY_VERSION.set(registry.version)
+    return registry
+
+
+def _load_registry(
+    version: int,
+    previous: Optional[KeyRegistry]
+) -> Tuple[KeyRegistry, str]:
+    """
+    Load the registered keys from the key store and build a registry snapshot.
+
+    If the previous registry knows which files its keys came from, the
+    registry is updated incrementally. Otherwise, on the first load, if the
+    keys are read from a directory and a precompiled snapshot is configured
+    and was compiled from exactly the current key files, it is
+    memory-mapped instead of parsing the PEM files.
+
+    Returns:
+        The registry and how it was built: "incremental", "snapshot" or "files"
+    """
+    store = get_key_store()
+    if previous is not None and previous.files is not None:
+        return _update_registry(previous, store, version), "incremental"
+
+    # Snapshots are only for startup; a reload always reflects the key files
+    snapshot_path = key_loader.SNAPSHOT_PATH
+    if previous is None and snapshot_path and isinstance(store, DirectoryKeyStore):
+        if is_snapshot_current(snapshot_path, get_keys_signature(store.keys_dir)):
+            try:
+                snapshot = Snapshot(snapshot_path)
+            except ValueError as e:
+                print(f"[KeyRegistry] {e}, parsing key files")
+            else:
+                return KeyRegistry(
+                    snapshot.keys, version, index=snapshot.index, bloom=snapshot.bloom), "snapshot"
+        else:
+            print(
+                f"[KeyRegistry] Snapshot {snapshot_path} is missing or stale, parsing key files")
+
+    key_objects = store.list_keys()
+    keys, errors, files = _assemble_files(
+        key_objects, load_store_files(store, key_objects))
+    return KeyRegistry(keys, version, errors, files=files), "files"
+
+
+def _assemble_files(
+    key_objects: List[KeyObject],
+    file_results: List[Tuple[List[RegisteredKey], List[str]]]
+) -> Tuple[List[RegisteredKey], List[str], List[KeyFile]]:
+    """Concatenate the keys and errors of each file, recording where each file's keys start."""
+    keys: List[RegisteredKey] = []
+    errors: List[str] = []
+    files = []
+    for key_object, (file_keys, file_errors) in zip(key_objects, file_results):
+        files.append(KeyFile(
+            key_object.name, key_object.version, len(keys), len(file_keys), file_errors))
+        keys.extend(file_keys)
+        errors.extend(file_errors)
+    return keys, errors, files
+
+
+def _update_registry(previous: KeyRegistry, store: KeyStore, version: int) -> KeyRegistry:
+    """
+    Build the next registry from the previous one, re-reading only changed files.
+
+    The store listing is diffed against the files of the previous registry
+    by version (modification time and size, row version or ETag). Added and
+    changed files are fetched and parsed; the keys of unchanged files are
+    reused as they are.
+
+    When all previous files are unchanged and new files only sort after
+    them, which is how new sensors are usually onboarded, every existing key
+    keeps its index, and copies of the previous index and Bloom filter are
+    patched with the new keys. Otherwise both are rebuilt from the keys,
+    which is still far cheaper than parsing them. The previous registry is
+    never modified, since requests in flight may still be using it.
+    """
+    key_objects = store.list_keys()
+    previous_files = {key_file.name: key_file for key_file in previous.files}
+    changed = [key_object for key_object in key_objects
+               if key_object.name not in previous_files
+               or previous_files[key_object.name].version != key_object.version]
+    parsed = dict(zip((key_object.name for key_object in changed),
+                      load_store_files(store, changed)))
+
+    file_results = []
+    for key_object in key_objects:
+        if key_object.name in parsed:
+            file_results.append(parsed[key_object.name])
+        else:
+            key_file = previous_files[key_object.name]
+            file_results.append((
+                previous.keys[key_file.start:key_file.start + key_file.count],
+                key_file.errors
+            ))
+    keys, errors, files = _assemble_files(key_objects, file_results)
+    print(f"[KeyRegistry] Re-read {len(changed)} of {len(key_objects)} key files")
+
+    appended_only = files[:len(previous.files)] == previous.files
+    if not appended_only or not isinstance(previous.index, dict):
+        return KeyRegistry(keys, version, errors, files=files)
+
+    index = dict(previous.index)
+    new_keys = keys[len(previous.keys):]
+    for i, registered_key in enumerate(new_keys, start=len(previous.keys)):
+        index.setdefault(registered_key.fingerprint, i)
+
+    # A filter filled beyond its capacity loses accuracy, so rebuild it then
+    bloom = None
+    if len(index) <= previous.bloom.capacity(BLOOM_ERROR_RATE):
+        bloom = previous.bloom.copy()
+        for registered_key in new_keys:
+            bloom.add(registered_key.fingerprint)
+    return KeyRegistry(keys, version, errors, index=index, bloom=bloom, files=files)
+
+
+class RegistryManager:
+    """
+    Rebuilds the registry off the request path and swaps it into app state.
+
+    Also owns the revocation list, which is swapped independently so that
+    revoking a key never requires rebuilding the registry.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self._lock = asyncio.Lock()
+        self._revocations_lock = asyncio.Lock()
+        # The signature of the keys actually held, which may have been loaded
+        # long before this worker started (see main.preload_registry)
+        self._signature = state.registry.store_signature
+        self._revocations_signature = get_revocations_signature()
+        REVOKED_KEYS.set(len(state.revocations))
+
+    async def reload(self) -> KeyRegistry:
+        """Rebuild the registry in a worker thread and atomically swap it in."""
+        async with self._lock:
+            started = time.perf_counter()
+            current = self.state.registry
+            get_key_store().invalidate()
+            registry = await asyncio.to_thread(build_registry, current)
+            self._signature = registry.store_signature
+            self.state.registry = registry
+            self.state.validation_cache.clear()
+            RELOAD_DURATION.observe(time.perf_counter() - started)
+            return registry
+
+    async def reload_if_changed(self) -> Optional[KeyRegistry]:
+        """Reload the registry if the key store contents have changed."""
+        signature = await asyncio.to_thread(get_key_store().signature)
+        if signature == self._signature:
+            return None
+        return await self.reload()
+
+    async def reload_revocations(self) -> RevocationList:
+        """Re-read the revocation file and swap in the new revocation list."""
+        async with self._revocations_lock:
+            self._revocations_signature = await asyncio.to_thread(get_revocations_signature)
+            revocations = await asyncio.to_thread(
+                load_revocations, self.state.revocations.version + 1)
+            self._swap_revocations(revocations)
+            return revocations
+
+    async def reload_revocations_if_changed(self) -> Optional[RevocationList]:
+        """Reload the revocation list if the revocation file has changed on disk."""
+        signature = await asyncio.to_thread(get_revocations_signature)
+        if signature == self._revocations_signature:
+            return None
+        return await self.reload_revocations()
+
+    async def update_revocations(
+        self,
+        revoke: Iterable[str] = (),
+        reinstate: Iterable[str] = ()
+    ) -> Tuple[RevocationList, bool]:
+        """
+        Revoke or reinstate fingerprints and persist the revocation file.
+
+        The change is applied to the revocation file as it is on disk (see
+        update_revocations_file), so revocations made through other workers
+        are kept, and the resulting list takes effect in this process
+        immediately. Other worker processes pick it up through
+        watch_revocations(). If the file cannot be written, the change is
+        applied to this process's list only.
+
+        Returns:
+            The new revocation list and whether it could be written to disk
+        """
+        async with self._revocations_lock:
+            current = self.state.revocations
+            try:
+                fingerprints, signature = await asyncio.to_thread(
+                    update_revocations_file, revoke, reinstate)
+            except OSError as e:
+                print(f"[KeyRegistry] Could not persist revocations: {e}")
+                fingerprints = (current.fingerprints | set(revoke)) - set(reinstate)
+                revocations = RevocationList(fingerprints, current.version + 1)
+                self._swap_revocations(revocations)
+                return revocations, False
+            self._revocations_signature = signature
+            revocations = RevocationList(fingerprints, current.version + 1)
+            self._swap_revocations(revocations)
+            return revocations, True
+
+    def _swap_revocations(self, revocations: RevocationList) -> None:
+        self.state.revocations = revocations
+        REVOKED_KEYS.set(len(revocations))
+
+    async def watch(self, interval: float) -> None:
+        """Poll the key store and reload the registry when it has changed."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                registry = await self.reload_if_changed()
+            except Exception as e:
+                print(f"[KeyRegistry] Reload failed: {e}")
+            else:
+                if registry is not None:
+                    print(
+                        f"[KeyRegistry] Reloaded {len(registry.keys)} registered public keys "
+                        f"(version {registry.version})")
+
+    async def watch_revocations(self, interval: float) -> None:
+        """
+        Poll the revocation file and reload it when it has changed.
+
+        Runs separately from watch(), since a revocation made through another
+        worker must reach this one promptly even when key reloads are not
+        polled. Each check is a single stat of the file.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                revocations = await self.reload_revocations_if_changed()
+            except Exception as e:
+                print(f"[KeyRegistry] Revocation reload failed: {e}")
+            else:
+                if revocations is not None:
+                    print(
+                        f"[KeyRegistry] Reloaded {len(revocations)} revoked keys "
+                        f"(version {revocations.version})")
@@ -0,0 +1,140 @@
+import fcntl
+import os
+import tempfile
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from utils.bloom import BloomFilter
+from utils.config import BLOOM_ERROR_RATE
+from utils.key_index import normalize_fingerprint
+from utils.key_loader import KEYS_DIR
+
+
+# One fingerprint per line; blank lines and lines starting with "#" are ignored
+REVOCATIONS_PATH = os.getenv("KEYS_REVOKED_FILE", os.path.join(KEYS_DIR, "revoked.txt"))
+
+
+class RevocationList:
+    """
+    Immutable set of revoked key fingerprints with a Bloom filter in front.
+
+    Like KeyRegistry, a list is never modified; revoking or reinstating a key
+    builds a new list with the next version and swaps it into app state. The
+    version tags cached validation results, so a revocation takes effect
+    immediately without rebuilding the registry.
+    """
+
+    def __init__(self, fingerprints: Iterable[str] = (), version: int = 1):
+        self.fingerprints: FrozenSet[str] = frozenset(fingerprints)
+        self.version = version
+        self.bloom = BloomFilter.build(
+            self.fingerprints, len(self.fingerprints), BLOOM_ERROR_RATE)
+
+    def is_revoked(self, fingerprint: str) -> bool:
+        """Check whether a normalized fingerprint has been revoked."""
+        return self.bloom.might_contain(fingerprint) and fingerprint in self.fingerprints
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+
+def load_revocations(version: int = 1, path: Optional[str] = None) -> RevocationList:
+    """Build a revocation list from the revocation file, reporting invalid lines."""
+    fingerprints, errors = read_revocations(path)
+    for error in errors:
+        print(f"[KeyRegistry] Skipping malformed revocation {error}")
+    return RevocationList(fingerprints, version)
+
+
+def read_revocations(path: Optional[str] = None) -> Tuple[List[str], List[str]]:
+    """
+    Read revoked fingerprints from the revocation file.
+
+    Returns:
+        The normalized fingerprints and a list of error messages for lines
+        that are not fingerprints. A missing file means nothing is revoked.
+    """
+    path = path or REVOCATIONS_PATH
+    if not os.path.exists(path):
+        return [], []
+
+    fingerprints = []
+    errors = []
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                fingerprints.append(normalize_fingerprint(line))
+            except ValueError as e:
+                errors.append(f"{os.path.basename(path)}:{line_number}: {e}")
+    return fingerprints, errors
+
+
+def write_revocations(fingerprints: Iterable[str], path: Optional[str] = None) -> None:
+    """
+    Write revoked fingerprints to the revocation file, replacing it atomically.
+
+    The list is written to a uniquely named file in the same directory and
+    renamed over the revocation file, so concurrent writers never share a
+    temporary file and readers never see a partial list.
+    """
+    path = path or REVOCATIONS_PATH
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for fingerprint in sorted(fingerprints):
+                f.write(f"{fingerprint}\n")
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def update_revocations_file(
+    revoke: Iterable[str] = (),
+    reinstate: Iterable[str] = (),
+    path: Optional[str] = None
+) -> Tuple[FrozenSet[str], Tuple[int, int]]:
+    """
+    Revoke or reinstate fingerprints in the revocation file.
+
+    The change is applied to the file as it is on disk, under an exclusive
+    lock on a lock file next to it, so that revocations made concurrently
+    by other workers and edits made by hand are kept rather than replaced
+    by this process's copy of the list.
+
+    Returns:
+        The revoked fingerprints now in the file and the file's signature
+        right after writing it
+
+    Raises:
+        OSError: If the file could not be locked, read or written
+    """
+    path = path or REVOCATIONS_PATH
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            fingerprints, errors = read_revocations(path)
+            for error in errors:
+                print(f"[KeyRegistry] Dropping malformed revocation {error}")
+            updated = (frozenset(fingerprints) | frozenset(revoke)) - frozenset(reinstate)
+            write_revocations(updated, path)
+            return updated, get_revocations_signature(path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def get_revocations_signature(path: Optional[str] = None) -> Tuple[int, int]:
+    """Get the modification time and size of the revocation file, or (0, 0) if missing."""
+    try:
+        stat = os.stat(path or REVOCATIONS_PATH)
+    except FileNotFoundError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
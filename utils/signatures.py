@@ -0,0 +1,115 @@
+"""
+Signature verification against registered keys.
+
+Parsing a PEM public key costs far more than verifying one signature, so
+parsed keys are kept in a bounded LRU cache keyed by fingerprint. Batches
+are verified in a process pool, where every worker process keeps its own
+cache of parsed keys.
+"""
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from utils.config import PUBLIC_KEY_CACHE_SIZE
+from utils.key_index import load_rsa_public_key
+
+
+HASH_ALGORITHMS = {
+    "sha256": hashes.SHA256,
+    "sha384": hashes.SHA384,
+    "sha512": hashes.SHA512
+}
+PADDING_SCHEMES = ("pss", "pkcs1v15")
+
+
+class VerificationJob(NamedTuple):
+    """One signature to verify against a registered key."""
+    fingerprint: str
+    key_pem: bytes
+    payload: bytes
+    signature: bytes
+    padding: str = "pss"
+    hash_algorithm: str = "sha256"
+
+
+class PublicKeyCache:
+    """Bounded LRU cache of parsed RSA public keys, keyed by fingerprint."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, rsa.RSAPublicKey]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str, key_pem: bytes) -> rsa.RSAPublicKey:
+        """
+        Get the parsed key for a fingerprint, parsing key_pem on a miss.
+
+        A fingerprint identifies the key's content, so an entry never goes
+        stale and survives registry reloads.
+
+        Raises:
+            ValueError: If the data is not an RSA public key in PEM format
+        """
+        with self._lock:
+            public_key = self._entries.get(fingerprint)
+            if public_key is not None:
+                self._entries.move_to_end(fingerprint)
+                return public_key
+
+        public_key = load_rsa_public_key(key_pem)
+        if self.max_size > 0:
+            with self._lock:
+                self._entries[fingerprint] = public_key
+                self._entries.move_to_end(fingerprint)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return public_key
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def verify_signature(public_key: rsa.RSAPublicKey, job: VerificationJob) -> bool:
+    """Check an RSA-PSS or PKCS#1 v1.5 signature over the job's payload."""
+    algorithm = HASH_ALGORITHMS[job.hash_algorithm]()
+    if job.padding == "pss":
+        scheme = padding.PSS(mgf=padding.MGF1(algorithm), salt_length=padding.PSS.AUTO)
+    else:
+        scheme = padding.PKCS1v15()
+    try:
+        public_key.verify(job.signature, job.payload, scheme, algorithm)
+    except InvalidSignature:
+        return False
+    return True
+
+
+def verify_job(job: VerificationJob, key_cache: PublicKeyCache) -> bool:
+    """Verify one job using a cache of parsed keys."""
+    return verify_signature(key_cache.get(job.fingerprint, job.key_pem), job)
+
+
+# Parsed keys of the current pool worker process, created on first use
+_process_key_cache: Optional[PublicKeyCache] = None
+
+
+def verify_jobs(
+    jobs: List[VerificationJob],
+    key_cache: Optional[PublicKeyCache] = None
+) -> List[bool]:
+    """
+    Verify a chunk of jobs.
+
+    In a pool worker process key_cache is omitted and the process's own
+    cache is used; in a thread the caller passes the shared cache.
+    """
+    global _process_key_cache
+    if key_cache is None:
+        if _process_key_cache is None:
+            _process_key_cache = PublicKeyCache(PUBLIC_KEY_CACHE_SIZE)
+        key_cache = _process_key_cache
+    return [verify_job(job, key_cache) for job in jobs]
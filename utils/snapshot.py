@@ -0,0 +1,216 @@
+"""
+Precompiled, memory-mappable registry snapshots.
+
+A snapshot holds everything the service needs to answer requests, so a pod
+can start without parsing a single PEM. Layout (all integers little-endian):
+
+    header       magic (8 bytes), key count (uint32), unique fingerprint
+                 count (uint32), Bloom filter bit count (uint64), hash
+                 count (uint32) and SHA-256 of the key directory signature
+                 the snapshot was compiled from (32 bytes)
+    bloom        Bloom filter bits over the unique fingerprints
+    fingerprints unique x 32-byte SHA-256 fingerprints, sorted
+    indices      unique x uint32 key index of each sorted fingerprint
+    offsets      (count + 1) x uint64 start of each key record
+    records      per key: fingerprint (32 bytes), source length (uint16),
+                 source, key PEM
+
+Lookups check the Bloom filter and then binary-search the fingerprint table
+directly in the mapping, so the pages are shared between every process that
+maps the same file.
+
+A snapshot is only used while the key directory still has exactly the
+signature (file names, modification times and sizes) it was compiled from,
+so added, changed and deleted key files all make it stale.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from utils.bloom import BloomFilter
+from utils.config import BLOOM_ERROR_RATE
+from utils.key_index import RegisteredKey, build_key_index
+
+
+SNAPSHOT_MAGIC = b"SKRSNAP3"
+HEADER = struct.Struct("<8sIIQI32s")
+FINGERPRINT_SIZE = 32
+INDEX = struct.Struct("<I")
+OFFSET = struct.Struct("<Q")
+SOURCE_LENGTH = struct.Struct("<H")
+
+
+def digest_keys_signature(signature: Sequence[Tuple[str, int, int]]) -> bytes:
+    """Get the SHA-256 digest of a key directory signature (see get_keys_signature)."""
+    return hashlib.sha256(json.dumps([list(entry) for entry in signature]).encode('utf-8')).digest()
+
+
+def write_snapshot(
+    registered_keys: List[RegisteredKey],
+    path: str,
+    keys_signature: Sequence[Tuple[str, int, int]]
+) -> None:
+    """
+    Write registered keys to a snapshot file, replacing it atomically.
+
+    keys_signature is the signature of the key directory the keys were
+    parsed from, taken before parsing them.
+    """
+    key_index = build_key_index(registered_keys)
+    count = len(registered_keys)
+    fingerprints = sorted(key_index.items())
+    bloom = BloomFilter.build(key_index.keys(), len(key_index), BLOOM_ERROR_RATE)
+
+    records = []
+    offsets = []
+    position = (HEADER.size + len(bloom.bits)
+                + len(fingerprints) * (FINGERPRINT_SIZE + INDEX.size)
+                + (count + 1) * OFFSET.size)
+    for registered_key in registered_keys:
+        source = registered_key.source.encode('utf-8')
+        record = (bytes.fromhex(registered_key.fingerprint)
+                  + SOURCE_LENGTH.pack(len(source)) + source + registered_key.key_pem)
+        offsets.append(position)
+        records.append(record)
+        position += len(record)
+    offsets.append(position)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, count, len(fingerprints),
+                            bloom.bit_count, bloom.hash_count,
+                            digest_keys_signature(keys_signature)))
+        f.write(bloom.bits)
+        for fingerprint, _ in fingerprints:
+            f.write(bytes.fromhex(fingerprint))
+        for _, i in fingerprints:
+            f.write(INDEX.pack(i))
+        for offset in offsets:
+            f.write(OFFSET.pack(offset))
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Read-only view of a memory-mapped snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"{path} is not a registry snapshot")
+        (magic, self.count, self.fingerprint_count, bloom_bit_count,
+         bloom_hash_count, self.keys_signature) = HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a registry snapshot of this version")
+
+        bloom_size = (bloom_bit_count + 7) // 8
+        self.bloom = BloomFilter(
+            bloom_bit_count, bloom_hash_count,
+            memoryview(self._mm)[HEADER.size:HEADER.size + bloom_size])
+        self._fingerprints_offset = HEADER.size + bloom_size
+        self._indices_offset = (self._fingerprints_offset
+                                + self.fingerprint_count * FINGERPRINT_SIZE)
+        self._offsets_offset = self._indices_offset + self.fingerprint_count * INDEX.size
+        self.keys = SnapshotKeys(self)
+        self.index = SnapshotIndex(self)
+
+    def fingerprint_at(self, position: int) -> bytes:
+        """Get the raw fingerprint at a position in the sorted table."""
+        start = self._fingerprints_offset + position * FINGERPRINT_SIZE
+        return self._mm[start:start + FINGERPRINT_SIZE]
+
+    def index_at(self, position: int) -> int:
+        """Get the key index at a position in the sorted table."""
+        return INDEX.unpack_from(self._mm, self._indices_offset + position * INDEX.size)[0]
+
+    def find(self, fingerprint: bytes) -> Optional[int]:
+        """Binary-search the sorted fingerprint table for a raw fingerprint."""
+        low, high = 0, self.fingerprint_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.fingerprint_at(middle) < fingerprint:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.fingerprint_count and self.fingerprint_at(low) == fingerprint:
+            return self.index_at(low)
+        return None
+
+    def key_at(self, i: int) -> RegisteredKey:
+        """Read the key record at a key index."""
+        start, end = struct.unpack_from(
+            "<QQ", self._mm, self._offsets_offset + i * OFFSET.size)
+        fingerprint = self._mm[start:start + FINGERPRINT_SIZE].hex()
+        length_start = start + FINGERPRINT_SIZE
+        source_length = SOURCE_LENGTH.unpack_from(self._mm, length_start)[0]
+        source_start = length_start + SOURCE_LENGTH.size
+        source = self._mm[source_start:source_start + source_length].decode('utf-8')
+        return RegisteredKey(source, self._mm[source_start + source_length:end], fingerprint)
+
+
+class SnapshotIndex:
+    """Fingerprint -> key index mapping backed by a snapshot."""
+
+    def __init__(self, snapshot: Snapshot):
+        self._snapshot = snapshot
+
+    def get(self, fingerprint: str, default: Optional[int] = None) -> Optional[int]:
+        """Get the key index for a hex fingerprint."""
+        try:
+            raw = bytes.fromhex(fingerprint)
+        except ValueError:
+            return default
+        i = self._snapshot.find(raw)
+        return default if i is None else i
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return self.get(fingerprint) is not None
+
+    def __len__(self) -> int:
+        return self._snapshot.fingerprint_count
+
+    def items(self) -> Iterator:
+        for position in range(self._snapshot.fingerprint_count):
+            yield (self._snapshot.fingerprint_at(position).hex(),
+                   self._snapshot.index_at(position))
+
+
+class SnapshotKeys:
+    """Sequence of registered keys read lazily from a snapshot."""
+
+    def __init__(self, snapshot: Snapshot):
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self._snapshot.count
+
+    def __getitem__(self, i: int) -> RegisteredKey:
+        if i < 0:
+            i += self._snapshot.count
+        if not 0 <= i < self._snapshot.count:
+            raise IndexError("key index out of range")
+        return self._snapshot.key_at(i)
+
+    def __iter__(self) -> Iterator[RegisteredKey]:
+        for i in range(self._snapshot.count):
+            yield self[i]
+
+
+def is_snapshot_current(path: str, keys_signature: Sequence[Tuple[str, int, int]]) -> bool:
+    """Check that a snapshot exists and was compiled from exactly these key files."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, *_, snapshot_signature = HEADER.unpack(header)
+    return magic == SNAPSHOT_MAGIC and snapshot_signature == digest_keys_signature(keys_signature)
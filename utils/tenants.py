@@ -0,0 +1,212 @@
+"""
+Namespaced key registries for multiple tenants.
+
+Each tenant (a customer or sensor fleet) has its own key set in a
+subdirectory of TENANTS_DIR, laid out like KEYS_DIR:
+
+    tenants/
+        acme/key_0.pem, key_1.pem, revoked.txt
+        globex/fleet.jsonl
+
+A tenant's registry is loaded on its first request and kept in memory while
+it is used. Loaded registries are evicted least recently used first once
+their estimated size exceeds TENANT_MEMORY_BUDGET, and when idle for longer
+than TENANT_IDLE_TIMEOUT, so one process can serve many fleets without
+holding every key set in RAM.
+"""
+import asyncio
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from utils.key_index import RegisteredKey
+from utils.key_loader import KEYS_DIR, get_keys_signature
+from utils.engine import KeyRegistryEngine
+from utils.revocations import get_revocations_signature
+from utils.metrics import TENANTS_LOADED, TENANT_MEMORY, TENANT_LOADS, TENANT_EVICTIONS
+
+
+TENANTS_DIR = os.getenv("TENANTS_DIR", os.path.join(KEYS_DIR, "tenants"))
+
+# Tenant names double as directory names, so they are restricted to a safe set
+TENANT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+
+REVOCATIONS_FILE = "revoked.txt"
+
+# Approximate per-key cost of the registry's Python objects (RegisteredKey
+# tuple, index entry, string headers) on top of the PEM and fingerprint bytes
+KEY_OVERHEAD_BYTES = 400
+
+
+class UnknownTenantError(LookupError):
+    """Raised when a tenant has no key directory."""
+
+
+class Tenant:
+    """A loaded tenant: an engine over its registry, revocations and validation cache."""
+
+    def __init__(self, name: str, engine: KeyRegistryEngine, signature: Tuple):
+        self.name = name
+        self.engine = engine
+        self.signature = signature
+        self.size = estimate_registry_size(engine.registry.keys)
+        self.last_used = time.monotonic()
+
+
+def estimate_registry_size(keys: List[RegisteredKey]) -> int:
+    """Estimate the memory held by a registry's keys, in bytes."""
+    return sum(
+        len(key.key_pem) + len(key.source) + len(key.fingerprint) + KEY_OVERHEAD_BYTES
+        for key in keys
+    )
+
+
+def get_tenant_directory(name: str, root: Optional[str] = None) -> str:
+    """
+    Get the key directory of a tenant.
+
+    Raises:
+        ValueError: If the name is not a valid tenant name
+    """
+    if not TENANT_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid tenant name: {name}")
+    return os.path.join(root or TENANTS_DIR, name)
+
+
+def get_tenant_signature(keys_dir: str) -> Tuple:
+    """Get a cheap signature of a tenant's key files and revocation file."""
+    return (
+        get_keys_signature(keys_dir),
+        get_revocations_signature(os.path.join(keys_dir, REVOCATIONS_FILE))
+    )
+
+
+def load_tenant(name: str, keys_dir: str, cache_size: int) -> Tenant:
+    """
+    Load a tenant's registry and revocation list from its key directory.
+
+    Raises:
+        UnknownTenantError: If the tenant has no key directory
+    """
+    if not os.path.isdir(keys_dir):
+        raise UnknownTenantError(f"Unknown tenant: {name}")
+
+    signature = get_tenant_signature(keys_dir)
+    engine = KeyRegistryEngine.load(
+        keys_dir, os.path.join(keys_dir, REVOCATIONS_FILE), cache_size)
+    return Tenant(name, engine, signature)
+
+
+class TenantRegistries:
+    """
+    Lazily loaded tenant registries under a global memory budget.
+
+    Registries are kept in least recently used order. Concurrent first
+    requests for the same tenant share one load, which runs in a worker
+    thread. Only the event loop touches this object, so it needs no locks.
+    """
+
+    def __init__(self, memory_budget: int, cache_size: int, root: Optional[str] = None):
+        self.root = root or TENANTS_DIR
+        self.memory_budget = memory_budget
+        self.cache_size = cache_size
+        self.memory_used = 0
+        self._tenants: "OrderedDict[str, Tenant]" = OrderedDict()
+        self._loads: Dict[str, asyncio.Future] = {}
+
+    async def get(self, name: str) -> Tenant:
+        """
+        Get a tenant's registry, loading it on first use.
+
+        Raises:
+            ValueError: If the name is not a valid tenant name
+            UnknownTenantError: If the tenant has no key directory
+        """
+        tenant = self._tenants.get(name)
+        if tenant is not None:
+            self._tenants.move_to_end(name)
+            tenant.last_used = time.monotonic()
+            return tenant
+
+        keys_dir = get_tenant_directory(name, self.root)
+        load = self._loads.get(name)
+        if load is None:
+            load = asyncio.ensure_future(self._load(name, keys_dir))
+            self._loads[name] = load
+            load.add_done_callback(lambda _: self._loads.pop(name, None))
+        # A cancelled request must not cancel a load other requests wait for
+        return await asyncio.shield(load)
+
+    async def _load(self, name: str, keys_dir: str) -> Tenant:
+        tenant = await asyncio.to_thread(load_tenant, name, keys_dir, self.cache_size)
+        TENANT_LOADS.inc()
+        print(
+            f"[KeyRegistry] Loaded {len(tenant.engine.registry.keys)} registered public keys "
+            f"for tenant {name}")
+        self._tenants[name] = tenant
+        self.memory_used += tenant.size
+        self._enforce_budget(keep=name)
+        self._update_metrics()
+        return tenant
+
+    def _enforce_budget(self, keep: str) -> None:
+        """Evict least recently used tenants until the budget is met."""
+        for name in list(self._tenants):
+            if self.memory_used <= self.memory_budget:
+                break
+            if name != keep:
+                self._evict(name, "budget")
+
+    def _evict(self, name: str, reason: str) -> None:
+        tenant = self._tenants.pop(name, None)
+        if tenant is None:
+            return
+        self.memory_used -= tenant.size
+        TENANT_EVICTIONS.labels(reason=reason).inc()
+        print(f"[KeyRegistry] Evicted tenant {name} ({reason})")
+
+    def _update_metrics(self) -> None:
+        TENANTS_LOADED.set(len(self._tenants))
+        TENANT_MEMORY.set(self.memory_used)
+
+    def evict_idle(self, idle_timeout: float) -> List[str]:
+        """Evict tenants that have not been used for idle_timeout seconds."""
+        cutoff = time.monotonic() - idle_timeout
+        idle = [name for name, tenant in self._tenants.items() if tenant.last_used < cutoff]
+        for name in idle:
+            self._evict(name, "idle")
+        self._update_metrics()
+        return idle
+
+    async def evict_changed(self) -> List[str]:
+        """
+        Evict tenants whose key or revocation files changed on disk.
+
+        The next request reloads them, so changes are picked up lazily.
+        """
+        changed = []
+        for name, tenant in list(self._tenants.items()):
+            keys_dir = get_tenant_directory(name, self.root)
+            signature = await asyncio.to_thread(get_tenant_signature, keys_dir)
+            if signature != tenant.signature and self._tenants.get(name) is tenant:
+                self._evict(name, "changed")
+                changed.append(name)
+        self._update_metrics()
+        return changed
+
+    async def watch(self, interval: float, idle_timeout: float) -> None:
+        """Periodically evict idle tenants and tenants whose files changed."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if idle_timeout > 0:
+                    self.evict_idle(idle_timeout)
+                await self.evict_changed()
+            except Exception as e:
+                print(f"[KeyRegistry] Tenant sweep failed: {e}")
+
+    def loaded(self) -> List[Tenant]:
+        """Get the loaded tenants, least recently used first."""
+        return list(self._tenants.values())
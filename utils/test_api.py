@@ -172,6 +172,49 @@ def test_validate_sensor_service_key():
         return False
 
 
+def test_validate_batch():
+    """Test batch validation with registered and malformed keys."""
+    print("\nTesting batch validation...")
+
+    try:
+        response = requests.get(f"{BASE_URL}/keys/list")
+        if response.status_code != 200:
+            print("Could not retrieve registered keys for testing")
+            return False
+
+        registered = [item['key_pem']
+                      for item in response.json()['registered_keys']]
+        if not registered:
+            print("No registered keys found for testing")
+            return False
+
+        keys = [{"public_key_pem": pem} for pem in registered]
+        keys.append({"public_key_pem": "not a key"})
+
+        batch_response = requests.post(
+            f"{BASE_URL}/keys/validate/batch",
+            json={"keys": keys}
+        )
+
+        if batch_response.status_code != 200:
+            print(f"Batch request failed: {batch_response.status_code}")
+            return False
+
+        results = batch_response.json()['results']
+        expected = [True] * len(registered) + [False]
+        actual = [result['is_valid'] for result in results]
+        if actual == expected:
+            print(f"Batch of {len(results)} keys validated in order")
+            return True
+        else:
+            print(f"Unexpected batch results: {actual}")
+            return False
+
+    except Exception as e:
+        print(f"Error testing batch validation: {e}")
+        return False
+
+
 def main():
     """Run all API tests."""
     print("Starting Key Registry API Tests")
@@ -182,7 +225,8 @@ def main():
         test_keys_info,
         test_validate_registered_key,
         test_validate_invalid_key,
-        test_validate_sensor_service_key
+        test_validate_sensor_service_key,
+        test_validate_batch
     ]
 
     passed = 0
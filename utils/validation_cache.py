@@ -0,0 +1,65 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ValidationCache:
+    """
+    Bounded LRU cache of validation results.
+
+    Entries are keyed by the SHA-256 of the raw PEM string submitted by the
+    caller, so repeat submissions of the same key skip parsing entirely.
+    Both positive and negative results are cached. Every entry is tagged
+    with the version of the state it was computed against (registry and
+    revocation list) and is ignored once that state has moved on. A max_size
+    of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[Hashable, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(pem_data: str) -> bytes:
+        """Get the cache key for a raw PEM string."""
+        return hashlib.sha256(pem_data.encode('utf-8')).digest()
+
+    def get(self, key: bytes, version: Hashable) -> Optional[Any]:
+        """Get a result cached for a state version, or None if not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: bytes, version: Hashable, result: Any) -> None:
+        """Cache a result, evicting the least recently used entry if full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results, e.g. after the registry has changed."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the current size and hit/miss counters of the cache."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }